@@ -4,6 +4,7 @@ import {
   BodyLarge,
   Translator,
   ReactFactoryContext,
+  CommandUITablePage,
 } from "@eyra/feldspar"
 import TextBundle from "@eyra/feldspar"
 import { 
@@ -15,8 +16,9 @@ import {
     PropsUIPromptConsentFormViz,
     PropsUIPromptConsentFormTableViz,
     PropsUITableRow,
+    ColumnarDataFrame,
 } from "./types"
-import { useCallback, useEffect, useState } from "react"
+import { useCallback, useEffect, useRef, useState } from "react"
 import _ from "lodash"
 import { TableContainer } from "./table_container"
 
@@ -28,10 +30,48 @@ export const ConsentFormViz = (props: Props): JSX.Element => {
   const { description, donateQuestion, donateButton, cancelButton } = prepareCopy(props)
   const [isDonating, setIsDonating] = useState(false)
 
+  // Paginated tables resolve a PayloadTableQuery for every page or search. The script answers with
+  // a CommandUITablePage that comes with a new resolve function for the next payload.
+  const resolveRef = useRef(resolve)
+  const pendingPayloadRef = useRef<any>()
+
   useEffect(() => {
     setTables(parseTables(props.tables))
   }, [props.tables])
 
+  useEffect(() => {
+    resolveRef.current = resolve
+  }, [resolve])
+
+  useEffect(() => {
+    return props.subscribeTablePage?.((command, nextResolve) => {
+      setTables((tables) => tables.map((table) => (table.id === command.table_id ? applyTablePage(table, command) : table)))
+      const pendingPayload = pendingPayloadRef.current
+      if (pendingPayload !== undefined) {
+        pendingPayloadRef.current = undefined
+        nextResolve(pendingPayload)
+      } else {
+        resolveRef.current = nextResolve
+      }
+    })
+  }, [props.subscribeTablePage])
+
+  // Only the latest payload is kept while the script is still answering a query
+  function sendPayload(payload: any): void {
+    const currentResolve = resolveRef.current
+    if (currentResolve === undefined) {
+      pendingPayloadRef.current = payload
+      return
+    }
+    resolveRef.current = undefined
+    currentResolve(payload)
+  }
+
+  const queryTable = useCallback((tableId: string, page: number, search: string, deletedRows: string[][]) => {
+    const query = { table_id: tableId, page, search, deleted: deletedRows.flat() }
+    sendPayload({ __type__: "PayloadTableQuery", value: JSON.stringify(query) })
+  }, [])
+
   const updateTable = useCallback((tableId: string, table: TableWithContext) => {
     setTables((tables) => {
       const index = tables.findIndex((table) => table.id === tableId)
@@ -65,11 +105,11 @@ export const ConsentFormViz = (props: Props): JSX.Element => {
     }
   }
 
-  function rows(data: any): PropsUITableRow[] {
+  function rows(data: any, rowIds?: string[]): PropsUITableRow[] {
     const result: PropsUITableRow[] = []
     const n = rowCount(data)
     for (let row = 0; row <= n; row++) {
-      const id = `${row}`
+      const id = rowIds !== undefined ? rowIds[row] : `${row}`
       const cells = columnNames(data).map((column: string) => rowCell(data, column, row))
       result.push({ id, cells })
     }
@@ -94,6 +134,16 @@ export const ConsentFormViz = (props: Props): JSX.Element => {
     const body: PropsUITableBody = {
       rows: rows(dataFrame),
     }
+    const pagination =
+      tableData.page_size !== undefined && tableData.page_size !== null
+        ? {
+            page: 0,
+            pageSize: tableData.page_size,
+            totalRows: tableData.total_rows ?? 0,
+            filteredRows: tableData.total_rows ?? 0,
+            search: "",
+          }
+        : undefined
     return {
       __type__: "PropsUITable",
       id,
@@ -108,17 +158,33 @@ export const ConsentFormViz = (props: Props): JSX.Element => {
       visualizations: tableData.visualizations,
       folded: tableData.folded || false,
       deleteOption: tableData.delete_option,
+      pagination,
     }
   }
 
+  function applyTablePage(table: TableWithContext, command: CommandUITablePage): TableWithContext {
+    const dataFrame = loadDataFrame(command.data_frame)
+    const body: PropsUITableBody = {
+      rows: rows(dataFrame, command.row_ids),
+    }
+    const pagination = {
+      page: command.page,
+      pageSize: command.page_size,
+      totalRows: command.total_rows,
+      filteredRows: command.filtered_rows,
+      search: command.search,
+    }
+    return { ...table, body, originalBody: body, pagination }
+  }
+
   function handleDonate(): void {
     setIsDonating(true)
     const value = serializeConsentData()
-    resolve?.({ __type__: "PayloadJSON", "value": value })
+    sendPayload({ __type__: "PayloadJSON", "value": value })
   }
 
   function handleCancel(): void {
-    resolve?.({ __type__: "PayloadFalse", value: false })
+    sendPayload({ __type__: "PayloadFalse", value: false })
   }
 
   function serializeConsentData(): string {
@@ -131,7 +197,11 @@ export const ConsentFormViz = (props: Props): JSX.Element => {
   }
 
 
-  function serializeTable({ id, head, body: { rows }, deletedRowCount }: TableWithContext): any {
+  function serializeTable({ id, head, body: { rows }, deletedRowCount, deletedRows, pagination }: TableWithContext): any {
+    if (pagination !== undefined) {
+      // The script fills in the remaining rows of paginated tables
+      return { [id]: [], "deleted rows": deletedRows.flat(), "deleted row count": deletedRowCount.toString() }
+    }
     const data = rows.map((row) => serializeRow(row, head))
     return { [id]: data, "deleted row count": deletedRowCount.toString() }
   }
@@ -153,7 +223,14 @@ export const ConsentFormViz = (props: Props): JSX.Element => {
         <div className="grid gap-8 max-w-full">
           {tables.map((table) => {
             return (
-              <TableContainer key={table.id} id={table.id} table={table} updateTable={updateTable} locale={locale} />
+              <TableContainer
+                key={table.id}
+                id={table.id}
+                table={table}
+                updateTable={updateTable}
+                queryTable={queryTable}
+                locale={locale}
+              />
             )
           })}
         </div>
@@ -193,11 +270,30 @@ function prepareCopy({ donateQuestion, donateButton, description, locale }: Prop
 
 function loadDataFrame(dataFrame: any) {
   if (typeof dataFrame === "string") {
-      return JSON.parse(dataFrame)
+      dataFrame = JSON.parse(dataFrame)
   } 
+  if (dataFrame?.__format__ === "columnar") {
+    return decodeColumnarDataFrame(dataFrame)
+  }
   return dataFrame;
 }
 
+// Decodes the compact columnar wire format (see compact_data_frame in d3i_props.py)
+// into one array per column. Arrays can be indexed with `${row}` like the default format.
+function decodeColumnarDataFrame({ columns, data }: ColumnarDataFrame): Record<string, any[]> {
+  const result: Record<string, any[]> = {}
+  columns.forEach((column, index) => {
+    const values = data[index]
+    if (Array.isArray(values)) {
+      result[column] = values
+    } else {
+      const { dictionary, codes } = values
+      result[column] = codes.map((code) => (code < 0 ? null : dictionary[code]))
+    }
+  })
+  return result
+}
+
 const defaultDonateQuestionLabel = new TextBundle()
   .add('en', 'Do you want to share the above data?')
   .add('de', 'Möchten Sie die oben genannten Daten teilen?')
@@ -31,6 +31,7 @@ export interface Props {
   unfilteredRows: number
   handleDelete?: (rowIds: string[]) => void
   handleUndo?: () => void
+  handlePageChange?: (page: number) => void
   pageSize?: number
 }
 
@@ -49,14 +50,29 @@ export const Table = ({
   unfilteredRows,
   handleDelete,
   handleUndo,
+  handlePageChange,
   pageSize = 7
 }: Props): JSX.Element => {
-  const [page, setPage] = useState(0)
+  const [localPage, setLocalPage] = useState(0)
   const columnNames = table.head.cells
   const [selected, setSelected] = useState<Set<string>>(new Set())
   const ref = useRef<HTMLDivElement>(null)
   const innerRef = useRef<HTMLDivElement>(null)
-  const nPages = Math.ceil(table.body.rows.length / pageSize)
+
+  // Paginated tables only hold the rows of the current page, the script serves the other pages
+  const pagination = table.pagination
+  if (pagination !== undefined) pageSize = pagination.pageSize
+  const page = pagination !== undefined ? pagination.page : localPage
+  const nPages = Math.ceil((pagination !== undefined ? pagination.filteredRows : table.body.rows.length) / pageSize)
+  const firstIndex = pagination !== undefined ? 0 : page * pageSize
+
+  function setPage(page: number): void {
+    if (pagination !== undefined) {
+      handlePageChange?.(page)
+    } else {
+      setLocalPage(page)
+    }
+  }
   const selectedLabel = selected.size.toLocaleString(locale, { useGrouping: true })
   const text = useMemo(() => getTranslations(locale), [locale])
 
@@ -71,7 +87,7 @@ export const Table = ({
 
   useEffect(() => {
     setSelected(new Set())
-    setPage((page) => Math.max(0, Math.min(page, nPages - 1)))
+    setLocalPage((page) => Math.max(0, Math.min(page, nPages - 1)))
   }, [table, nPages])
 
   useEffect(() => {
@@ -104,11 +120,11 @@ export const Table = ({
   const items = useMemo(() => {
     const items: Array<PropsUITableRow | null> = new Array(pageSize).fill(null)
     for (let i = 0; i < pageSize; i++) {
-      const index = page * pageSize + i
+      const index = firstIndex + i
       if (table.body.rows[index] !== undefined) items[i] = table.body.rows[index]
     }
     return items
-  }, [table, page, pageSize])
+  }, [table, firstIndex, pageSize])
 
   function renderHeaderCell (value: string, i: number): JSX.Element {
     return (
@@ -17,10 +17,11 @@ interface TableContainerProps {
   id: string
   table: TableWithContext
   updateTable: (tableId: string, table: TableWithContext) => void
+  queryTable?: (tableId: string, page: number, search: string, deletedRows: string[][]) => void
   locale: string
 }
 
-export const TableContainer = ({ id, table, updateTable, locale }: TableContainerProps): JSX.Element => {
+export const TableContainer = ({ id, table, updateTable, queryTable, locale }: TableContainerProps): JSX.Element => {
   const tableVisualizations = table.visualizations != null ? table.visualizations : []
   const [searchFilterIds, setSearchFilterIds] = useState<Set<string>>()
   const [search, setSearch] = useState<string>("")
@@ -30,8 +31,13 @@ export const TableContainer = ({ id, table, updateTable, locale }: TableContaine
 
   useEffect(() => {
     const timer = setTimeout(() => {
-      const ids = searchRows(table.originalBody.rows, search)
-      setSearchFilterIds(ids)
+      if (table.pagination !== undefined) {
+        // The script searches paginated tables
+        if (search.trim() !== table.pagination.search) queryTable?.(id, 0, search, table.deletedRows)
+      } else {
+        const ids = searchRows(table.originalBody.rows, search)
+        setSearchFilterIds(ids)
+      }
       if (search !== "" && lastSearch.current === "") {
         setTimeout(() => setShow(true), 10)
       }
@@ -57,25 +63,43 @@ export const TableContainer = ({ id, table, updateTable, locale }: TableContaine
         }
       }
       if (rowIds.length > 0) {
+        const deletedRows = [...table.deletedRows, rowIds]
+        if (table.pagination !== undefined) {
+          updateTable(id, deletePaginatedTableRows(table, deletedRows))
+          queryTable?.(id, table.pagination.page, table.pagination.search, deletedRows)
+          return
+        }
         if (rowIds.length === searchedTable?.body?.rows?.length) {
           setSearch("")
           setSearchFilterIds(undefined)
         }
-        const deletedRows = [...table.deletedRows, rowIds]
         const newTable = deleteTableRows(table, deletedRows)
         updateTable(id, newTable)
       }
     },
-    [id, table, searchedTable]
+    [id, table, searchedTable, queryTable]
   )
 
   const handleUndo = useCallback(() => {
     const deletedRows = table.deletedRows.slice(0, -1)
+    if (table.pagination !== undefined) {
+      updateTable(id, deletePaginatedTableRows(table, deletedRows))
+      queryTable?.(id, table.pagination.page, table.pagination.search, deletedRows)
+      return
+    }
     const newTable = deleteTableRows(table, deletedRows)
     updateTable(id, newTable)
-  }, [id, table])
+  }, [id, table, queryTable])
+
+  const handlePageChange = useCallback(
+    (page: number) => {
+      if (table.pagination === undefined) return
+      queryTable?.(id, page, table.pagination.search, table.deletedRows)
+    },
+    [id, table, queryTable]
+  )
 
-  const unfilteredRows = table.body.rows.length
+  const unfilteredRows = table.pagination !== undefined ? table.pagination.totalRows : table.body.rows.length
 
   return (
     <div
@@ -118,6 +142,7 @@ export const TableContainer = ({ id, table, updateTable, locale }: TableContaine
               unfilteredRows={unfilteredRows}
               handleDelete={handleDelete}
               handleUndo={handleUndo}
+              handlePageChange={handlePageChange}
               locale={locale}
             />
           </div>
@@ -164,6 +189,18 @@ function deleteTableRows(table: TableWithContext, deletedRows: string[][]): Tabl
   }
 }
 
+// Rows of paginated tables are only known for the current page, the script leaves out the deleted rows
+function deletePaginatedTableRows(table: TableWithContext, deletedRows: string[][]): TableWithContext {
+  const deleteIds = new Set<string>(deletedRows.flat())
+  const rows = table.body.rows.filter((row) => !deleteIds.has(row.id))
+  return {
+    ...table,
+    body: { ...table.body, rows },
+    deletedRowCount: deleteIds.size,
+    deletedRows,
+  }
+}
+
 function searchRows(rows: PropsUITableRow[], search: string): Set<string> | undefined {
   if (search.trim() === "") return undefined
 
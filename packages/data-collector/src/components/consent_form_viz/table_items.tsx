@@ -15,9 +15,10 @@ export const TableItems = ({ table, searchedTable, handleUndo, locale }: Props):
   const text = useMemo(() => getTranslations(locale), [locale])
 
   const deleted = table.deletedRowCount
-  const n = table.body.rows.length
-  const searched = searchedTable.body.rows.length
-  const total = table.originalBody.rows.length - table.deletedRowCount
+  const pagination = table.pagination
+  const n = pagination !== undefined ? pagination.totalRows : table.body.rows.length
+  const searched = pagination !== undefined ? pagination.filteredRows : searchedTable.body.rows.length
+  const total = pagination !== undefined ? pagination.totalRows : table.originalBody.rows.length - table.deletedRowCount
 
   const nLabel = n.toLocaleString(locale, { useGrouping: true })
   const totalLabel = total.toLocaleString(locale, { useGrouping: true })
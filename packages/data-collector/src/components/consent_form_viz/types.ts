@@ -7,6 +7,20 @@ export interface PropsUIPromptConsentFormTableViz {
   visualizations: any
   folded: boolean
   delete_option: boolean
+  page_size?: number
+  total_rows?: number
+}
+
+export interface DictionaryEncodedColumn {
+  dictionary: any[]
+  codes: number[]
+}
+
+export interface ColumnarDataFrame {
+  __format__: "columnar"
+  n_rows: number
+  columns: string[]
+  data: Array<any[] | DictionaryEncodedColumn>
 }
 
 export interface PropsUIPromptConsentFormViz {
@@ -22,6 +36,15 @@ export interface Annotation {
   [key: string]: any
 }
 
+// Set for tables that are paginated by the script: only the rows of the current page are loaded
+export interface TablePagination {
+  page: number
+  pageSize: number
+  totalRows: number
+  filteredRows: number
+  search: string
+}
+
 export interface TableContext {
   title: string
   description: string
@@ -32,6 +55,7 @@ export interface TableContext {
   visualizations?: any[]
   folded: boolean
   deleteOption: boolean
+  pagination?: TablePagination
 }
 
 export type TableWithContext = TableContext & PropsUITable
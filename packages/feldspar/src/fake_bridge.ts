@@ -21,7 +21,7 @@ export default class FakeBridge implements Bridge {
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({key: command.key, data: command.json_string}),
+        body: JSON.stringify({key: command.key, data: command.json_string, encoding: command.encoding}),
       });
 
       if (!response.ok) {
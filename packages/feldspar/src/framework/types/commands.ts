@@ -43,7 +43,8 @@ export type PayloadResolved =
   PayloadTrue |
   PayloadString |
   PayloadFile |
-  PayloadJSON
+  PayloadJSON |
+  PayloadTableQuery
 
 export interface PayloadVoid {
   __type__: 'PayloadVoid'
@@ -73,6 +74,15 @@ export function isPayloadJSON (arg: any): arg is PayloadJSON {
   return isInstanceOf<PayloadJSON>(arg, 'PayloadJSON', ['value'])
 }
 
+// Asks the script for a page of a paginated consent table, answered with a CommandUITablePage
+export interface PayloadTableQuery {
+  __type__: 'PayloadTableQuery'
+  value: string
+}
+export function isPayloadTableQuery (arg: any): arg is PayloadTableQuery {
+  return isInstanceOf<PayloadTableQuery>(arg, 'PayloadTableQuery', ['value'])
+}
+
 export type Command =
   CommandUI |
   CommandSystem
@@ -108,16 +118,19 @@ export function isCommandSystemExit (arg: any): arg is CommandSystemExit {
 }
 
 export type CommandUI =
-  CommandUIRender
+  CommandUIRender |
+  CommandUITablePage
 
 export function isCommandUI (arg: any): arg is CommandUI {
-  return isCommandUIRender(arg)
+  return isCommandUIRender(arg) || isCommandUITablePage(arg)
 }
 
 export interface CommandSystemDonate {
   __type__: 'CommandSystemDonate'
   key: string
   json_string: string
+  // Set for compressed donations, e.g. 'zlib+base64'
+  encoding?: string
 }
 export function isCommandSystemDonate (arg: any): arg is CommandSystemDonate {
   return isInstanceOf<CommandSystemDonate>(arg, 'CommandSystemDonate', ['key', 'json_string'])
@@ -130,3 +143,18 @@ export interface CommandUIRender {
 export function isCommandUIRender (arg: any): arg is CommandUIRender {
   return isInstanceOf<CommandUIRender>(arg, 'CommandUIRender', ['page']) && isPropsUIPage(arg.page)
 }
+
+export interface CommandUITablePage {
+  __type__: 'CommandUITablePage'
+  table_id: string
+  page: number
+  page_size: number
+  search: string
+  total_rows: number
+  filtered_rows: number
+  row_ids: string[]
+  data_frame: any
+}
+export function isCommandUITablePage (arg: any): arg is CommandUITablePage {
+  return isInstanceOf<CommandUITablePage>(arg, 'CommandUITablePage', ['table_id', 'page', 'row_ids', 'data_frame'])
+}
@@ -1,6 +1,6 @@
-import { Response, CommandUIRender } from "../../types/commands";
+import { Response, CommandUI, CommandUITablePage, isCommandUITablePage } from "../../types/commands";
 import { PropsUIPage } from "../../types/pages";
-import VisualizationFactory from "./factory";
+import VisualizationFactory, { TablePageListener } from "./factory";
 import { JSX } from "react";
 import React from "react";
 
@@ -8,6 +8,7 @@ export default class ReactEngine {
   factory: VisualizationFactory;
   locale!: string;
   private setState?: (state: { elements: JSX.Element[] }) => void;
+  private tablePageListeners = new Set<TablePageListener>();
 
   constructor(factory: VisualizationFactory) {
     this.factory = factory;
@@ -23,21 +24,42 @@ export default class ReactEngine {
     this.setState = setState;
   }
 
-  async render(command: CommandUIRender): Promise<Response> {
+  async render(command: CommandUI): Promise<Response> {
     console.debug("[ReactEngine] render", command);
-    const payload = await this.renderPage(command.page);
+    const payload = isCommandUITablePage(command)
+      ? await this.renderTablePage(command)
+      : await this.renderPage(command.page);
     console.log("[ReactEngine] render done", command, payload);
     return { __type__: "Response", command, payload };
   }
 
   renderPage(props: PropsUIPage): Promise<any> {
     return new Promise<any>((resolve) => {
-      const context = { locale: this.locale, resolve };
+      const context = { locale: this.locale, resolve, subscribeTablePage: this.subscribeTablePage };
       const page = this.factory.createPage(props, context);
       this.updateElements([page]);
     });
   }
 
+  // A table page is delivered to the page that is currently shown, which resolves the next payload
+  renderTablePage(command: CommandUITablePage): Promise<any> {
+    return new Promise<any>((resolve) => {
+      if (this.tablePageListeners.size === 0) {
+        console.error("[ReactEngine] No table to render page for", command.table_id);
+        resolve({ __type__: "PayloadVoid", value: undefined });
+        return;
+      }
+      this.tablePageListeners.forEach((listener) => listener(command, resolve));
+    });
+  }
+
+  subscribeTablePage = (listener: TablePageListener): (() => void) => {
+    this.tablePageListeners.add(listener);
+    return () => {
+      this.tablePageListeners.delete(listener);
+    };
+  };
+
   private updateElements(elements: JSX.Element[]): void {
     if (!this.setState) return;
     const elementsWithKeys = elements.map((element, index) =>
@@ -1,14 +1,20 @@
 import { PropsUIPage } from "../../types/pages";
-import { Payload } from "../../types/commands";
+import { CommandUITablePage, Payload } from "../../types/commands";
 import { PageFactory } from "./factories/base";
 import { EndPageFactory } from "./factories/end_page";
 import { DataSubmissionPageFactory } from "./factories/data_submission_page";
 import { JSX } from "react";
 import React from "react";
 
+export type TablePageListener = (
+  command: CommandUITablePage,
+  resolve: (payload: Payload) => void
+) => void;
+
 export interface ReactFactoryContext {
   locale: string;
   resolve?: (payload: Payload) => void;
+  subscribeTablePage?: (listener: TablePageListener) => () => void;
 }
 
 export default class ReactFactory {
@@ -49,7 +49,7 @@ export const DataSubmissionPage = (props: Props): JSX.Element => {
   }
 
   function renderBody(props: Props): JSX.Element[] {
-    const context = { locale: locale, resolve: props.resolve, onDataSubmissionDataChanged, onDonate, onCancel};
+    const context = { locale: locale, resolve: props.resolve, subscribeTablePage: props.subscribeTablePage, onDataSubmissionDataChanged, onDonate, onCancel};
     const bodyItems = Array.isArray(props.body) ? props.body : [props.body];
 
     return bodyItems.map((item, index) => {
@@ -5,12 +5,12 @@ export { default as FakeBridge } from './fake_bridge'
 export { LiveBridge } from './live_bridge'
 export {DataSubmissionPageFactory} from './framework/visualization/react/factories/data_submission_page'
 export {PromptFactory} from './framework/visualization/react/ui/prompts/factory'
-export {ReactFactoryContext} from './framework/visualization/react/factory'
+export {ReactFactoryContext, TablePageListener} from './framework/visualization/react/factory'
 
 // EXPORTS ADDED BY NdS
 export { default } from './framework/text_bundle'
 export { Translator } from './framework/translator'
-export { Table } from './framework/types/commands'
+export { Table, CommandUITablePage } from './framework/types/commands'
 export { 
   Title1, 
   Title2,
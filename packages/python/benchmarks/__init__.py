@@ -0,0 +1,5 @@
+"""
+Tools to measure the performance of the port package without real participant data
+
+This package is not part of the port wheel that runs in the browser.
+"""
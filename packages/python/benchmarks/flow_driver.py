@@ -0,0 +1,316 @@
+"""
+Contains a headless driver for the donation flows
+
+In the browser the flow of a platform (``process(session_id)``) is driven by the frontend:
+every command the script yields is rendered or sent, and the participant's answer is sent back as a payload.
+This module plays that role on a plain Python install. A responder decides the payload for every command,
+and the driver records each command with its serialized size and the wall time of every step.
+
+Usage::
+
+    from benchmarks.flow_driver import FlowDriver, AutoResponder
+    from port.platforms import instagram
+
+    run = FlowDriver(instagram.process).run(AutoResponder("/tmp/instagram_10x.zip"))
+    print(run.summary())
+
+Or from the command line (in packages/python)::
+
+    python -m benchmarks.flow_driver instagram /tmp/instagram_10x.zip
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generator, Iterable
+import argparse
+import functools
+import importlib
+import json
+import logging
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Payload:
+    """
+    A payload as the frontend sends it to the script, for example
+    ``Payload("PayloadString", "/file-input/export.zip")`` or ``Payload("PayloadJSON", json_string)``.
+    """
+    __type__: str
+    value: Any = None
+
+
+PAYLOAD_VOID = Payload("PayloadVoid", None)
+
+
+@dataclass
+class Step:
+    """
+    One command yielded by the script.
+
+    Attributes:
+        index (int): Position of the step in the flow.
+        payload_type (str): Type of the payload that was sent to get this command.
+        command_type (str): ``__type__`` of the command, for renders followed by the type of the page body.
+        command (dict): The command as it would be sent to the frontend (``toDict()``).
+        size (int): Size of the command serialized as JSON in bytes.
+        script_seconds (float): Wall time the script took to yield the command.
+        serialize_seconds (float): Wall time of ``toDict()``.
+    """
+    index: int
+    payload_type: str
+    command_type: str
+    command: dict
+    size: int
+    script_seconds: float
+    serialize_seconds: float
+
+
+@dataclass
+class FlowRun:
+    """
+    The recorded steps of a flow.
+
+    Attributes:
+        steps (list[Step]): The commands yielded by the script.
+        error (str | None): The exception that ended the flow, if the script raised one.
+    """
+    steps: list[Step] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(step.script_seconds + step.serialize_seconds for step in self.steps)
+
+    @property
+    def donations(self) -> list[dict]:
+        return [step.command for step in self.steps if step.command.get("__type__") == "CommandSystemDonate"]
+
+    def to_data_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "step": step.index,
+                "payload": step.payload_type,
+                "command": step.command_type,
+                "size": step.size,
+                "script_seconds": step.script_seconds,
+                "serialize_seconds": step.serialize_seconds,
+            }
+            for step in self.steps
+        ])
+
+    def summary(self) -> str:
+        summary = self.to_data_frame().to_string(index=False) + f"\ntotal: {self.total_seconds:.3f}s"
+        if self.error is not None:
+            summary += f"\nerror: {self.error}"
+        return summary
+
+
+def body_items(command: dict) -> list[dict]:
+    """The prompts on the page of a render command"""
+    body = command.get("page", {}).get("body", [])
+    return body if isinstance(body, list) else [body]
+
+
+def command_type(command: dict) -> str:
+    if command.get("__type__") == "CommandUIRender":
+        return "CommandUIRender:" + ",".join(item.get("__type__", "") for item in body_items(command))
+    return command.get("__type__", "")
+
+
+def _js_string(value: Any) -> str:
+    """String(value) of a JSON value, the way the consent form renders cells"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (list, dict)):
+        return ",".join(_js_string(v) for v in value) if isinstance(value, list) else "[object Object]"
+    return str(value)
+
+
+def table_rows(data_frame: Any) -> list[dict[str, str]]:
+    """
+    Decodes the data_frame of a consent form table (default or compact columnar format)
+    into the rows the consent form donates.
+    """
+    if isinstance(data_frame, str):
+        data_frame = json.loads(data_frame)
+
+    if data_frame.get("__format__") == "columnar":
+        columns = {}
+        for name, values in zip(data_frame["columns"], data_frame["data"]):
+            if isinstance(values, dict):
+                values = [None if code < 0 else values["dictionary"][code] for code in values["codes"]]
+            columns[name] = values
+        n_rows = data_frame["n_rows"]
+        return [{name: _js_string(values[i]) for name, values in columns.items()} for i in range(n_rows)]
+
+    if not data_frame:
+        return []
+    row_ids = list(next(iter(data_frame.values())).keys())
+    return [{name: _js_string(values.get(row_id)) for name, values in data_frame.items()} for row_id in row_ids]
+
+
+def consent_payload(prompt: dict) -> Payload:
+    """The payload of a participant who donates all tables of a consent form without deleting rows"""
+    donated = []
+    for table in prompt.get("tables", []):
+        if table.get("page_size") is not None:
+            donated.append({table["id"]: [], "deleted rows": [], "deleted row count": "0"})
+        else:
+            donated.append({table["id"]: table_rows(table["data_frame"]), "deleted row count": "0"})
+    return Payload("PayloadJSON", json.dumps(donated))
+
+
+def questionnaire_payload(prompt: dict, locale: str = "en") -> Payload:
+    """The payload of a participant who picks the first choice of every question"""
+    answers: dict[str, Any] = {}
+    for question in prompt.get("questions", []):
+        choices = [choice.get("translations", {}).get(locale, "") for choice in question.get("choices", [])]
+        if question.get("__type__") == "PropsUIQuestionMultipleChoiceCheckbox":
+            answers[str(question["id"])] = choices[:1]
+        elif question.get("__type__") == "PropsUIQuestionMultipleChoice":
+            answers[str(question["id"])] = choices[0] if choices else ""
+        else:
+            answers[str(question["id"])] = "synthetic answer"
+    answers["questionToChatgpt"] = prompt.get("questionToChatgpt")
+    answers["answerFromChatgpt"] = prompt.get("answerFromChatgpt")
+    return Payload("PayloadJSON", json.dumps(answers))
+
+
+class AutoResponder:
+    """
+    Answers every command like a participant who selects the given file, donates everything
+    and fills in the questionnaires.
+
+    Args:
+        file_path (str): The DDP to select in the file prompt.
+        consent (bool): Whether to donate on the consent form.
+        retry (bool): Whether to try again when the file is not valid. Only once, to prevent endless flows.
+    """
+    def __init__(self, file_path: str, consent: bool = True, retry: bool = False):
+        self.file_path = file_path
+        self.consent = consent
+        self.retry = retry
+
+    def __call__(self, command: dict) -> Payload:
+        if command.get("__type__") != "CommandUIRender":
+            return PAYLOAD_VOID
+
+        prompt = body_items(command)[0] if body_items(command) else {}
+        prompt_type = prompt.get("__type__")
+        if prompt_type in ("PropsUIPromptFileInput", "PropsUIPromptFileInputMultiple"):
+            return Payload("PayloadString", self.file_path)
+        if prompt_type == "PropsUIPromptConsentFormViz":
+            return consent_payload(prompt) if self.consent else Payload("PayloadFalse", False)
+        if prompt_type == "PropsUIPromptQuestionnaire":
+            return questionnaire_payload(prompt)
+        if prompt_type == "PropsUIPromptRadioInput":
+            items = prompt.get("items", [])
+            return Payload("PayloadString", items[0]["value"] if items else "")
+        if prompt_type == "PropsUIPromptRetry":
+            retry, self.retry = self.retry, False
+            return Payload("PayloadTrue", True) if retry else Payload("PayloadFalse", False)
+        return Payload("PayloadTrue", True)
+
+
+def scripted(payloads: Iterable[Payload]) -> Callable[[dict], Payload]:
+    """
+    A responder that answers the render commands with the given payloads, in order.
+    Other commands get a PayloadVoid, like the frontend does.
+    """
+    remaining = iter(payloads)
+
+    def respond(command: dict) -> Payload:
+        if command.get("__type__") != "CommandUIRender":
+            return PAYLOAD_VOID
+        return next(remaining, Payload("PayloadFalse", False))
+
+    return respond
+
+
+class FlowDriver:
+    """
+    Drives the generator of a donation flow without a browser.
+
+    Args:
+        process (Callable[[int], Generator]): The ``process`` function of a platform module.
+        session_id (int): The session id passed to process.
+        max_steps (int): Stop after this many steps, guards against flows that never end.
+    """
+    def __init__(self, process: Callable[[int], Generator], session_id: int = 1, max_steps: int = 1000):
+        self.process = process
+        self.session_id = session_id
+        self.max_steps = max_steps
+
+    def run(self, responder: Callable[[dict], Payload]) -> FlowRun:
+        """
+        Runs the flow until it exits.
+
+        Args:
+            responder (Callable[[dict], Payload]): Returns the payload for a command (as dict).
+
+        Returns:
+            FlowRun: The recorded steps. If the script raises, the flow ends and the exception is kept in ``error``.
+        """
+        run = FlowRun()
+        script = self.process(self.session_id)
+        payload = None
+
+        for index in range(self.max_steps):
+            start = time.perf_counter()
+            try:
+                command = script.send(payload)
+            except StopIteration:
+                break
+            except Exception as e:
+                logger.error("Flow raised after %s steps: %s", index, e)
+                run.error = f"{type(e).__name__}: {e}"
+                break
+            script_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            command_dict = command.toDict()
+            serialize_seconds = time.perf_counter() - start
+            size = len(json.dumps(command_dict, ensure_ascii=False).encode("utf-8"))
+
+            run.steps.append(Step(
+                index=index,
+                payload_type=payload.__type__ if payload is not None else "",
+                command_type=command_type(command_dict),
+                command=command_dict,
+                size=size,
+                script_seconds=script_seconds,
+                serialize_seconds=serialize_seconds,
+            ))
+            if command_dict.get("__type__") == "CommandSystemExit":
+                break
+            payload = responder(command_dict)
+        else:
+            logger.error("Flow did not end within %s steps", self.max_steps)
+
+        return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a donation flow headless and time every step")
+    parser.add_argument("platform", help="Module in port.platforms, e.g. instagram")
+    parser.add_argument("path", help="The DDP zip to select")
+    parser.add_argument("--decline", action="store_true", help="Decline on the consent form")
+    parser.add_argument("--metrics", action="store_true", help="Collect and donate the metrics of the flow")
+    args = parser.parse_args()
+
+    module = importlib.import_module(f"port.platforms.{args.platform}")
+    process = functools.partial(module.process, collect_metrics=args.metrics)
+    run = FlowDriver(process).run(AutoResponder(args.path, consent=not args.decline))
+    print(run.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Contains the benchmark suite of the extraction hot paths
+
+Every benchmark case times a helper or an extraction over synthetic DDPs (see synthetic_ddp) at several scales,
+and measures the peak memory that is allocated in Python during one run (with tracemalloc).
+The results can be stored as a JSON baseline, later runs are compared against it and fail
+when a case got slower or uses more memory than the threshold allows.
+
+Usage (in packages/python)::
+
+    # Measure and store the baseline, before a change
+    python -m benchmarks.suite --save
+
+    # Measure and compare against the baseline, exits with 1 on a regression
+    python -m benchmarks.suite
+
+    # Only some cases, at other scales
+    python -m benchmarks.suite --cases extraction:instagram read_json_from_bytes --scales 1 10 100
+
+Timings depend on the machine, only compare against a baseline that was made on the same machine.
+"""
+
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable
+import argparse
+import fnmatch
+import io
+import json
+import platform as python_platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+import port.helpers.extraction_helpers as eh
+import port.helpers.validate as validate
+import port.platforms.chatgpt as chatgpt
+import port.platforms.instagram as instagram
+import port.platforms.linkedin as linkedin
+import port.platforms.netflix as netflix
+import port.platforms.tiktok as tiktok
+import port.platforms.x as x
+import port.platforms.youtube as youtube
+from benchmarks.synthetic_ddp import generate_ddp
+
+DEFAULT_SCALES = [1, 10]
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+
+# Differences below these are noise, they are never reported as regressions
+NOISE_SECONDS = 0.002
+NOISE_BYTES = 256 * 1024
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "baseline.json"
+DDP_CACHE_DIR = Path(tempfile.gettempdir()) / "port-benchmarks"
+
+PLATFORMS = {
+    "chatgpt": chatgpt,
+    "instagram": instagram,
+    "linkedin": linkedin,
+    "netflix": netflix,
+    "tiktok": tiktok,
+    "x": x,
+    "youtube": youtube,
+}
+
+
+def ddp_path(platform: str, scale: int) -> str:
+    """
+    Path of the synthetic DDP of a platform at a scale, the DDP is generated the first time.
+    Generated DDPs are kept in DDP_CACHE_DIR, they are deterministic so they can be reused between runs.
+    """
+    path = DDP_CACHE_DIR / f"{platform}-{scale}x.zip"
+    if not path.exists():
+        DDP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        generate_ddp(platform, str(path), scale=scale)
+    return str(path)
+
+
+def member_bytes(platform: str, scale: int, file_name: str) -> bytes:
+    with eh.ZipIndex(ddp_path(platform, scale)) as zip_index:
+        return eh.extract_file_from_zip(zip_index, file_name).getvalue()
+
+
+# A case gets the scale and returns the function to time, all preparation is done before timing
+Case = Callable[[int], Callable[[], Any]]
+CASES: dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    def register(setup: Case) -> Case:
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case("dict_denester")
+def bench_dict_denester(scale: int) -> Callable[[], Any]:
+    conversations = json.loads(member_bytes("chatgpt", scale, "conversations.json"))
+    return lambda: [eh.dict_denester(conversation) for conversation in conversations]
+
+
+@case("find_item")
+def bench_find_item(scale: int) -> Callable[[], Any]:
+    conversations = json.loads(member_bytes("chatgpt", scale, "conversations.json"))
+    denested = [eh.dict_denester(conversation) for conversation in conversations]
+    return lambda: [(eh.find_item(d, "title"), eh.find_item(d, "create_time"), eh.find_item(d, "parts")) for d in denested]
+
+
+@case("extract_file_from_zip")
+def bench_extract_file_from_zip(scale: int) -> Callable[[], Any]:
+    path = ddp_path("chatgpt", scale)
+    return lambda: eh.extract_file_from_zip(path, "conversations.json")
+
+
+@case("read_json_from_bytes")
+def bench_read_json_from_bytes(scale: int) -> Callable[[], Any]:
+    data = member_bytes("chatgpt", scale, "conversations.json")
+    return lambda: eh.read_json_from_bytes(io.BytesIO(data))
+
+
+@case("read_csv_from_bytes_to_df")
+def bench_read_csv_from_bytes_to_df(scale: int) -> Callable[[], Any]:
+    data = member_bytes("netflix", scale, "ViewingActivity.csv")
+    return lambda: eh.read_csv_from_bytes_to_df(io.BytesIO(data))
+
+
+def extraction_call(platform: str, scale: int) -> Callable[[], list]:
+    """The extraction of a platform with the arguments the flow of the platform passes"""
+    module = PLATFORMS[platform]
+    path = ddp_path(platform, scale)
+    if platform == "netflix":
+        selected_user = netflix.extract_users(path)[0]
+        return lambda: netflix.extraction(path, selected_user)
+    if platform == "youtube":
+        validation = validate.validate_zip(youtube.DDP_CATEGORIES, path)
+        return lambda: youtube.extraction(path, validation)
+    return lambda: module.extraction(path)
+
+
+def bench_extraction(platform: str) -> Case:
+    return lambda scale: extraction_call(platform, scale)
+
+
+def bench_to_dict(platform: str) -> Case:
+    def setup(scale: int) -> Callable[[], Any]:
+        tables = extraction_call(platform, scale)()
+        return lambda: [table.toDict() for table in tables]
+    return setup
+
+
+for _platform in PLATFORMS:
+    case(f"extraction:{_platform}")(bench_extraction(_platform))
+    case(f"toDict:{_platform}")(bench_to_dict(_platform))
+
+
+@dataclass
+class Measurement:
+    """
+    The result of one case at one scale.
+
+    Attributes:
+        case (str): Name of the case.
+        scale (int): Scale of the synthetic input.
+        seconds (float): Median wall time of a run.
+        min_seconds (float): Fastest run.
+        peak_bytes (int): Peak memory allocated in Python during one run.
+        repeat (int): Number of timed runs.
+    """
+    case: str
+    scale: int
+    seconds: float
+    min_seconds: float
+    peak_bytes: int
+    repeat: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}@{self.scale}"
+
+
+def measure(name: str, scale: int, repeat: int = DEFAULT_REPEAT) -> Measurement:
+    """
+    Times a case and measures its peak memory.
+
+    The case runs once to warm up, then ``repeat`` times for timing, and once more with tracemalloc
+    for the memory: tracemalloc slows down allocations, so it is not active while timing.
+    """
+    run = CASES[name](scale)
+    run()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(name, scale, statistics.median(times), min(times), peak_bytes, repeat)
+
+
+def select_cases(patterns: list[str] | None) -> list[str]:
+    """Names of the cases that match any of the glob patterns, all cases if there are no patterns"""
+    if not patterns:
+        return list(CASES)
+    return [name for name in CASES if any(fnmatch.fnmatch(name, p) or name.startswith(p) for p in patterns)]
+
+
+def run_suite(cases: list[str], scales: list[int], repeat: int = DEFAULT_REPEAT) -> list[Measurement]:
+    measurements = []
+    for name in cases:
+        for scale in scales:
+            measurement = measure(name, scale, repeat)
+            print(f"{measurement.key:40} {measurement.seconds * 1000:10.2f} ms {measurement.peak_bytes / 2**20:10.2f} MiB", file=sys.stderr)
+            measurements.append(measurement)
+    return measurements
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, Any]]:
+    """The results of a stored baseline by key, an empty dict if there is no baseline"""
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path: Path, measurements: list[Measurement]) -> None:
+    """
+    Stores measurements as baseline. Results of cases that were not run are kept.
+    """
+    results = load_baseline(path)
+    results.update({m.key: asdict(m) for m in measurements})
+    baseline = {
+        "meta": {
+            "python": python_platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": python_platform.machine(),
+        },
+        "results": dict(sorted(results.items())),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def find_regressions(measurements: list[Measurement], baseline: dict[str, dict[str, Any]], threshold: float) -> list[str]:
+    """
+    Compares measurements against a baseline.
+
+    Args:
+        measurements (list[Measurement]): The current results.
+        baseline (dict[str, dict[str, Any]]): The stored results by key, see load_baseline.
+        threshold (float): Allowed relative increase of the time and of the peak memory, 0.25 is 25%.
+            The fastest run is compared, it is the least affected by other processes on the machine.
+
+    Returns:
+        list[str]: A description of every regression, empty if there are none.
+            Cases that are not in the baseline are skipped.
+    """
+    regressions = []
+    for m in measurements:
+        base = baseline.get(m.key)
+        if base is None:
+            continue
+        if m.min_seconds > base["min_seconds"] * (1 + threshold) and m.min_seconds - base["min_seconds"] > NOISE_SECONDS:
+            regressions.append(f"{m.key}: {base['min_seconds'] * 1000:.2f} ms -> {m.min_seconds * 1000:.2f} ms")
+        if m.peak_bytes > base["peak_bytes"] * (1 + threshold) and m.peak_bytes - base["peak_bytes"] > NOISE_BYTES:
+            regressions.append(f"{m.key}: {base['peak_bytes'] / 2**20:.2f} MiB -> {m.peak_bytes / 2**20:.2f} MiB")
+    return regressions
+
+
+def report(measurements: list[Measurement], baseline: dict[str, dict[str, Any]]) -> pd.DataFrame:
+    """The measurements as a table, with the change relative to the baseline"""
+    df = pd.DataFrame([asdict(m) for m in measurements])
+    keys = [m.key for m in measurements]
+    df["ms"] = df["min_seconds"] * 1000
+    df["MiB"] = df["peak_bytes"] / 2**20
+    df["time_change"] = [m.min_seconds / baseline[k]["min_seconds"] - 1 if k in baseline else None for m, k in zip(measurements, keys)]
+    df["memory_change"] = [m.peak_bytes / baseline[k]["peak_bytes"] - 1 if k in baseline and baseline[k]["peak_bytes"] else None for m, k in zip(measurements, keys)]
+    return df[["case", "scale", "ms", "MiB", "time_change", "memory_change"]]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the extraction hot paths against a stored baseline")
+    parser.add_argument("--cases", nargs="*", help=f"Glob patterns or prefixes of case names: {', '.join(CASES)}")
+    parser.add_argument("--scales", nargs="*", type=int, default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save", action="store_true", help="Store the results as baseline instead of comparing")
+    args = parser.parse_args()
+
+    cases = select_cases(args.cases)
+    if not cases:
+        parser.error("No cases match")
+
+    measurements = run_suite(cases, args.scales, args.repeat)
+    baseline = load_baseline(args.baseline)
+    print(report(measurements, baseline).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    if args.save:
+        save_baseline(args.baseline, measurements)
+        print(f"Baseline stored in {args.baseline}")
+        return 0
+
+    regressions = find_regressions(measurements, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,607 @@
+"""
+Contains generators for synthetic DDPs (data download packages)
+
+Every supported platform gets a realistic export zip: the file names of the platform's DDP_CATEGORIES,
+the folder layout of the real exports and the nested structures the extractors read.
+The content is random but deterministic for a given seed, so runs can be compared.
+
+The size of a DDP is set with a scale factor, 1 is about the size of a typical export,
+10 and 100 are heavy users.
+
+Usage::
+
+    from benchmarks.synthetic_ddp import generate_ddp
+
+    path = generate_ddp("instagram", "/tmp/instagram_10x.zip", scale=10)
+
+Or from the command line (in packages/python)::
+
+    python -m benchmarks.synthetic_ddp instagram /tmp/instagram_10x.zip --scale 10
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import PurePosixPath
+from typing import Any, Callable
+import argparse
+import json
+import random
+import zipfile
+
+import port.platforms.chatgpt as chatgpt
+import port.platforms.instagram as instagram
+import port.platforms.linkedin as linkedin
+import port.platforms.netflix as netflix
+import port.platforms.tiktok as tiktok
+import port.platforms.x as x
+import port.platforms.youtube as youtube
+from port.helpers.validate import DDPCategory
+
+SCALES = [1, 10, 100]
+
+# Timestamps are spread over two years starting 2023-01-01
+START_EPOCH = 1672531200
+TIME_SPAN = 2 * 365 * 24 * 3600
+ZIP_DATE_TIME = (2025, 1, 1, 0, 0, 0)
+
+WORDS = (
+    "the data research people video music travel food recipe python garden football news weather "
+    "holiday dog cat coffee book movie series game science history climate energy market city "
+    "bike train school family friend weekend summer winter photo art design code health sleep "
+    "café naïve über crème brûlée déjà vu 😀 🎉 ❤️ 👍"
+).split()
+
+FIRST_NAMES = ["Anna", "Bram", "Chloé", "Daan", "Emma", "Finn", "Julia", "Lucas", "Noor", "Sem", "Zoë", "Mohammed"]
+LAST_NAMES = ["de Vries", "Jansen", "Bakker", "Visser", "Smit", "Meijer", "Yılmaz", "Müller", "Peeters", "El Amrani"]
+
+
+@dataclass
+class DDPWriter:
+    """
+    Writes the members of a synthetic DDP and keeps the random state.
+
+    Attributes:
+        zf (zipfile.ZipFile): The zip that is written.
+        rng (random.Random): Random number generator, seeded for reproducible DDPs.
+        scale (float): Scale factor for the number of items.
+        language (str): "en" or "nl", for platforms that export in the language of the account.
+    """
+    zf: zipfile.ZipFile
+    rng: random.Random
+    scale: float
+    language: str = "en"
+
+    def count(self, typical: int) -> int:
+        """Number of items for a file that has ``typical`` items in a typical export"""
+        return max(1, round(typical * self.scale))
+
+    def epoch(self) -> int:
+        return START_EPOCH + self.rng.randrange(TIME_SPAN)
+
+    def iso(self, epoch: int | None = None, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+        return datetime.fromtimestamp(self.epoch() if epoch is None else epoch, timezone.utc).strftime(fmt)
+
+    def text(self, min_words: int = 3, max_words: int = 12) -> str:
+        n = self.rng.randint(min_words, max_words)
+        return " ".join(self.rng.choice(WORDS) for _ in range(n))
+
+    def name(self) -> str:
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def username(self) -> str:
+        return f"{self.rng.choice(WORDS).encode('ascii', 'ignore').decode() or 'user'}_{self.rng.randrange(100000)}"
+
+    def digits(self, n: int) -> str:
+        return str(self.rng.randrange(10 ** (n - 1), 10 ** n))
+
+    def write(self, path: str, data: bytes) -> None:
+        # A fixed date keeps the zip identical for the same seed
+        info = zipfile.ZipInfo(path, date_time=ZIP_DATE_TIME)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self.zf.writestr(info, data)
+
+    def write_json(self, path: str, obj: Any, indent: int | None = None) -> None:
+        self.write(path, json.dumps(obj, indent=indent).encode("utf-8"))
+
+    def write_text(self, path: str, text: str) -> None:
+        self.write(path, text.encode("utf-8"))
+
+    def write_csv(self, path: str, header: list[str], rows: list[list[Any]], notes: str = "") -> None:
+        def cell(value: Any) -> str:
+            value = str(value)
+            if any(c in value for c in ',"\n'):
+                return '"' + value.replace('"', '""') + '"'
+            return value
+
+        lines = [",".join(cell(h) for h in header)]
+        lines.extend(",".join(cell(v) for v in row) for row in rows)
+        self.write_text(path, notes + "\n".join(lines) + "\n")
+
+    def write_placeholders(self, ddp_categories: list[DDPCategory], directory: str) -> None:
+        """
+        Writes small placeholders for the known files that were not written yet,
+        so the DDP contains every file name of the DDP categories.
+        """
+        written = {PurePosixPath(name).name for name in self.zf.namelist() if not name.endswith("/")}
+        for category in ddp_categories:
+            for file_name in category.known_files:
+                if file_name in written:
+                    continue
+                written.add(file_name)
+                path = f"{directory}/{file_name}"
+                suffix = PurePosixPath(file_name).suffix
+                if suffix == ".json":
+                    self.write_json(path, {})
+                elif suffix == ".js":
+                    self.write_text(path, f"window.YTD.{PurePosixPath(file_name).stem.replace('-', '_')}.part0 = []\n")
+                elif suffix == ".csv":
+                    self.write_text(path, "Value\n")
+                elif suffix == ".pdf":
+                    self.write(path, b"%PDF-1.4\n%%EOF\n")
+                elif suffix in (".txt", ".html"):
+                    self.write_text(path, "")
+                elif suffix == "":
+                    # Folders such as X's profile_media
+                    self.write(f"{path}/", b"")
+                else:
+                    self.write_text(path, "")
+
+
+def latin1_mojibake(text: str) -> str:
+    """Encodes text the way Instagram exports do: UTF-8 bytes decoded as latin-1"""
+    return text.encode("utf-8").decode("latin-1")
+
+
+def chatgpt_conversation(w: DDPWriter, index: int) -> dict[str, Any]:
+    """
+    A ChatGPT conversation: a tree of nodes with a hidden system message,
+    user and assistant turns, and now and then a regenerated (abandoned) answer or a non text message.
+    """
+    created = w.epoch()
+    mapping: dict[str, Any] = {}
+
+    def node(node_id: str, parent: str | None, message: dict[str, Any] | None) -> None:
+        mapping[node_id] = {"id": node_id, "message": message, "parent": parent, "children": []}
+        if parent is not None:
+            mapping[parent]["children"].append(node_id)
+
+    def message(node_id: str, role: str, parts: list[str], time: float, content_type: str = "text", **metadata) -> dict:
+        return {
+            "id": node_id,
+            "author": {"role": role, "name": None, "metadata": {}},
+            "create_time": time,
+            "update_time": None,
+            "content": {"content_type": content_type, "parts": parts},
+            "status": "finished_successfully",
+            "end_turn": role == "assistant",
+            "weight": 1.0,
+            "metadata": metadata,
+            "recipient": "all",
+        }
+
+    root = f"{index}-root"
+    node(root, None, None)
+    system = f"{index}-system"
+    node(system, root, message(system, "system", [""], created, is_visually_hidden_from_conversation=True))
+
+    parent = system
+    time = float(created)
+    model = w.rng.choice(["gpt-4o", "gpt-4", "gpt-3.5-turbo", "gpt-4o-mini"])
+    n_turns = w.rng.randint(1, 8)
+    for turn in range(n_turns):
+        time += w.rng.uniform(5, 600)
+        user = f"{index}-{turn}-user"
+        if w.rng.random() < 0.05:
+            node(user, parent, message(user, "user", [{"content_type": "image_asset_pointer"}, w.text()], time, "multimodal_text"))
+        else:
+            node(user, parent, message(user, "user", [w.text(3, 40)], time))
+
+        if w.rng.random() < 0.1:
+            # Regenerated answer, not on the current thread
+            abandoned = f"{index}-{turn}-abandoned"
+            node(abandoned, user, message(abandoned, "assistant", [w.text(20, 200)], time + 1, model_slug=model))
+
+        time += w.rng.uniform(1, 30)
+        assistant = f"{index}-{turn}-assistant"
+        node(assistant, user, message(assistant, "assistant", [w.text(20, 300)], time, model_slug=model))
+        parent = assistant
+
+    return {
+        "title": w.text(2, 6),
+        "create_time": float(created),
+        "update_time": time,
+        "mapping": mapping,
+        "moderation_results": [],
+        "current_node": parent,
+        "conversation_id": f"{index:08d}-synthetic-conversation",
+        "default_model_slug": model,
+    }
+
+
+def generate_chatgpt(w: DDPWriter) -> None:
+    conversations = [chatgpt_conversation(w, i) for i in range(w.count(150))]
+    w.write_json("conversations.json", conversations)
+    w.write_json("user.json", {"id": "user-synthetic", "email": "participant@example.org", "chatgpt_plus_user": False})
+    w.write_json("message_feedback.json", [])
+    w.write_json("model_comparisons.json", [])
+    w.write_text("chat.html", "<html><body></body></html>")
+    w.write_placeholders(chatgpt.DDP_CATEGORIES, ".")
+
+
+def generate_instagram(w: DDPWriter) -> None:
+    time_key = "Tijd" if w.language == "nl" else "Time"
+
+    def string_map_items(n: int, name_key: str) -> list[dict[str, Any]]:
+        return [
+            {"string_map_data": {name_key: {"value": w.username()}, time_key: {"timestamp": w.epoch()}}}
+            for _ in range(n)
+        ]
+
+    def string_list_item(title: str, value: str, href: str) -> dict[str, Any]:
+        return {
+            "title": title,
+            "media_list_data": [],
+            "string_list_data": [{"href": href, "value": value, "timestamp": w.epoch()}],
+        }
+
+    activity = "your_instagram_activity"
+    ads = "ads_information/ads_and_topics"
+    w.write_json(f"{ads}/posts_viewed.json", {"impressions_history_posts_seen": string_map_items(w.count(3000), "Author")}, 2)
+    w.write_json(f"{ads}/videos_watched.json", {"impressions_history_videos_watched": string_map_items(w.count(1500), "Author")}, 2)
+    w.write_json(f"{ads}/ads_viewed.json", {"impressions_history_ads_seen": string_map_items(w.count(2000), "Author")}, 2)
+    w.write_json(
+        f"{ads}/accounts_you're_not_interested_in.json",
+        {"impressions_history_recs_hidden_authors": string_map_items(w.count(50), "Username")},
+        2,
+    )
+    w.write_json(
+        f"{ads}/posts_you're_not_interested_in.json",
+        {"impressions_history_posts_not_interested": [
+            {"string_list_data": [{
+                "href": f"https://www.instagram.com/p/{w.digits(11)}/",
+                "value": latin1_mojibake(w.username()),
+                "timestamp": w.epoch(),
+            }]}
+            for _ in range(w.count(50))
+        ]},
+        2,
+    )
+
+    # Comments are split over post_comments_1.json ... post_comments_n.json
+    comments = [
+        {
+            "media_list_data": [{"uri": ""}],
+            "string_map_data": {
+                "Comment": {"value": latin1_mojibake(w.text(1, 20))},
+                "Media Owner": {"value": w.username()},
+                time_key: {"timestamp": w.epoch()},
+            },
+        }
+        for _ in range(w.count(300))
+    ]
+    for part, start in enumerate(range(0, len(comments), 1000), start=1):
+        w.write_json(f"{activity}/comments/post_comments_{part}.json", comments[start:start + 1000], 2)
+
+    w.write_json(
+        "connections/followers_and_following/following.json",
+        {"relationships_following": [
+            string_list_item("", name, f"https://www.instagram.com/{name}")
+            for name in (w.username() for _ in range(w.count(400)))
+        ]},
+        2,
+    )
+    w.write_json(
+        "connections/followers_and_following/followers_1.json",
+        [string_list_item("", name, f"https://www.instagram.com/{name}") for name in (w.username() for _ in range(w.count(350)))],
+        2,
+    )
+    w.write_json(
+        f"{activity}/likes/liked_comments.json",
+        {"likes_comment_likes": [
+            string_list_item(w.username(), latin1_mojibake("👍"), f"https://www.instagram.com/p/{w.digits(11)}/")
+            for _ in range(w.count(200))
+        ]},
+        2,
+    )
+    w.write_json(
+        f"{activity}/likes/liked_posts.json",
+        {"likes_media_likes": [
+            string_list_item(w.username(), latin1_mojibake("👍"), f"https://www.instagram.com/p/{w.digits(11)}/")
+            for _ in range(w.count(2000))
+        ]},
+        2,
+    )
+    w.write_placeholders(instagram.DDP_CATEGORIES, "personal_information/personal_information")
+
+
+def x_js(w: DDPWriter, path: str, name: str, items: list[dict[str, Any]]) -> None:
+    """X exports are JavaScript files that assign a JSON array"""
+    w.write_text(f"data/{path}", f"window.YTD.{name}.part0 = " + json.dumps(items, indent=2))
+
+
+def generate_x(w: DDPWriter) -> None:
+    user_id = w.digits(10)
+
+    def user_link(account_id: str) -> str:
+        return f"https://twitter.com/intent/user?user_id={account_id}"
+
+    def created_at() -> str:
+        return w.iso(fmt="%a %b %d %H:%M:%S +0000 %Y")
+
+    x_js(w, "ad-engagements.js", "ad_engagements", [
+        {"ad": {"adsUserData": {"adEngagements": {"engagements": [{
+            "impressionAttributes": {
+                "deviceInfo": {"osType": w.rng.choice(["Ios", "Android", "Desktop"])},
+                "displayLocation": w.rng.choice(["TimelineHome", "SearchTweets", "ProfileTweets"]),
+                "promotedTweetInfo": {"tweetId": w.digits(19), "tweetText": w.text(5, 30), "urls": [], "mediaUrls": []},
+                "advertiserInfo": {"advertiserName": w.name(), "screenName": "@" + w.username()},
+                "matchedTargetingCriteria": [{"targetingType": "Locations", "targetingValue": "Netherlands"}],
+                "impressionTime": w.iso(),
+            },
+            "engagementAttributes": [{"engagementTime": w.iso(), "engagementType": "ChargeableImpression"}],
+        }]}}}}
+        for _ in range(w.count(1000))
+    ])
+    x_js(w, "personalization.js", "personalization", [{"p13nData": {
+        "demographics": {"languages": [{"language": "English", "isDisabled": False}], "genderInfo": {"gender": "unknown"}},
+        "interests": {
+            "languages": [],
+            "interests": [{"name": w.text(1, 3), "isDisabled": w.rng.random() < 0.1} for _ in range(w.count(100))],
+            "partnerInterests": [],
+            "audienceAndAdvertisers": {"numAudiences": "0", "advertisers": [], "lookalikeAdvertisers": []},
+            "shows": [],
+        },
+        "locationHistory": [],
+        "inferredAgeInfo": {"age": ["13-54"], "birthDate": ""},
+    }}])
+    followers = [w.digits(10) for _ in range(w.count(300))]
+    x_js(w, "follower.js", "follower", [{"follower": {"accountId": a, "userLink": user_link(a)}} for a in followers])
+    following = [w.digits(10) for _ in range(w.count(400))]
+    x_js(w, "following.js", "following", [{"following": {"accountId": a, "userLink": user_link(a)}} for a in following])
+    likes = [w.digits(19) for _ in range(w.count(2000))]
+    x_js(w, "like.js", "like", [
+        {"like": {"tweetId": t, "fullText": w.text(3, 40), "expandedUrl": f"https://twitter.com/i/web/status/{t}"}}
+        for t in likes
+    ])
+
+    tweet_ids = [w.digits(19) for _ in range(w.count(500))]
+    tweets = []
+    headers = []
+    for tweet_id in tweet_ids:
+        date = created_at()
+        tweets.append({"tweet": {
+            "edit_info": {"initial": {"editTweetIds": [tweet_id], "editableUntil": "", "editsRemaining": "5", "isEditEligible": True}},
+            "retweeted": w.rng.random() < 0.2,
+            "source": '<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>',
+            "entities": {"hashtags": [], "symbols": [], "user_mentions": [], "urls": []},
+            "display_text_range": ["0", "140"],
+            "favorite_count": str(w.rng.randrange(100)),
+            "id_str": tweet_id,
+            "truncated": False,
+            "retweet_count": str(w.rng.randrange(20)),
+            "id": tweet_id,
+            "created_at": date,
+            "favorited": False,
+            "full_text": w.text(3, 40),
+            "lang": "en",
+        }})
+        headers.append({"tweet": {"tweet_id": tweet_id, "user_id": user_id, "created_at": date}})
+    x_js(w, "tweets.js", "tweets", tweets)
+    x_js(w, "tweet-headers.js", "tweet_headers", headers)
+
+    blocked = [w.digits(10) for _ in range(w.count(20))]
+    x_js(w, "block.js", "block", [{"blocking": {"accountId": a, "userLink": user_link(a)}} for a in blocked])
+    muted = [w.digits(10) for _ in range(w.count(20))]
+    x_js(w, "mute.js", "mute", [{"muting": {"accountId": a, "userLink": user_link(a)}} for a in muted])
+    x_js(w, "user-link-clicks.js", "user_link_clicks", [
+        {"userInteractionsData": {"linkClick": {
+            "tweetId": w.rng.choice(likes),
+            "finalUrl": f"https://example.org/{w.username()}",
+            "timeStampOfInteraction": w.iso(fmt="%Y-%m-%dT%H:%M:%S.000Z"),
+        }}}
+        for _ in range(w.count(200))
+    ])
+    w.write_text("data/README.txt", "Synthetic X archive\n")
+    w.write_placeholders(x.DDP_CATEGORIES, "data")
+
+
+def generate_tiktok(w: DDPWriter) -> None:
+    def video_link() -> str:
+        return f"https://www.tiktokv.com/share/video/{w.digits(19)}/"
+
+    def entries(n: int, entry: Callable[[], str]) -> str:
+        return "\n\n".join(entry() for _ in range(n)) + "\n"
+
+    root = "TikTok_Data_Synthetic"
+    w.write_text(f"{root}/Activity/Browsing History.txt",
+                 entries(w.count(5000), lambda: f"Date: {w.iso()}\nLink: {video_link()}"))
+    w.write_text(f"{root}/Activity/Favorite Videos.txt",
+                 entries(w.count(200), lambda: f"Date: {w.iso()}\nLink: {video_link()}"))
+    w.write_text(f"{root}/Activity/Favorite HashTags.txt",
+                 entries(w.count(30), lambda: f"Date: {w.iso()}\nHashTag Link:: https://www.tiktok.com/tag/{w.username()}"))
+    w.write_text(f"{root}/Activity/Hashtag.txt",
+                 entries(w.count(50), lambda: (lambda tag: f"Hashtag Name: {tag}\nHashtag Link: https://www.tiktok.com/tag/{tag}")(w.username())))
+    w.write_text(f"{root}/Activity/Like List.txt",
+                 entries(w.count(2000), lambda: f"Date: {w.iso()}\nLink: {video_link()}"))
+    w.write_text(f"{root}/Activity/Searches.txt",
+                 entries(w.count(500), lambda: f"Date: {w.iso()}\nSearch Term: {w.text(1, 4)}"))
+    w.write_text(f"{root}/Activity/Share History.txt",
+                 entries(w.count(100), lambda: (
+                     f"Date: {w.iso()}\nShared Content: {w.rng.choice(['video', 'live', 'profile'])}\n"
+                     f"Link: {video_link()}\nMethod: {w.rng.choice(['chat_merge', 'whatsapp', 'copy'])}"
+                 )))
+    w.write_text(f"{root}/Activity/Follower.txt",
+                 entries(w.count(300), lambda: f"Date: {w.iso()}\nUsername: {w.username()}"))
+    w.write_text(f"{root}/Activity/Following.txt",
+                 entries(w.count(300), lambda: f"Date: {w.iso()}\nUsername: {w.username()}"))
+    interests = "|".join(sorted({w.text(1, 2) for _ in range(w.count(15))}))
+    w.write_text(f"{root}/App Settings/Settings.txt", f"Interests: {interests}\nPrivate Account: Disabled\n")
+    w.write_placeholders(tiktok.DDP_CATEGORIES, f"{root}/Profile")
+
+
+def generate_youtube(w: DDPWriter) -> None:
+    root = "Takeout/YouTube and YouTube Music"
+
+    def time() -> str:
+        return w.iso(fmt="%Y-%m-%dT%H:%M:%S") + f".{w.rng.randrange(1000):03d}Z"
+
+    def watched(title: str) -> str:
+        return f"{title} bekeken" if w.language == "nl" else f"Watched {title}"
+
+    def searched(term: str) -> str:
+        return f"Gezocht naar {term}" if w.language == "nl" else f"Searched for {term}"
+
+    channels = [(f"UC{w.digits(20)}", w.name()) for _ in range(w.count(100))]
+    watch_history = []
+    for _ in range(w.count(5000)):
+        channel_id, channel = w.rng.choice(channels)
+        watch_history.append({
+            "header": "YouTube",
+            "title": watched(w.text(2, 10)),
+            "titleUrl": f"https://www.youtube.com/watch?v={w.username()}",
+            "subtitles": [{"name": channel, "url": f"https://www.youtube.com/channel/{channel_id}"}],
+            "time": time(),
+            "products": ["YouTube"],
+            "activityControls": ["YouTube watch history"],
+        })
+    search_history = [
+        {
+            "header": "YouTube",
+            "title": searched(term),
+            "titleUrl": f"https://www.youtube.com/results?search_query={term.replace(' ', '+')}",
+            "time": time(),
+            "products": ["YouTube"],
+            "activityControls": ["YouTube search history"],
+        }
+        for term in (w.text(1, 4) for _ in range(w.count(1000)))
+    ]
+
+    if w.language == "nl":
+        w.write_json(f"{root}/geschiedenis/kijkgeschiedenis.json", watch_history, 2)
+        w.write_json(f"{root}/geschiedenis/zoekgeschiedenis.json", search_history, 2)
+        w.write_csv(f"{root}/abonnementen/abonnementen.csv", ["Kanaal-ID", "Kanaal-URL", "Kanaaltitel"],
+                    [[c, f"http://www.youtube.com/channel/{c}", n] for c, n in channels])
+        w.write_placeholders(youtube.DDP_CATEGORIES[:1], root)
+    else:
+        w.write_json(f"{root}/history/watch-history.json", watch_history, 2)
+        w.write_json(f"{root}/history/search-history.json", search_history, 2)
+        w.write_csv(f"{root}/subscriptions/subscriptions.csv", ["Channel Id", "Channel Url", "Channel Title"],
+                    [[c, f"http://www.youtube.com/channel/{c}", n] for c, n in channels])
+        w.write_placeholders(youtube.DDP_CATEGORIES[1:], root)
+
+
+def generate_linkedin(w: DDPWriter) -> None:
+    def date(fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+        return w.iso(fmt=fmt)
+
+    def profile_url() -> str:
+        return f"https://www.linkedin.com/in/{w.username()}"
+
+    def post_url() -> str:
+        return f"https://www.linkedin.com/feed/update/urn%3Ali%3Aactivity%3A{w.digits(19)}"
+
+    notes = (
+        "Notes:\n"
+        "\"When exporting your connection data, you may notice that some of the email addresses are missing. "
+        "You will only see email addresses for connections who have allowed their connections to see or download their email address.\"\n"
+        "\n"
+    )
+    w.write_csv("Connections.csv", ["First Name", "Last Name", "URL", "Email Address", "Company", "Position", "Connected On"],
+                [[*w.name().split(" ", 1), profile_url(), "", w.text(1, 2), w.text(1, 3), date("%d %b %Y")]
+                 for _ in range(w.count(300))], notes=notes)
+    w.write_csv("Member_Follows.csv", ["Date", "FullName", "Status"],
+                [[date("%a %b %d %H:%M:%S UTC %Y"), w.name(), "Active"] for _ in range(w.count(50))],
+                notes="Notes:\n\"This file contains the members you follow.\"\n\n")
+    w.write_csv("Company Follows.csv", ["Organization", "Followed On"],
+                [[w.text(1, 3), date("%a %b %d %H:%M:%S UTC %Y")] for _ in range(w.count(40))])
+    w.write_csv("Reactions.csv", ["Date", "Type", "Link"],
+                [[date(), w.rng.choice(["LIKE", "PRAISE", "EMPATHY", "INTEREST"]), post_url()] for _ in range(w.count(200))])
+    w.write_csv("Ads Clicked.csv", ["Ad clicked Date", "Ad Title/Id"],
+                [[date("%Y-%m-%d"), w.digits(9)] for _ in range(w.count(30))])
+    w.write_csv("SearchQueries.csv", ["Time", "Search Query"],
+                [[date("%Y/%m/%d %H:%M:%S UTC"), w.text(1, 4)] for _ in range(w.count(150))])
+    w.write_csv("Shares.csv", ["Date", "ShareLink", "ShareCommentary", "SharedUrl", "MediaUrl", "Visibility"],
+                [[date(), post_url(), w.text(5, 60), "", "", "MEMBER_NETWORK"] for _ in range(w.count(40))])
+    w.write_csv("Comments.csv", ["Date", "Link", "Message"],
+                [[date(), post_url(), w.text(3, 40)] for _ in range(w.count(60))])
+    w.write_placeholders(linkedin.DDP_CATEGORIES, ".")
+
+
+def generate_netflix(w: DDPWriter) -> None:
+    profiles = [w.rng.choice(FIRST_NAMES) + str(i) for i in range(3)]
+    titles = [w.text(1, 4).title() for _ in range(max(50, w.count(100)))]
+
+    def duration() -> str:
+        seconds = w.rng.randrange(30, 3 * 3600)
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+    viewing = []
+    for _ in range(w.count(3000)):
+        supplemental = w.rng.choice([""] * 8 + ["TRAILER", "HOOK", "TEASER_TRAILER", "CINEMAGRAPH"])
+        viewing.append([
+            w.rng.choice(profiles), w.iso(), duration(), "", w.rng.choice(titles), supplemental,
+            w.rng.choice(["Netflix Windows App", "Apple iPhone 12", "Samsung 2020 TV"]),
+            duration(), "Not latest view", "NL (Netherlands)",
+        ])
+    w.write_csv("CONTENT_INTERACTION/ViewingActivity.csv", [
+        "Profile Name", "Start Time", "Duration", "Attributes", "Title", "Supplemental Video Type",
+        "Device Type", "Bookmark", "Latest Bookmark", "Country",
+    ], viewing)
+    w.write_csv("CONTENT_INTERACTION/Ratings.csv", [
+        "Profile Name", "Title Name", "Rating Type", "Star Value", "Thumbs Value", "Device Model", "Event Utc Ts", "Region View Date",
+    ], [
+        [w.rng.choice(profiles), w.rng.choice(titles), "thumb", "", w.rng.choice([0, 1, 2]), "Apple iPhone 12", w.iso(), ""]
+        for _ in range(w.count(100))
+    ])
+    w.write_csv("PROFILES/Profiles.csv", ["Profile Name", "Email Address", "Profile Creation Time", "Maturity Level"],
+                [[p, "", w.iso(), "Alle volwassenheidsniveaus"] for p in profiles])
+    w.write_placeholders(netflix.DDP_CATEGORIES, "OTHER")
+
+
+GENERATORS: dict[str, Callable[[DDPWriter], None]] = {
+    "chatgpt": generate_chatgpt,
+    "instagram": generate_instagram,
+    "x": generate_x,
+    "tiktok": generate_tiktok,
+    "youtube": generate_youtube,
+    "linkedin": generate_linkedin,
+    "netflix": generate_netflix,
+}
+
+
+def generate_ddp(platform: str, path: str, scale: float = 1, seed: int = 0, language: str = "en") -> str:
+    """
+    Writes a synthetic DDP zip for a platform.
+
+    Args:
+        platform (str): One of the keys of GENERATORS.
+        path (str): Where to write the zip.
+        scale (float): Size of the DDP relative to a typical export, see SCALES.
+        seed (int): Seed of the random content; the same seed gives the same DDP.
+        language (str): "en" or "nl", the language of the account (used by Instagram and YouTube).
+
+    Returns:
+        str: path
+
+    Raises:
+        KeyError: If the platform is not supported.
+    """
+    generator = GENERATORS[platform]
+    with zipfile.ZipFile(path, "w") as zf:
+        generator(DDPWriter(zf, random.Random(f"{platform}-{seed}"), scale, language))
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic DDP zip")
+    parser.add_argument("platform", choices=sorted(GENERATORS))
+    parser.add_argument("path")
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--language", choices=["en", "nl"], default="en")
+    args = parser.parse_args()
+    print(generate_ddp(args.platform, args.path, args.scale, args.seed, args.language))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,18 +11,48 @@ class CommandUIRender:
         return dict
 
 
+class CommandUITablePage:
+    __slots__ = "table_id", "page", "page_size", "search", "total_rows", "filtered_rows", "row_ids", "data_frame"
+
+    def __init__(self, table_id, page, page_size, search, total_rows, filtered_rows, row_ids, data_frame):
+        self.table_id = table_id
+        self.page = page
+        self.page_size = page_size
+        self.search = search
+        self.total_rows = total_rows
+        self.filtered_rows = filtered_rows
+        self.row_ids = row_ids
+        self.data_frame = data_frame
+
+    def toDict(self):
+        dict = {}
+        dict["__type__"] = "CommandUITablePage"
+        dict["table_id"] = self.table_id
+        dict["page"] = self.page
+        dict["page_size"] = self.page_size
+        dict["search"] = self.search
+        dict["total_rows"] = self.total_rows
+        dict["filtered_rows"] = self.filtered_rows
+        dict["row_ids"] = self.row_ids
+        dict["data_frame"] = self.data_frame
+        return dict
+
+
 class CommandSystemDonate:
-    __slots__ = "key", "json_string"
+    __slots__ = "key", "json_string", "encoding"
 
-    def __init__(self, key, json_string):
+    def __init__(self, key, json_string, encoding=None):
         self.key = key
         self.json_string = json_string
+        self.encoding = encoding
 
     def toDict(self):
         dict = {}
         dict["__type__"] = "CommandSystemDonate"
         dict["key"] = self.key
         dict["json_string"] = self.json_string
+        if self.encoding is not None:
+            dict["encoding"] = self.encoding
         return dict
 
 
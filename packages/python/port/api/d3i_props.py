@@ -1,9 +1,69 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from typing import Optional
-
-import pandas as pd
+import json
 
 import port.api.props as props
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+
+COMPACT_FORMAT = "columnar"
+DICTIONARY_MAX_RATIO = 0.5
+# Rows per page of paginated tables, the number of rows the consent form shows per page
+PAGE_SIZE = 7
+
+
+def compact_data_frame(df: pd.DataFrame, max_ratio: float = DICTIONARY_MAX_RATIO) -> str:
+    """
+    Serialize a DataFrame to the compact columnar wire format.
+
+    The default ``DataFrame.to_json()`` repeats the row index for every cell.
+    This format stores each column once as a list of values, without an index.
+    Low-cardinality columns (such as role, model or conversation title) are
+    dictionary encoded: the distinct values are stored once and every row
+    refers to them by position, null values get code -1.
+
+    The frontend table loader decodes this format back into a table.
+    Values are rendered with ``to_json``, so they look the same as in the default format.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to serialize.
+        max_ratio (float): A column is dictionary encoded when its number of distinct values
+            is at most ``max_ratio`` times the number of rows.
+
+    Returns:
+        str: The JSON string.
+
+    Examples::
+
+        >>> compact_data_frame(pd.DataFrame({"role": ["user", "assistant", "user", "user"], "n": [1, 2, 3, 4]}))
+        '{"__format__":"columnar","n_rows":4,"columns":["role","n"],"data":[{"dictionary":["user","assistant"],"codes":[0,1,0,0]},[1,2,3,4]]}'
+    """
+    n_rows = len(df)
+    encoded = []
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        codes, uniques = None, None
+        if pd.api.types.is_string_dtype(column.dtype) or isinstance(column.dtype, pd.CategoricalDtype):
+            try:
+                codes, uniques = pd.factorize(column)
+            except TypeError:
+                # Unhashable values, such as lists, are sent as is
+                pass
+        if codes is not None and len(uniques) <= n_rows * max_ratio:
+            dictionary = pd.Series(uniques, dtype=object).to_json(orient="values")
+            encoded.append('{"dictionary":' + dictionary + ',"codes":' + json.dumps(codes.tolist(), separators=(",", ":")) + '}')
+        else:
+            encoded.append(column.to_json(orient="values"))
+
+    columns = json.dumps([str(column) for column in df.columns], separators=(",", ":"))
+    return (
+        '{"__format__":"' + COMPACT_FORMAT + '","n_rows":' + str(n_rows)
+        + ',"columns":' + columns + ',"data":[' + ",".join(encoded) + ']}'
+    )
+
 
 @dataclass
 class PropsUIPromptConsentFormTableViz:
@@ -18,6 +78,12 @@ class PropsUIPromptConsentFormTableViz:
         visualizations (Optional[list]): Optional visualizations to be shown.
         folded (Optional[bool]): Whether the table should be initially folded.
         delete_option (Optional[bool]): Whether to show a delete option for the table.
+        compact (Optional[bool]): Whether to send the DataFrame in the compact columnar wire format,
+            see :func:`compact_data_frame`. Recommended for large tables.
+        page_size (Optional[int]): If set, the table is paginated by the script: only the first page
+            is sent to the participant, further pages are requested with ``PayloadTableQuery``,
+            see :class:`port.helpers.table_pagination.TablePager`. Visualizations of a paginated table
+            only see the rows of the current page, so paginate large tables without visualizations.
 
     Examples::
 
@@ -52,12 +118,23 @@ class PropsUIPromptConsentFormTableViz:
     visualizations: Optional[list] = None
     folded: Optional[bool] = False
     delete_option: Optional[bool] = True
-
-    def translate_data_frame(self):
-        if isinstance(self.data_frame, pd.DataFrame):
-            return self.data_frame.to_json()
+    compact: Optional[bool] = False
+    page_size: Optional[int] = None
+
+    def is_paginated(self) -> bool:
+        return bool(self.page_size) and isinstance(self.data_frame, pd.DataFrame)
+
+    def translate_data_frame(self, data_frame=None):
+        if data_frame is None:
+            data_frame = self.data_frame
+            if self.is_paginated():
+                data_frame = data_frame.iloc[:self.page_size]
+        if isinstance(data_frame, pd.DataFrame):
+            if self.compact:
+                return compact_data_frame(data_frame)
+            return data_frame.reset_index(drop=True).to_json() if self.is_paginated() else data_frame.to_json()
         else:
-            return self.data_frame
+            return data_frame
 
     def toDict(self):
         """
@@ -75,6 +152,9 @@ class PropsUIPromptConsentFormTableViz:
         dict["visualizations"] = self.visualizations if self.visualizations else None
         dict["folded"] = self.folded
         dict["delete_option"] = self.delete_option
+        if self.is_paginated():
+            dict["page_size"] = self.page_size
+            dict["total_rows"] = len(self.data_frame)
         return dict
 
 
@@ -1,7 +1,11 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from typing import Optional, TypedDict, Union, Any
 
-import pandas as pd
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
 
 
 class Translations(TypedDict):
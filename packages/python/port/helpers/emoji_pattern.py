@@ -2,10 +2,20 @@
 This module defines a re pattern to search for emoji sequences defined by Unicode
 If a new definition comes out replace the one underneath
 
+The pattern is compiled on first use (get_emoji_pattern or EMOJI_PATTERN),
+count_emojis and strip_emojis apply it to a column of messages.
+
 """
 
+from __future__ import annotations
+
+from typing import Any, Iterable, Pattern
+import functools
 import re
-from typing import Pattern
+
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
 
 # from https://unicode.org/Public/emoji/15.1/emoji-sequences.txt
 EMOJI_DEFINITIONS = r"""
@@ -1500,52 +1510,199 @@ EMOJI_DEFINITIONS = r"""
 #EOF
 """
 
-def create_pattern() -> Pattern[str]:
 
-    # clean EMOJI_DEFINITIONS
-    # remove the following blocks
-    blocks_to_remove = [
-        "Emoji_Keycap_Sequence",
-    ]
+# Blocks of EMOJI_DEFINITIONS that are not matched
+TYPES_TO_SKIP = {
+    "Emoji_Keycap_Sequence",
+}
 
-    important_emojis = EMOJI_DEFINITIONS
-    for block in blocks_to_remove:
-        pattern = rf"# {block}\n(.*\n)*?(?=\n#)"
+# Marks the end of a sequence in the trie
+_END = -1
 
-        # Substitute the block with an empty string
-        important_emojis = re.sub(pattern, '', important_emojis, flags=re.MULTILINE)
 
-    # This is needed because the order of the regex matters
-    # try to match with skin color first
-    sequences = [] 
-    ranges = []
-    singles = []
+@functools.lru_cache(maxsize=None)
+def parse_definitions() -> tuple[tuple[tuple[int, ...], ...], frozenset[int]]:
+    """
+    Parses EMOJI_DEFINITIONS into the sequences of more than one code point and the single code points.
+    Ranges (e.g. "231A..231B") are expanded into single code points.
 
-    for line in important_emojis.splitlines():
+    Returns:
+        tuple[tuple[tuple[int, ...], ...], frozenset[int]]: The sequences and the single code points.
+    """
+    sequences = []
+    singles = set()
+
+    for line in EMOJI_DEFINITIONS.splitlines():
 
         # ignore empty lines and commented lines
         stripped_line = line.strip()
-        if not stripped_line or line.strip().startswith('#'):
+        if not stripped_line or stripped_line.startswith("#"):
             continue
 
-        hexcodes = line.split(";")[0].strip()
+        fields = [field.strip() for field in line.split("#")[0].split(";")]
+        hexcodes, type_field = fields[0], fields[1]
+        if type_field in TYPES_TO_SKIP:
+            continue
 
         if ".." in hexcodes: # its a range
-            ranges.append(r"[" + r"-".join([fr"\U{hex.zfill(8)}" for hex in hexcodes.split("..")]) + "]")
-            
+            first, last = (int(hex, 16) for hex in hexcodes.split(".."))
+            singles.update(range(first, last + 1))
+
         elif " " in hexcodes: # its a sequence
-            sequences.append(r"".join([fr"\U{hex.zfill(8)}" for hex in hexcodes.split()]))
+            sequences.append(tuple(int(hex, 16) for hex in hexcodes.split()))
 
         else: # its a single hex code
-            singles.append(rf"\U{hexcodes.zfill(8)}")
-                
-    sequences = r"|".join(sequences)
-    ranges = r"|".join(ranges)
-    singles = r"|".join(singles)
-    to_match = sequences + r"|" + ranges + r"|" + singles
+            singles.add(int(hexcodes, 16))
+
+    return tuple(sequences), frozenset(singles)
+
+
+def _escape(code_point: int) -> str:
+    return rf"\U{code_point:08X}"
+
+
+def _character_class(code_points: Iterable[int]) -> str:
+    """
+    A character class of code points, consecutive code points are merged into ranges.
+    This function should not be used directly.
+    """
+    parts = []
+    code_points = sorted(code_points)
+    start = previous = code_points[0]
+    for code_point in code_points[1:] + [None]:
+        if code_point is not None and code_point == previous + 1:
+            previous = code_point
+            continue
+        if start == previous:
+            parts.append(_escape(start))
+        elif previous == start + 1:
+            parts.append(_escape(start) + _escape(previous))
+        else:
+            parts.append(f"{_escape(start)}-{_escape(previous)}")
+        if code_point is not None:
+            start = previous = code_point
+
+    if len(code_points) == 1:
+        return parts[0]
+    return "[" + "".join(parts) + "]"
+
+
+def _trie_regex(node: dict) -> str:
+    """
+    Converts a trie of code points into a regex without alternatives that share a prefix,
+    so the regex engine never retries a code point it already matched.
+    This function should not be used directly.
+    """
+    alternatives = []
+    leaves = []
+    for code_point, child in sorted((k, v) for k, v in node.items() if k != _END):
+        if list(child) == [_END]:
+            leaves.append(code_point)
+        else:
+            alternatives.append(_escape(code_point) + _trie_regex(child))
+    if leaves:
+        alternatives.append(_character_class(leaves))
+
+    regex = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if _END in node:
+        # Greedy: the longest sequence is tried first
+        regex = "(?:" + regex + ")?"
+    return regex
+
+
+def create_pattern() -> Pattern[str]:
+    """
+    Compiles a pattern that matches the emoji sequences and single emoji in EMOJI_DEFINITIONS.
 
-    pattern = re.compile(to_match, re.UNICODE)
-    return pattern
+    Sequences (e.g. an emoji with a skin tone) are put in a trie, so sequences with the same base emoji
+    share a branch, and all single emoji are merged into one character class.
+    A sequence is matched before the single emoji it starts with.
 
+    Compiling takes a while, use get_emoji_pattern to compile the pattern once, when it is first needed.
 
-EMOJI_PATTERN = create_pattern()
+    Returns:
+        Pattern[str]: The compiled pattern.
+    """
+    sequences, singles = parse_definitions()
+
+    trie: dict = {}
+    for sequence in sequences:
+        node = trie
+        for code_point in sequence:
+            node = node.setdefault(code_point, {})
+        node[_END] = {}
+
+    to_match = _trie_regex(trie) + "|" + _character_class(singles)
+    return re.compile(to_match, re.UNICODE)
+
+
+@functools.lru_cache(maxsize=None)
+def get_emoji_pattern() -> Pattern[str]:
+    """
+    The emoji pattern, compiled on the first call.
+
+    Examples::
+
+        >>> get_emoji_pattern().findall("Nice 👍🏽 and 🇳🇱")
+        ['👍🏽', '🇳🇱']
+    """
+    return create_pattern()
+
+
+def __getattr__(name: str) -> Any:
+    # EMOJI_PATTERN is compiled when it is first used instead of on import
+    if name == "EMOJI_PATTERN":
+        return get_emoji_pattern()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def count_emojis(series: pd.Series) -> pd.Series:
+    """
+    Counts the emoji in every value of a Series of messages.
+
+    Args:
+        series (pd.Series): Text values, values that are not strings count as zero emoji.
+
+    Returns:
+        pd.Series: The number of emoji per value, with the index of series.
+
+    Examples::
+
+        >>> count_emojis(pd.Series(["Nice 👍🏽", "no emoji", None]))
+        0    1
+        1    0
+        2    0
+        dtype: int64
+    """
+    pattern = get_emoji_pattern()
+    # ASCII text cannot contain emoji, checking that is much faster than searching
+    counts = [
+        0 if not isinstance(value, str) or value.isascii() else sum(1 for _ in pattern.finditer(value))
+        for value in series.to_numpy(dtype=object)
+    ]
+    return pd.Series(counts, index=series.index, dtype="int64")
+
+
+def strip_emojis(series: pd.Series) -> pd.Series:
+    """
+    Removes the emoji from every value of a Series of messages.
+
+    Args:
+        series (pd.Series): Text values, values that are not strings are kept as is.
+
+    Returns:
+        pd.Series: The values without emoji, with the index and dtype of series.
+
+    Examples::
+
+        >>> strip_emojis(pd.Series(["Nice 👍🏽", "no emoji"]))
+        0       Nice 
+        1    no emoji
+        dtype: object
+    """
+    pattern = get_emoji_pattern()
+    stripped = [
+        value if not isinstance(value, str) or value.isascii() else pattern.sub("", value)
+        for value in series.to_numpy(dtype=object)
+    ]
+    return pd.Series(stripped, index=series.index, dtype=series.dtype, name=series.name)
@@ -1,25 +1,98 @@
 """
 This module contains helper functions that can be used during the data extraction process
 """ 
+from __future__ import annotations
+
 import math
 import re
+import functools
 import logging 
 from datetime import datetime, timezone
-from typing import Any, Callable
+from typing import Any, Callable, IO, Iterator
 from pathlib import Path
 import zipfile
 import csv
+import codecs
 import io
 import json
 
-import pandas as pd
-import numpy as np
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+np = lazy_module("numpy")
 
 
 logger = logging.getLogger(__name__)
 
+# Number of bytes read from a stream at once
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _iter_children(inp: dict[Any, Any] | list[Any]) -> Iterator[tuple[Any, Any]]:
+    """
+    Iterates over the (key, value) pairs of a dictionary or the (index, item) pairs of a list.
+    This function should not be used directly.
+    """
+    return iter(inp.items()) if isinstance(inp, dict) else enumerate(inp)
+
+
+def iter_denested(
+    inp: Any,
+    name: str = "",
+    max_depth: int | None = None,
+    key_filter: Callable[[str], bool] | None = None,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Lazily denests a dictionary or list, yielding (key, value) pairs in the order dict_denester stores them.
+
+    The input is walked with an explicit stack instead of recursion, so deeply nested input
+    cannot hit the recursion limit.
+
+    Args:
+        inp (Any): The input dictionary or list to be denested.
+        name (str, optional): The key name to start from. Defaults to "".
+        max_depth (int | None, optional): The deepest level that is denested, where the top-level keys are level 0.
+            Dictionaries and lists at this level are yielded as values instead of being denested. Defaults to None, no limit.
+        key_filter (Callable[[str], bool] | None, optional): Called with the denested key of every value, including
+            dictionaries and lists. If it returns False, the value and everything nested in it is skipped. Defaults to None.
+
+    Yields:
+        tuple[str, Any]: The denested key and its value.
+
+    Examples::
 
-def dict_denester(inp: dict[Any, Any] | list[Any], new: dict[Any, Any] | None = None, name: str = "", run_first: bool = True) -> dict[Any, Any]:
+        >>> list(iter_denested({"a": {"b": {"c": 1}}, "d": [2, 3]}, max_depth=1))
+        [("a-b", {"c": 1}), ("d-0", 2), ("d-1", 3)]
+        >>> list(iter_denested({"a": {"b": 1}, "d": [2, 3]}, key_filter=lambda k: k.startswith("a")))
+        [("a-b", 1)]
+    """
+    if not isinstance(inp, (dict, list)):
+        yield name[1:], inp
+        return
+
+    stack = [(_iter_children(inp), name, 0)]
+    while stack:
+        children, prefix, depth = stack[-1]
+        for k, v in children:
+            path = f"{prefix}-{k}"
+            if key_filter is not None and not key_filter(path[1:]):
+                continue
+            if isinstance(v, (dict, list)) and (max_depth is None or depth < max_depth):
+                stack.append((_iter_children(v), path, depth + 1))
+                break
+            yield path[1:], v
+        else:
+            stack.pop()
+
+
+def dict_denester(
+    inp: dict[Any, Any] | list[Any],
+    new: dict[Any, Any] | None = None,
+    name: str = "",
+    run_first: bool = True,
+    max_depth: int | None = None,
+    key_filter: Callable[[str], bool] | None = None,
+) -> dict[Any, Any]:
     """
     Denests a dictionary or list, returning a new flattened dictionary.
 
@@ -28,6 +101,8 @@ def dict_denester(inp: dict[Any, Any] | list[Any], new: dict[Any, Any] | None =
         new (dict[Any, Any] | None, optional): The dictionary to store denested key-value pairs. Defaults to None.
         name (str, optional): The current key name in the denesting process. Defaults to "".
         run_first (bool, optional): Flag to indicate if this is the first run of the function. Defaults to True.
+        max_depth (int | None, optional): The deepest level that is denested, see iter_denested. Defaults to None.
+        key_filter (Callable[[str], bool] | None, optional): Skips keys and their subtrees, see iter_denested. Defaults to None.
 
     Returns:
         dict[Any, Any]: A new denested dictionary.
@@ -38,25 +113,43 @@ def dict_denester(inp: dict[Any, Any] | list[Any], new: dict[Any, Any] | None =
         >>> dict_denester(nested_dict)
         {"a-b-c": 1, "d-0": 2, "d-1": 3}
     """
-    if run_first:
+    if run_first or new is None:
         new = {}
 
-    if isinstance(inp, dict):
-        for k, v in inp.items():
-            if isinstance(v, (dict, list)):
-                dict_denester(v, new, f"{name}-{str(k)}", run_first=False)
-            else:
-                newname = f"{name}-{k}"
-                new.update({newname[1:]: v})  # type: ignore
+    for k, v in iter_denested(inp, name, max_depth, key_filter):
+        new[k] = v
 
-    elif isinstance(inp, list):
-        for i, item in enumerate(inp):
-            dict_denester(item, new, f"{name}-{i}", run_first=False)
+    return new
 
-    else:
-        new.update({name[1:]: inp})  # type: ignore
 
-    return new  # type: ignore
+@functools.lru_cache(maxsize=None)
+def _compile_key_pattern(key_to_match: str) -> re.Pattern:
+    """
+    Compiles the pattern used by find_item and find_items, compiled patterns are cached.
+    This function should not be used directly.
+    """
+    return re.compile(r"{}".format(f"^.*{key_to_match}.*$"))
+
+
+@functools.lru_cache(maxsize=None)
+def _is_literal_key(key_to_match: str) -> bool:
+    """
+    Returns True if key_to_match contains no regex syntax, in that case a match is a plain substring of the key.
+    This function should not be used directly.
+    """
+    return re.escape(key_to_match) == key_to_match
+
+
+def _key_matches(key_to_match: str, k: Any) -> bool:
+    """
+    Returns True if key k of a denested dictionary matches key_to_match.
+    This function should not be used directly.
+    """
+    if isinstance(k, str) and _is_literal_key(key_to_match):
+        # A substring test is equivalent to the pattern, unless the key spans multiple lines
+        return key_to_match in k and ("\n" not in k or _compile_key_pattern(key_to_match).match(k) is not None)
+
+    return _compile_key_pattern(key_to_match).match(k) is not None
 
 
 def find_item(d: dict[Any, Any], key_to_match: str) -> str:
@@ -81,12 +174,11 @@ def find_item(d: dict[Any, Any], key_to_match: str) -> str:
         "2"
     """
     out = ""
-    pattern = r"{}".format(f"^.*{key_to_match}.*$")
     depth = math.inf
 
     try:
         for k, v in d.items():
-            if re.match(pattern, k):
+            if _key_matches(key_to_match, k):
                 depth_current_match = k.count("-")
                 if depth_current_match < depth:
                     depth = depth_current_match
@@ -118,11 +210,10 @@ def find_items(d: dict[Any, Any], key_to_match: str) -> list:
         ["a", "b"]
     """
     out = []
-    pattern = r"{}".format(f"^.*{key_to_match}.*$")
 
     try:
         for k, v in d.items():
-            if re.match(pattern, k):
+            if _key_matches(key_to_match, k):
                 out.append(str(v))
     except Exception as e:
         logger.error("bork bork: %s", e)
@@ -157,8 +248,8 @@ def json_dumper(zfile: str) -> pd.DataFrame:
                 logger.debug("Contained in zip: %s", f)
                 fp = Path(f)
                 if fp.suffix == ".json":
-                    b = io.BytesIO(zf.read(f))
-                    d = dict_denester(unzipddp.read_json_from_bytes(b))
+                    with zf.open(f, "r") as b:
+                        d = dict_denester(read_json_from_bytes(b))
                     for k, v in d.items():
                         datapoints.append({
                             "file name": fp.name, 
@@ -254,10 +345,128 @@ def epoch_to_iso(epoch_timestamp: str | int | float) -> str:
     return out
 
 
+# Range of epoch timestamps datetime can represent: 0001-01-01T00:00:00 up to and including 9999-12-31T23:59:59
+_MIN_EPOCH = -62135596800
+_MAX_EPOCH = 253402300799
+
+
+def epochs_to_iso(epoch_timestamps: pd.Series | np.ndarray | list[Any]) -> pd.Series | np.ndarray:
+    """
+    Convert a column of epoch timestamps to ISO 8601 strings, assuming UTC.
+
+    This is the vectorized counterpart of epoch_to_iso: all values are converted at once with
+    NumPy datetime64 arithmetic, and every value gets the same result epoch_to_iso would give it.
+    Values that cannot be converted are returned as strings of the original input.
+    Pass the raw values, a list or an object column: a float column has already turned None into NaN,
+    which is returned as "nan" instead of the "None" epoch_to_iso gives.
+
+    Args:
+        epoch_timestamps (pd.Series | np.ndarray | list[Any]): The epoch timestamps to convert.
+
+    Returns:
+        pd.Series | np.ndarray: The ISO 8601 formatted strings. A Series (with the same index) if the input
+                                was a Series, an object array otherwise.
+
+    Raises:
+        Exception: Logs an error message with the number of values that could not be converted.
+
+    Examples::
+
+        >>> epochs_to_iso(pd.Series([1632139200, "1632139200.5", ""]))
+        0    2021-09-20T12:00:00+00:00
+        1    2021-09-20T12:00:00+00:00
+        2
+        dtype: object
+    """
+    original = np.asarray(epoch_timestamps, dtype=object).ravel()
+    numeric = pd.to_numeric(pd.Series(original), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+    with np.errstate(invalid="ignore"):
+        seconds = np.trunc(numeric)
+        valid = np.isfinite(seconds) & (seconds >= _MIN_EPOCH) & (seconds <= _MAX_EPOCH)
+
+    out = np.empty(len(original), dtype=object)
+    if valid.any():
+        as_datetime = seconds[valid].astype(np.int64).astype("datetime64[s]")
+        out[valid] = np.char.add(np.datetime_as_string(as_datetime, unit="s"), "+00:00")
+
+    # Values pandas could not parse, but float() might, such as " 1632139200 ", go through epoch_to_iso
+    n_failed = 0
+    for i in np.flatnonzero(~valid):
+        value = original[i]
+        if np.isnan(numeric[i]) and isinstance(value, str) and value.strip():
+            out[i] = epoch_to_iso(value)
+        else:
+            out[i] = str(value)
+            n_failed += 1
+
+    if n_failed > 0:
+        logger.error("Could not convert %s epoch time timestamps", n_failed)
+
+    if isinstance(epoch_timestamps, pd.Series):
+        return pd.Series(out, index=epoch_timestamps.index, name=epoch_timestamps.name, dtype=object)
+
+    return out
+
+
+# Layout of the timestamps epoch_to_iso creates: "YYYY-MM-DDTHH:MM:SS+00:00"
+_ISO_UTC_LENGTH = 25
+_ISO_UTC_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+_ISO_UTC_SEPARATORS = [4, 7, 10, 13, 16, 19, 20, 21, 22, 23, 24]
+_ISO_UTC_SEPARATOR_CODES = [ord(c) for c in "--T::+00:00"]
+
+
+def _parse_iso_utc_timestamps(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parses timestamps in the exact layout epoch_to_iso creates, using integer arithmetic on the character codes.
+    Returns the epoch seconds and a mask of the values that had that layout and are valid dates.
+    All values must be strings.
+    This function should not be used directly.
+    """
+    # One extra character, so longer strings can be recognized
+    width = _ISO_UTC_LENGTH + 1
+    try:
+        codes = values.astype(f"S{width}").view(np.uint8).reshape(len(values), width)
+    except UnicodeEncodeError:
+        codes = values.astype(f"U{width}").view(np.uint32).reshape(len(values), width)
+
+    # Characters below "0" wrap around to large unsigned values
+    digits = codes[:, _ISO_UTC_DIGITS] - codes.dtype.type(ord("0"))
+    mask = (codes[:, _ISO_UTC_LENGTH] == 0) & (digits <= 9).all(axis=1)
+    digits = digits.astype(np.int64)
+    mask &= (codes[:, _ISO_UTC_SEPARATORS] == _ISO_UTC_SEPARATOR_CODES).all(axis=1)
+
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    hour = digits[:, 8] * 10 + digits[:, 9]
+    minute = digits[:, 10] * 10 + digits[:, 11]
+    second = digits[:, 12] * 10 + digits[:, 13]
+
+    is_leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days_in_month = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[np.clip(month, 0, 12)] + (is_leap & (month == 2))
+    mask &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month)
+    mask &= (hour < 24) & (minute < 60) & (second < 60)
+
+    # Days since 1970-01-01 of the proleptic Gregorian calendar
+    shifted_year = year - (month <= 2)
+    era = shifted_year // 400
+    year_of_era = shifted_year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    days = era * 146097 + day_of_era - 719468
+
+    return days * 86400 + hour * 3600 + minute * 60 + second, mask
+
+
 def sort_isotimestamp_empty_timestamp_last(timestamp_series: pd.Series) -> pd.Series:
     """
     Creates a key for sorting a pandas Series of ISO timestamps, placing empty timestamps last.
 
+    Timestamps created by epoch_to_iso are parsed in bulk with NumPy, other timestamps are parsed one by one
+    with datetime.fromisoformat, so the same strings are valid as before. Timestamps without a UTC offset
+    are assumed to be UTC.
+
     Args:
         timestamp_series (pd.Series): A pandas Series containing ISO formatted timestamps.
 
@@ -268,19 +477,30 @@ def sort_isotimestamp_empty_timestamp_last(timestamp_series: pd.Series) -> pd.Se
 
         >>> df = df.sort_values(by="Date", key=sort_isotimestamp_empty_timestamp_last)
     """
-    def convert_timestamp(timestamp):
+    values = timestamp_series.to_numpy(dtype=object)
+    out = np.full(len(values), np.inf)
 
-        out = np.inf
-        try:
-            if isinstance(timestamp, str) and len(timestamp) > 0:
-                dt = datetime.fromisoformat(timestamp)
-                out = -dt.timestamp()
-        except Exception as e:
-            logger.debug("Cannot convert timestamp: %s", e)
+    # Non-string values, such as None, NaN or lists, keep an infinite key
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        strings = np.arange(len(values))
+    else:
+        strings = np.flatnonzero([isinstance(value, str) for value in values])
+    if len(strings) > 0:
+        seconds, is_iso_utc = _parse_iso_utc_timestamps(values[strings])
+        out[strings[is_iso_utc]] = -seconds[is_iso_utc].astype(float)
+        strings = strings[~is_iso_utc]
 
-        return out
+    for i in strings:
+        if len(values[i]) > 0:
+            try:
+                dt = datetime.fromisoformat(values[i])
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                out[i] = -dt.timestamp()
+            except (ValueError, OverflowError) as e:
+                logger.debug("Cannot convert timestamp: %s", e)
 
-    return timestamp_series.apply(convert_timestamp)
+    return pd.Series(out, index=timestamp_series.index, name=timestamp_series.name)
 
 
 def fix_latin1_string(input: str) -> str:
@@ -311,12 +531,90 @@ class FileNotFoundInZipError(Exception):
     """
 
 
-def extract_file_from_zip(zfile: str, file_to_extract: str) -> io.BytesIO:
+class ZipIndex:
     """
-    Extracts a specific file from a zipfile and returns it as a BytesIO buffer.
+    Opens a zip file once and indexes its members for fast lookups by name.
+
+    A lookup returns the first member (in archive order) whose path ends with the
+    requested name, the same rule extract_file_from_zip has always used.
+    The central directory is read only once, no matter how many files are extracted.
+    The lookup indexes are built on the first lookup, so listing the members
+    (as validation does) does not pay for them.
 
     Args:
         zfile (str): Path to the zip file.
+
+    Raises:
+        zipfile.BadZipFile: If zfile is not a valid zip file.
+
+    Examples::
+
+        >>> with ZipIndex("archive.zip") as zip_index:
+        ...     info = zip_index.find("data.txt")
+        ...     b = extract_file_from_zip(zip_index, "data.txt")
+    """
+
+    def __init__(self, zfile: str) -> None:
+        self.path = zfile
+        self.zf = zipfile.ZipFile(zfile, "r")
+        self.infolist = self.zf.infolist()
+
+        # basename -> members in archive order
+        self._basename_index: dict[str, list[zipfile.ZipInfo]] = {}
+        # every suffix of every basename -> first member in archive order
+        self._suffix_index: dict[str, zipfile.ZipInfo] = {}
+        self._indexed = False
+
+    def _build_index(self) -> None:
+        for info in self.infolist:
+            basename = info.filename.rsplit("/", 1)[-1]
+            self._basename_index.setdefault(basename, []).append(info)
+            for i in range(len(basename) + 1):
+                self._suffix_index.setdefault(basename[i:], info)
+        self._indexed = True
+
+    def find(self, file_to_find: str) -> zipfile.ZipInfo | None:
+        """
+        Returns the first member whose path ends with file_to_find, or None if there is none.
+        """
+        if not self._indexed:
+            self._build_index()
+
+        if "/" not in file_to_find:
+            return self._suffix_index.get(file_to_find, None)
+
+        basename = file_to_find.rsplit("/", 1)[-1]
+        for info in self._basename_index.get(basename, []):
+            if info.filename.endswith(file_to_find):
+                return info
+
+        return None
+
+    def namelist(self) -> list[str]:
+        return [info.filename for info in self.infolist]
+
+    def read(self, info: zipfile.ZipInfo) -> bytes:
+        return self.zf.read(info)
+
+    def open(self, info: zipfile.ZipInfo) -> IO[bytes]:
+        return self.zf.open(info, "r")
+
+    def close(self) -> None:
+        self.zf.close()
+
+    def __enter__(self) -> "ZipIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def extract_file_from_zip(zfile: str | ZipIndex, file_to_extract: str) -> io.BytesIO:
+    """
+    Extracts a specific file from a zipfile and returns it as a BytesIO buffer.
+
+    Args:
+        zfile (str | ZipIndex): Path to the zip file, or a ZipIndex of an already opened zip file.
         file_to_extract (str): Name or path of the file to extract from the zip.
 
     Returns:
@@ -337,15 +635,21 @@ def extract_file_from_zip(zfile: str, file_to_extract: str) -> io.BytesIO:
     file_to_extract_bytes = io.BytesIO()
 
     try:
-        with zipfile.ZipFile(zfile, "r") as zf:
-            file_found = False
-
-            for f in zf.namelist():
-                logger.debug("Contained in zip: %s", f)
-                if re.match(rf"^.*{re.escape(file_to_extract)}$", f):
-                    file_to_extract_bytes = io.BytesIO(zf.read(f))
-                    file_found = True
-                    break
+        file_found = False
+
+        if isinstance(zfile, ZipIndex):
+            info = zfile.find(file_to_extract)
+            if info is not None:
+                file_to_extract_bytes = io.BytesIO(zfile.read(info))
+                file_found = True
+        else:
+            with zipfile.ZipFile(zfile, "r") as zf:
+                for f in zf.namelist():
+                    logger.debug("Contained in zip: %s", f)
+                    if f.endswith(file_to_extract):
+                        file_to_extract_bytes = io.BytesIO(zf.read(f))
+                        file_found = True
+                        break
 
         if not file_found:
             raise FileNotFoundInZipError("File not found in zip")
@@ -361,25 +665,101 @@ def extract_file_from_zip(zfile: str, file_to_extract: str) -> io.BytesIO:
         return file_to_extract_bytes
 
 
-def _json_reader_bytes(json_bytes: bytes, encoding: str) -> Any:
+def open_file_from_zip(zfile: str | ZipIndex, file_to_open: str) -> IO[bytes]:
+    """
+    Opens a specific file in a zipfile and returns it as a stream.
+
+    Contrary to extract_file_from_zip, the file is not read into memory.
+    The returned stream decompresses the file lazily while it is being read.
+    Use the stream in a with block, so it is closed when it is read.
+
+    Args:
+        zfile (str | ZipIndex): Path to the zip file, or a ZipIndex of an already opened zip file.
+        file_to_open (str): Name or path of the file to open in the zip.
+
+    Returns:
+        IO[bytes]: A readable binary stream of the first file found.
+                   Returns an empty BytesIO if the file is not found or an error occurs.
+
+    Raises:
+        FileNotFoundInZipError: Logs an error if the specified file is not found in the zip.
+        zipfile.BadZipFile: Logs an error if the zip file is invalid.
+        Exception: Logs any other unexpected errors.
+
+    Examples::
+
+        >>> with open_file_from_zip("archive.zip", "data.json") as stream:
+        ...     data = read_json_from_bytes(stream)
     """
-    Reads JSON data from bytes using the specified encoding.
+
+    file_stream: IO[bytes] = io.BytesIO()
+
+    try:
+        file_found = False
+
+        if isinstance(zfile, ZipIndex):
+            info = zfile.find(file_to_open)
+            if info is not None:
+                file_stream = zfile.open(info)
+                file_found = True
+        else:
+            # The opened member keeps the archive open after the with block exits
+            with zipfile.ZipFile(zfile, "r") as zf:
+                for f in zf.namelist():
+                    logger.debug("Contained in zip: %s", f)
+                    if f.endswith(file_to_open):
+                        file_stream = zf.open(f, "r")
+                        file_found = True
+                        break
+
+        if not file_found:
+            raise FileNotFoundInZipError("File not found in zip")
+
+    except zipfile.BadZipFile as e:
+        logger.error("BadZipFile:  %s", e)
+    except FileNotFoundInZipError as e:
+        logger.error("File not found:  %s: %s", file_to_open, e)
+    except Exception as e:
+        logger.error("Exception was caught:  %s", e)
+
+    finally:
+        return file_stream
+
+
+def _json_reader_stream(json_stream: IO[bytes], encoding: str) -> Any:
+    """
+    Reads JSON data from a binary stream using the specified encoding.
+    The stream is decoded chunk by chunk, and a top-level array or object is parsed one element at a time,
+    so neither the raw bytes nor the decoded text of the whole document are held in memory,
+    only the text of the largest top-level element.
     This function should not be used directly.
 
     Args:
-        json_bytes (bytes): The JSON data in bytes.
-        encoding (str): The encoding to use for decoding the bytes.
+        json_stream (IO[bytes]): A binary stream containing JSON data.
+        encoding (str): The encoding to use for decoding the stream.
 
     Returns:
         Any: The parsed JSON data.
 
     Examples:
-        >>> data = _json_reader_bytes(b'{"key": "value"}', "utf-8")
+        >>> data = _json_reader_stream(io.BytesIO(b'{"key": "value"}'), "utf-8")
         >>> print(data)
         {'key': 'value'}
     """
-    json_str = json_bytes.decode(encoding)
-    result = json.loads(json_str)
+    if json_stream.seekable():
+        json_stream.seek(0)
+
+    reader = _JsonStreamBuffer(json_stream, encoding)
+    char = reader.peek()
+    if char == "[":
+        result = list(_iter_json_array_items(reader))
+    elif char == "{":
+        result = dict(_iter_json_object_items(reader))
+    else:
+        result = reader.decode_value()
+
+    if reader.peek() != "":
+        raise json.JSONDecodeError("Extra data", reader.buf, reader.pos)
     return result
 
 
@@ -412,7 +792,7 @@ def _read_json(json_input: Any, json_reader: Callable[[Any, str], Any]) -> dict[
     This function should not be used directly.
 
     Args:
-        json_input (Any): The JSON input (can be bytes or file path).
+        json_input (Any): The JSON input (can be a binary stream or file path).
         json_reader (Callable[[Any, str], Any]): A function to read the JSON input.
 
     Returns:
@@ -426,7 +806,7 @@ def _read_json(json_input: Any, json_reader: Callable[[Any, str], Any]) -> dict[
 
     Examples::
 
-        >>> data = _read_json(b'{"key": "value"}', _json_reader_bytes)
+        >>> data = _read_json(io.BytesIO(b'{"key": "value"}'), _json_reader_stream)
         >>> print(data)
         {'key': 'value'}
     """
@@ -457,12 +837,13 @@ def _read_json(json_input: Any, json_reader: Callable[[Any, str], Any]) -> dict[
     return out
 
 
-def read_json_from_bytes(json_bytes: io.BytesIO) -> dict[Any, Any] | list[Any]:
+def read_json_from_bytes(json_bytes: IO[bytes]) -> dict[Any, Any] | list[Any]:
     """
-    Reads JSON data from a BytesIO buffer.
+    Reads JSON data from a BytesIO buffer or any other binary stream,
+    such as the stream returned by open_file_from_zip.
 
     Args:
-        json_bytes (io.BytesIO): A BytesIO buffer containing JSON data.
+        json_bytes (IO[bytes]): A BytesIO buffer or binary stream containing JSON data.
 
     Returns:
         dict[Any, Any] | list[Any]: The parsed JSON data as a dictionary or list.
@@ -477,14 +858,205 @@ def read_json_from_bytes(json_bytes: io.BytesIO) -> dict[Any, Any] | list[Any]:
     """
     out: dict[Any, Any] | list[Any] = {}
     try:
-        b = json_bytes.read()
-        out = _read_json(b, _json_reader_bytes)
+        out = _read_json(json_bytes, _json_reader_stream)
     except Exception as e:
         logger.error("%s, could not convert json bytes", e)
 
     return out
 
 
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that can continue a number, a number followed by these might be cut off
+_JSON_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_JSON_DECODER = json.JSONDecoder()
+
+
+class _JsonStreamBuffer:
+    """
+    Holds a window of decoded text from a binary JSON stream.
+    Used by iter_json_array, this class should not be used directly.
+    """
+
+    def __init__(self, json_stream: IO[bytes], encoding: str) -> None:
+        self.stream = json_stream
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = STREAM_CHUNK_SIZE) -> bool:
+        """
+        Drops the consumed part of the buffer and appends the next chunk of the stream.
+        Returns False if the stream was already exhausted.
+        """
+        if self.eof:
+            return False
+
+        chunk = self.stream.read(size)
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        if chunk:
+            self.buf += self.decoder.decode(chunk)
+        else:
+            self.buf += self.decoder.decode(b"", final=True)
+            self.eof = True
+
+        return True
+
+    def peek(self) -> str:
+        """
+        Skips whitespace and returns the next character, or an empty string at the end of the stream.
+        """
+        while True:
+            self.pos = _JSON_WHITESPACE.match(self.buf, self.pos).end()  # pyright: ignore
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """
+        Decodes the next JSON value, reading more of the stream until the value is complete.
+        """
+        self.peek()
+        size = STREAM_CHUNK_SIZE
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill(size):
+                    size *= 2
+                    continue
+                raise
+
+            # A value that ends with the buffer might be cut off, for example "-1" of "-1.5"
+            if _JSON_NUMBER_TAIL.match(self.buf, end).end() == len(self.buf) and self.fill(size):  # pyright: ignore
+                size *= 2
+                continue
+
+            self.pos = end
+            return value
+
+
+def _iter_json_array_items(reader: _JsonStreamBuffer) -> Iterator[Any]:
+    """
+    Yields the elements of the JSON array at the position of the reader, one at a time.
+    The reader is left after the closing bracket.
+    This function should not be used directly.
+    """
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+
+    while True:
+        yield reader.decode_value()
+        char = reader.peek()
+        if char != "," and char != "]":
+            raise json.JSONDecodeError("Expecting ',' delimiter", reader.buf, reader.pos)
+        reader.pos += 1
+        if char == "]":
+            return
+
+
+def _iter_json_object_items(reader: _JsonStreamBuffer) -> Iterator[tuple[str, Any]]:
+    """
+    Yields the (key, value) pairs of the JSON object at the position of the reader, one at a time.
+    The reader is left after the closing brace.
+    This function should not be used directly.
+    """
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+
+    while True:
+        if reader.peek() != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", reader.buf, reader.pos)
+        key = reader.decode_value()
+        reader.expect(":")
+        yield key, reader.decode_value()
+        char = reader.peek()
+        if char != "," and char != "}":
+            raise json.JSONDecodeError("Expecting ',' delimiter", reader.buf, reader.pos)
+        reader.pos += 1
+        if char == "}":
+            return
+
+
+def _seek_json_key(reader: _JsonStreamBuffer, key: str) -> bool:
+    """
+    Moves the reader to the value of key in a top-level JSON object, skipping all values before it.
+    Returns False if the object does not contain key.
+    This function should not be used directly.
+    """
+    reader.expect("{")
+    if reader.peek() == "}":
+        return False
+
+    while True:
+        current_key = reader.decode_value()
+        reader.expect(":")
+        if current_key == key:
+            return True
+
+        reader.decode_value()
+        char = reader.peek()
+        if char == "}":
+            return False
+        if char != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", reader.buf, reader.pos)
+        reader.pos += 1
+
+
+def iter_json_array(json_stream: IO[bytes], key: str | None = None, encoding: str = "utf-8-sig") -> Iterator[Any]:
+    """
+    Incrementally parses a JSON array from a binary stream and yields its elements one at a time.
+
+    The array is either the top-level value, or the value of key in a top-level object.
+    Only the element that is currently being parsed is held in memory, so huge files such as
+    conversations.json can be processed with memory bounded by the largest single element.
+    Values before key in the top-level object are parsed and discarded.
+
+    Args:
+        json_stream (IO[bytes]): A binary stream, for example the stream returned by open_file_from_zip.
+        key (str | None, optional): Key in the top-level object that contains the array. Defaults to None,
+                                    meaning the top-level value is the array.
+        encoding (str, optional): Encoding of the stream. Defaults to "utf-8-sig", which also handles
+                                  files without a byte order mark.
+
+    Yields:
+        Any: The elements of the array. Nothing is yielded if key is not present.
+
+    Raises:
+        json.JSONDecodeError: Logs an error and stops if the stream is not valid JSON.
+        Exception: Logs any other unexpected errors and stops.
+
+    Examples::
+
+        >>> buffer = io.BytesIO(b'{"items": [{"a": 1}, {"a": 2}]}')
+        >>> list(iter_json_array(buffer, "items"))
+        [{'a': 1}, {'a': 2}]
+    """
+    try:
+        reader = _JsonStreamBuffer(json_stream, encoding)
+        if key is not None and not _seek_json_key(reader, key):
+            logger.debug("Key %s not found in json stream", key)
+            return
+
+        yield from _iter_json_array_items(reader)
+
+    except json.JSONDecodeError as e:
+        logger.error("Cannot decode json stream: %s", e)
+    except Exception as e:
+        logger.error("%s, could not iterate over json stream", e)
+
+
 def read_json_from_file(json_file: str) -> dict[Any, Any] | list[Any]:
     """
     Reads JSON data from a file.
@@ -506,12 +1078,13 @@ def read_json_from_file(json_file: str) -> dict[Any, Any] | list[Any]:
     return out
 
 
-def read_csv_from_bytes(json_bytes: io.BytesIO) -> list[dict[Any, Any]]:
+def read_csv_from_bytes(json_bytes: IO[bytes]) -> list[dict[Any, Any]]:
     """
-    Reads CSV data from a BytesIO buffer and returns it as a list of dictionaries.
+    Reads CSV data from a BytesIO buffer or binary stream and returns it as a list of dictionaries.
+    The rows are read from the stream one by one.
 
     Args:
-        json_bytes (io.BytesIO): A BytesIO buffer containing CSV data.
+        json_bytes (IO[bytes]): A BytesIO buffer or binary stream containing CSV data.
 
     Returns:
         list[dict[Any, Any]]: A list of dictionaries, where each dictionary represents a row in the CSV.
@@ -540,12 +1113,12 @@ def read_csv_from_bytes(json_bytes: io.BytesIO) -> list[dict[Any, Any]]:
         return out
 
 
-def read_csv_from_bytes_to_df(json_bytes: io.BytesIO) -> pd.DataFrame:
+def read_csv_from_bytes_to_df(json_bytes: IO[bytes]) -> pd.DataFrame:
     """
-    Reads CSV data from a BytesIO buffer and returns it as a pandas DataFrame.
+    Reads CSV data from a BytesIO buffer or binary stream and returns it as a pandas DataFrame.
 
     Args:
-        json_bytes (io.BytesIO): A BytesIO buffer containing CSV data.
+        json_bytes (IO[bytes]): A BytesIO buffer or binary stream containing CSV data.
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the CSV data.
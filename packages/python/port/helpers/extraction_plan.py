@@ -0,0 +1,153 @@
+"""
+Contains extraction plans, which parse every member of a DDP once for all tables that need it
+
+The tables of a platform declare the members they need and a transform, that gets the parsed members.
+When the plan runs, a member that several tables need is parsed once, and the parsed member
+is freed as soon as the last table that needs it is done.
+
+Usage::
+
+    VIEWING_ACTIVITY = Member("ViewingActivity.csv", eh.read_csv_from_bytes_to_df)
+
+    plan = ExtractionPlan()
+    plan.add("netflix_viewing_activity", [VIEWING_ACTIVITY], viewing_activity_to_df)
+
+    plan_run = plan.start(netflix_zip)
+    users = users_to_list(plan_run.member(VIEWING_ACTIVITY))   # the parsed member is kept for the tables
+    data_frames = plan_run.run(selected_user=users[0])
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Iterable
+import logging
+
+import port.helpers.extraction_helpers as eh
+import port.helpers.flow_metrics as flow_metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Member:
+    """
+    A member of a DDP and how to parse it.
+
+    Args:
+        file (str): The member, found the way extractors find files (the first member whose path ends with it).
+        parse (Callable[[IO[bytes]], Any]): Parses the opened member, for example eh.read_csv_from_bytes_to_df.
+            A missing member is parsed as an empty stream, see eh.open_file_from_zip.
+    """
+    file: str
+    parse: Callable[[IO[bytes]], Any]
+
+
+@dataclass
+class PlannedTable:
+    """
+    A table in an extraction plan.
+
+    Args:
+        id (str): The id of the table, the result of the transform is stored under it.
+        members (tuple[Member, ...]): The members the transform gets, in this order.
+        transform (Callable[..., Any]): Gets the parsed members and the keyword arguments of PlanRun.run.
+            The parsed members are shared with other tables, the transform should not modify them.
+    """
+    id: str
+    members: tuple[Member, ...]
+    transform: Callable[..., Any]
+
+
+class ExtractionPlan:
+    """
+    The tables of a platform with the members they need, see the module documentation.
+    Tables are extracted in the order they are added.
+    """
+    def __init__(self) -> None:
+        self.tables: list[PlannedTable] = []
+
+    def add(self, id: str, members: Iterable[Member], transform: Callable[..., Any]) -> PlannedTable:
+        """
+        Adds a table to the plan.
+
+        Args:
+            id (str): The id of the table.
+            members (Iterable[Member]): The members the transform gets.
+            transform (Callable[..., Any]): Gets the parsed members, see PlannedTable.
+
+        Returns:
+            PlannedTable: The added table.
+        """
+        table = PlannedTable(id, tuple(members), transform)
+        self.tables.append(table)
+        return table
+
+    def start(self, archive: str | eh.ZipIndex) -> "PlanRun":
+        """Starts running the plan on an archive"""
+        return PlanRun(self, archive)
+
+
+class PlanRun:
+    """
+    A run of an extraction plan on an archive.
+
+    Parsed members are kept until every table that needs them is extracted.
+    Members can also be used before the tables are extracted (with member), for example
+    to prompt the participant, without parsing them again for the tables.
+
+    Args:
+        plan (ExtractionPlan): The plan.
+        archive (str | eh.ZipIndex): Path to the zip file, or the opened archive.
+    """
+    def __init__(self, plan: ExtractionPlan, archive: str | eh.ZipIndex) -> None:
+        self.plan = plan
+        self.archive = archive
+        self._parsed: dict[Member, Any] = {}
+        self._remaining: Counter[Member] = Counter(
+            member for table in plan.tables for member in dict.fromkeys(table.members)
+        )
+
+    def member(self, member: Member) -> Any:
+        """
+        Returns a parsed member, the member is parsed the first time.
+        """
+        if member not in self._parsed:
+            with flow_metrics.active_stage(f"parse:{member.file}"):
+                with eh.open_file_from_zip(self.archive, member.file) as stream:
+                    self._parsed[member] = member.parse(stream)
+        return self._parsed[member]
+
+    def _release(self, member: Member) -> None:
+        """
+        Frees a parsed member when no remaining table needs it.
+        This function should not be used directly.
+        """
+        self._remaining[member] -= 1
+        if self._remaining[member] <= 0:
+            self._parsed.pop(member, None)
+            del self._remaining[member]
+
+    def run(self, **kwargs: Any) -> dict[str, Any]:
+        """
+        Extracts all tables of the plan.
+
+        Args:
+            **kwargs: Passed to every transform, for example the user the participant selected.
+
+        Returns:
+            dict[str, Any]: The result of every transform by table id.
+
+        Examples::
+
+            >>> data_frames = plan.start("netflix.zip").run(selected_user="Profile 1")
+            >>> data_frames["netflix_ratings"]
+        """
+        results = {}
+        for table in self.plan.tables:
+            parsed = [self.member(member) for member in table.members]
+            results[table.id] = table.transform(*parsed, **kwargs)
+            del parsed
+            for member in dict.fromkeys(table.members):
+                self._release(member)
+
+        return results
@@ -0,0 +1,179 @@
+"""
+Contains the collection of performance metrics of a donation flow
+
+The stages of a flow (validation, the table extractors, serialization of the consent page, the donation)
+are timed and their peak memory is traced with tracemalloc, which is also available in Pyodide.
+The metrics can be donated next to the data, so it becomes visible which exports hit slow paths.
+
+Usage::
+
+    metrics = FlowMetrics()
+    with metrics.stage("validation"):
+        validation = validate.validate_zip(DDP_CATEGORIES, file)
+
+    with metrics.active():
+        tables = extraction(file)   # functions decorated with @measured are recorded as stages
+
+    metrics.close()
+    yield ph.donate(f"{session_id}-metrics", metrics.to_json())
+"""
+
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Iterator, TypeVar
+import functools
+import json
+import time
+import tracemalloc
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# The metrics that functions decorated with measured report to, see FlowMetrics.active
+_active = None
+
+
+class SerializedCommand:
+    """
+    A command that was already serialized, ``toDict()`` returns the stored dict.
+    Used to measure the serialization of a page while serializing it only once.
+    """
+    __slots__ = "command_dict"
+
+    def __init__(self, command_dict: dict[str, Any]):
+        self.command_dict = command_dict
+
+    def toDict(self):
+        return self.command_dict
+
+
+class FlowMetrics:
+    """
+    Collects the wall time and peak traced memory of the stages of a flow.
+
+    Every stage becomes a record with the keys "stage", "seconds" and "peak_bytes".
+    peak_bytes is the highest amount of memory allocated during the stage on top of what was allocated
+    when it started, None if memory is not traced. Stages can be nested.
+
+    Args:
+        enabled (bool): When False, stages are not measured and no records are kept.
+        trace_memory (bool): Trace memory with tracemalloc. Tracing makes allocations slower,
+            so timings are somewhat higher when it is on.
+    """
+    def __init__(self, enabled: bool = True, trace_memory: bool = True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.records: list[dict[str, Any]] = []
+        self._peaks: list[int] = []
+        self._started_tracing = False
+
+    def _tracing(self) -> bool:
+        if not self.trace_memory:
+            return False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return True
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Measures the code in the with block as a stage.
+
+        Args:
+            name (str): Name of the stage in the records.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        tracing = self._tracing()
+        start_bytes = 0
+        if tracing:
+            start_bytes, peak = tracemalloc.get_traced_memory()
+            # The peak of the enclosing stage is kept on the stack, tracemalloc only has one peak
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak_bytes = None
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], self._peaks.pop())
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                peak_bytes = max(peak - start_bytes, 0)
+            self.records.append({"stage": name, "seconds": round(seconds, 6), "peak_bytes": peak_bytes})
+
+    def record(self, name: str, **values: Any) -> None:
+        """
+        Adds a record that is not a timed stage, for example the size of a donation.
+        """
+        if self.enabled:
+            self.records.append({"stage": name, **values})
+
+    def serialize(self, command: Any, name: str) -> Any:
+        """
+        Serializes a command (``toDict()``) as a stage, the serialized command is yielded instead.
+
+        Returns:
+            SerializedCommand | Any: The serialized command, or the command itself if metrics are disabled.
+        """
+        if not self.enabled:
+            return command
+        with self.stage(name):
+            command_dict = command.toDict()
+        return SerializedCommand(command_dict)
+
+    @contextmanager
+    def active(self) -> Iterator["FlowMetrics"]:
+        """
+        Makes functions decorated with measured report to these metrics within the with block.
+        """
+        global _active
+        previous, _active = _active, (self if self.enabled else None)
+        try:
+            yield self
+        finally:
+            _active = previous
+
+    def close(self) -> None:
+        """Stops tracemalloc if it was started for these metrics"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._peaks = []
+
+    def to_json(self) -> str:
+        return json.dumps(self.records)
+
+
+def active_stage(name: str) -> ContextManager[None]:
+    """
+    Measures the code in the with block as a stage of the active FlowMetrics, if there are any.
+    For code that is not a function of its own, functions can be decorated with measured.
+    """
+    if _active is None:
+        return nullcontext()
+    return _active.stage(name)
+
+
+def measured(func: F) -> F:
+    """
+    Decorator that records every call of a function as a stage of the active FlowMetrics.
+    The stage is named after the module and the function, e.g. "instagram.posts_viewed_to_df".
+    Without active metrics the function is called as is.
+    """
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active is None:
+            return func(*args, **kwargs)
+        with _active.stage(name):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,45 @@
+"""
+Contains lazy imports of heavy dependencies
+
+Importing pandas and numpy takes a large part of the start up time of the script in Pyodide.
+Modules that only need them during extraction import them with lazy_module: the module is loaded
+the first time one of its attributes is used, so the first page renders before pandas is loaded.
+
+Modules that use lazy_module put ``from __future__ import annotations`` at the top,
+otherwise type annotations such as ``-> pd.DataFrame`` would load the module when the function is defined.
+"""
+
+from types import ModuleType
+import importlib.util
+import sys
+
+
+def lazy_module(name: str) -> ModuleType:
+    """
+    Returns a module that is loaded on first attribute access.
+
+    Args:
+        name (str): Name of the module, e.g. "pandas".
+
+    Returns:
+        ModuleType: The module itself if it is already imported, otherwise a lazy module.
+            The lazy module is registered in sys.modules, so it is only loaded once.
+
+    Examples::
+
+        >>> pd = lazy_module("pandas")
+        >>> df = pd.DataFrame()  # pandas is loaded here
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
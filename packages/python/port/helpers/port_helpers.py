@@ -1,3 +1,9 @@
+from typing import Iterator
+import base64
+import hashlib
+import json
+import zlib
+
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 
@@ -140,7 +146,68 @@ def generate_review_data_prompt(
     )
 
 
-def donate(key: str, json_string: str) -> CommandSystemDonate:
+DONATION_ENCODING = "zlib+base64"
+DONATION_COMPRESSED_FORMAT = "donation-compressed"
+
+
+def compress_donation(json_string: str, level: int = 6) -> str:
+    """
+    Compresses a donation with zlib (deflate) and wraps it in a JSON envelope::
+
+        {"__format__": "donation-compressed", "encoding": "zlib+base64", "size": 1234, "data": "<base64>"}
+
+    Donated JSON compresses well; chat messages, urls and timestamps are typically 5 to 10 times smaller.
+    Use :func:`decode_donation` to get the original string back.
+
+    Args:
+        json_string (str): A JSON-formatted string containing the donated data.
+        level (int): zlib compression level, from 1 (fastest) to 9 (smallest).
+
+    Returns:
+        str: The JSON envelope.
+    """
+    data = json_string.encode("utf-8")
+    envelope = {
+        "__format__": DONATION_COMPRESSED_FORMAT,
+        "encoding": DONATION_ENCODING,
+        "size": len(data),
+        "data": base64.b64encode(zlib.compress(data, level)).decode("ascii"),
+    }
+    return json.dumps(envelope)
+
+
+def decode_donation(json_string: str) -> str:
+    """
+    Returns the original data of a donation made with ``compress=True``, for use on the receiving side.
+    Donations that are not compressed are returned unchanged.
+
+    Args:
+        json_string (str): The stored donation.
+
+    Returns:
+        str: The donated JSON string.
+
+    Raises:
+        ValueError: If the compressed data is corrupt.
+    """
+    if DONATION_COMPRESSED_FORMAT not in json_string[:64]:
+        return json_string
+
+    envelope = json.loads(json_string)
+    if not isinstance(envelope, dict) or envelope.get("__format__") != DONATION_COMPRESSED_FORMAT:
+        return json_string
+    if envelope.get("encoding") != DONATION_ENCODING:
+        raise ValueError(f"Unknown donation encoding: {envelope.get('encoding')}")
+    try:
+        data = zlib.decompress(base64.b64decode(envelope["data"]))
+    except (zlib.error, ValueError) as e:
+        raise ValueError(f"Corrupt compressed donation: {e}") from e
+    if len(data) != envelope["size"]:
+        raise ValueError("Size of the decompressed donation does not match")
+    return data.decode("utf-8")
+
+
+def donate(key: str, json_string: str, compress: bool = False) -> CommandSystemDonate:
     """
     Initiates a donation process using the provided key and data.
 
@@ -150,13 +217,166 @@ def donate(key: str, json_string: str) -> CommandSystemDonate:
     Args:
         key (str): The key associated with the donation process. The key will be used in the file name.
         json_string (str): A JSON-formatted string containing the donated data.
+        compress (bool): Whether to compress the data, see :func:`compress_donation`.
+            The command then carries ``encoding="zlib+base64"``.
 
     Returns:
         CommandSystemDonate: A system command that initiates the donation process. Must be yielded.
     """
+    if compress:
+        return CommandSystemDonate(key, compress_donation(json_string), encoding=DONATION_ENCODING)
     return CommandSystemDonate(key, json_string)
 
 
+DONATION_PART_SIZE = 5 * 1024 * 1024
+DONATION_PART_FORMAT = "donation-part"
+DONATION_MANIFEST_FORMAT = "donation-manifest"
+
+
+def donation_part_key(key: str, sequence: int, part_count: int) -> str:
+    return f"{key}-part-{sequence:05d}-of-{part_count:05d}"
+
+
+def donation_manifest_key(key: str) -> str:
+    return f"{key}-manifest"
+
+
+def _split_donation(key: str, json_string: str, max_part_size: int) -> list[str]:
+    """
+    Split json_string into slices whose part envelope is at most max_part_size bytes (UTF-8).
+    The sequence number and part count in the envelope are filled in afterwards,
+    room is reserved for them.
+
+    This function should not be used directly.
+    """
+    template = {"__format__": DONATION_PART_FORMAT, "key": key, "sequence": 99999, "part_count": 99999, "data": ""}
+    overhead = len(json.dumps(template, ensure_ascii=False).encode("utf-8"))
+    budget = max_part_size - overhead
+    if budget < 8:
+        raise ValueError(f"max_part_size {max_part_size} is too small, the part envelope alone is {overhead} bytes")
+
+    slices = []
+    position = 0
+    while position < len(json_string):
+        n_chars = budget
+        while True:
+            candidate = json_string[position:position + n_chars]
+            size = len(json.dumps(candidate, ensure_ascii=False).encode("utf-8")) - 2
+            if size <= budget or n_chars == 1:
+                break
+            # Escapes and multi-byte characters take more room, shrink the slice to fit
+            n_chars = max(1, min(n_chars - 1, n_chars * budget // size))
+        slices.append(candidate)
+        position += len(candidate)
+    return slices
+
+
+def donate_in_parts(
+    key: str,
+    json_string: str,
+    max_part_size: int = DONATION_PART_SIZE,
+    compress: bool = False,
+) -> Iterator[CommandSystemDonate]:
+    """
+    Donates data that can be larger than the storage backend accepts in one donation.
+
+    If the JSON string fits in ``max_part_size`` bytes, a single regular donation is made, exactly as :func:`donate`.
+    Otherwise the string is split in parts, each donated under its own key (see :func:`donation_part_key`)
+    as a JSON envelope with a sequence number::
+
+        {"__format__": "donation-part", "key": key, "sequence": 0, "part_count": 3, "data": "<slice of json_string>"}
+
+    After the parts a manifest is donated under ``donation_manifest_key(key)``, with the part count and the
+    SHA-256 hash of the complete string. The manifest comes last, so a stored manifest means all parts were sent.
+    Use :func:`reassemble_donation` to put the parts back together.
+
+    With ``compress=True`` the data is compressed before it is split.
+
+    Args:
+        key (str): The key associated with the donation process. The key will be used in the file names.
+        json_string (str): A JSON-formatted string containing the donated data.
+        max_part_size (int): The maximum size of a single donation in bytes (UTF-8).
+        compress (bool): Whether to compress the data, see :func:`compress_donation`.
+
+    Returns:
+        Iterator[CommandSystemDonate]: The donations. Must be yielded.
+
+    Examples::
+
+        yield from donate_in_parts(f"{session_id}", reviewed_data)
+    """
+    encoding = None
+    if compress:
+        json_string = compress_donation(json_string)
+        encoding = DONATION_ENCODING
+
+    data = json_string.encode("utf-8")
+    if len(data) <= max_part_size:
+        yield CommandSystemDonate(key, json_string, encoding=encoding)
+        return
+
+    slices = _split_donation(key, json_string, max_part_size)
+    part_keys = [donation_part_key(key, sequence, len(slices)) for sequence in range(len(slices))]
+    for sequence, (part_key, part) in enumerate(zip(part_keys, slices)):
+        envelope = {
+            "__format__": DONATION_PART_FORMAT,
+            "key": key,
+            "sequence": sequence,
+            "part_count": len(slices),
+            "data": part,
+        }
+        yield CommandSystemDonate(part_key, json.dumps(envelope, ensure_ascii=False), encoding=encoding)
+
+    manifest = {
+        "__format__": DONATION_MANIFEST_FORMAT,
+        "key": key,
+        "part_count": len(slices),
+        "part_keys": part_keys,
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "encoding": encoding,
+    }
+    yield CommandSystemDonate(donation_manifest_key(key), json.dumps(manifest))
+
+
+def reassemble_donation(manifest: str, parts: list[str]) -> str:
+    """
+    Puts a donation made with :func:`donate_in_parts` back together, for use on the receiving side.
+
+    Args:
+        manifest (str): The stored manifest donation.
+        parts (list[str]): The stored part donations, in any order.
+
+    Returns:
+        str: The original JSON string, decompressed if needed.
+
+    Raises:
+        ValueError: If parts are missing, belong to another donation, or the content hash does not match.
+    """
+    manifest_dict = json.loads(manifest)
+    if manifest_dict.get("__format__") != DONATION_MANIFEST_FORMAT:
+        raise ValueError("Not a donation manifest")
+
+    key = manifest_dict["key"]
+    part_count = manifest_dict["part_count"]
+    slices: dict[int, str] = {}
+    for part in parts:
+        envelope = json.loads(part)
+        if envelope.get("__format__") != DONATION_PART_FORMAT or envelope.get("key") != key:
+            raise ValueError(f"Part does not belong to donation {key}")
+        slices[envelope["sequence"]] = envelope["data"]
+
+    missing = [sequence for sequence in range(part_count) if sequence not in slices]
+    if missing:
+        raise ValueError(f"Donation {key} is missing parts: {missing}")
+
+    json_string = "".join(slices[sequence] for sequence in range(part_count))
+    data = json_string.encode("utf-8")
+    if len(data) != manifest_dict["size"] or hashlib.sha256(data).hexdigest() != manifest_dict["sha256"]:
+        raise ValueError(f"Content hash of donation {key} does not match the manifest")
+    return decode_donation(json_string)
+
+
 def exit(code: int, info: str) -> CommandSystemExit:
     """
     Exits Next with the provided exit code and additional information.
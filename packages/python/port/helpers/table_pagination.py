@@ -0,0 +1,192 @@
+"""
+Contains a pager to serve consent form tables page by page
+
+Tables with a ``page_size`` (see ``d3i_props.PropsUIPromptConsentFormTableViz``) are not sent to the participant in full.
+The consent form only receives the first page and the row count, and asks for other pages or search results with a
+``PayloadTableQuery``. The script answers these queries with a ``CommandUITablePage``, so render time no longer
+depends on the size of the table.
+
+Usage in a flow::
+
+    pager = TablePager(table_list)
+    result = yield ph.render_page(header, review_data_prompt)
+    while pager.is_query(result):
+        result = yield pager.query(result.value)
+    if result.__type__ == "PayloadJSON":
+        reviewed_data = pager.expand_donation(result.value)
+"""
+from __future__ import annotations
+
+from typing import Any
+import json
+import logging
+
+import port.api.d3i_props as d3i_props
+from port.api.commands import CommandUITablePage
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+np = lazy_module("numpy")
+
+logger = logging.getLogger(__name__)
+
+
+PAYLOAD_TABLE_QUERY = "PayloadTableQuery"
+
+
+def _cell_strings(column: pd.Series) -> pd.Series:
+    """
+    Render the cells of a column the way the consent form shows them.
+
+    The consent form displays ``String(value)`` of the JSON value of every cell,
+    so missing values become "null" and booleans "true" or "false".
+
+    This function should not be used directly.
+    """
+    if pd.api.types.is_bool_dtype(column.dtype):
+        return column.map({True: "true", False: "false"}).astype(object)
+
+    out = column.astype(str).astype(object)
+    missing = column.isna().to_numpy()
+    if missing.any():
+        out[missing] = "null"
+    if column.dtype == object:
+        is_bool = column.map(lambda x: isinstance(x, (bool, np.bool_))).to_numpy()
+        if is_bool.any():
+            out[is_bool] = column[is_bool].map(lambda x: "true" if x else "false")
+    return out
+
+
+class TablePager:
+    """
+    Keeps the DataFrames of paginated consent form tables and answers page and search queries.
+
+    Queries arrive as the value of a ``PayloadTableQuery``, a JSON string with the keys:
+    ``table_id``, ``page`` (zero based), ``search`` (optional) and ``deleted`` (optional list of row ids
+    the participant deleted, these rows are left out of the pages and counts).
+
+    Row ids are the positions of the rows in the original DataFrame, as strings.
+
+    Args:
+        tables (list[d3i_props.PropsUIPromptConsentFormTableViz]): The tables of the consent form.
+            Tables without a page_size are ignored.
+    """
+    def __init__(self, tables: list[d3i_props.PropsUIPromptConsentFormTableViz] | None):
+        self.tables = {table.id: table for table in tables or [] if table.is_paginated()}
+        self._search_text: dict[str, pd.Series] = {}
+
+    def is_paginated(self) -> bool:
+        return len(self.tables) > 0
+
+    @staticmethod
+    def is_query(payload: Any) -> bool:
+        return getattr(payload, "__type__", None) == PAYLOAD_TABLE_QUERY
+
+    def _row_text(self, table_id: str) -> pd.Series:
+        """
+        Lower cased text of every row, computed once per table and used for searching.
+        Cells are separated by a newline, so a search term does not match across cells.
+        """
+        if table_id not in self._search_text:
+            df = self.tables[table_id].data_frame
+            text = pd.Series("", index=range(len(df)), dtype=object)
+            for position in range(df.shape[1]):
+                cells = _cell_strings(df.iloc[:, position]).to_numpy()
+                text = text + "\n" + cells
+            self._search_text[table_id] = text.str.lower()
+        return self._search_text[table_id]
+
+    def _visible_positions(self, table_id: str, search: str, deleted: list) -> np.ndarray:
+        """
+        Positions of the rows that are not deleted and match the search term.
+        Searching is case insensitive and looks for the exact (stripped) search term in any of the cells.
+        """
+        n_rows = len(self.tables[table_id].data_frame)
+        mask = np.ones(n_rows, dtype=bool)
+        if deleted:
+            positions = pd.to_numeric(pd.Series(deleted, dtype=object), errors="coerce").dropna().astype(int)
+            positions = positions[(positions >= 0) & (positions < n_rows)]
+            mask[positions.to_numpy()] = False
+        if search:
+            mask &= self._row_text(table_id).str.contains(search.lower(), regex=False).to_numpy()
+        return np.flatnonzero(mask)
+
+    def query(self, value: str) -> CommandUITablePage:
+        """
+        Answer a page or search query.
+
+        Args:
+            value (str): The value of the ``PayloadTableQuery``.
+
+        Returns:
+            CommandUITablePage: The requested page of the table, must be yielded.
+            An empty page if the query cannot be parsed or refers to an unknown table.
+        """
+        table_id = ""
+        try:
+            query = json.loads(value)
+            table_id = query["table_id"]
+            table = self.tables[table_id]
+            page = max(int(query.get("page", 0)), 0)
+            search = str(query.get("search") or "").strip()
+            deleted = query.get("deleted") or []
+        except Exception as e:
+            logger.error("Invalid table query: %s", e)
+            return CommandUITablePage(table_id, 0, 0, "", 0, 0, [], "{}")
+
+        total_rows = len(self._visible_positions(table_id, "", deleted)) if deleted else len(table.data_frame)
+        positions = self._visible_positions(table_id, search, deleted)
+        n_pages = max(-(-len(positions) // table.page_size), 1)
+        page = min(page, n_pages - 1)
+        page_positions = positions[page * table.page_size:(page + 1) * table.page_size]
+        page_df = table.data_frame.iloc[page_positions].reset_index(drop=True)
+
+        return CommandUITablePage(
+            table_id=table_id,
+            page=page,
+            page_size=table.page_size,
+            search=search,
+            total_rows=total_rows,
+            filtered_rows=len(positions),
+            row_ids=[str(position) for position in page_positions],
+            data_frame=table.translate_data_frame(page_df),
+        )
+
+    def expand_donation(self, reviewed_data: str) -> str:
+        """
+        Fill in the rows of paginated tables in the data donated from the consent form.
+
+        For paginated tables the consent form only sends the ids of the deleted rows,
+        under the key "deleted rows". This function replaces those with the remaining rows,
+        so the donation has the same format as for tables that are not paginated.
+
+        Args:
+            reviewed_data (str): The value of the ``PayloadJSON`` returned by the consent form.
+
+        Returns:
+            str: The donated data as JSON string.
+        """
+        if not self.is_paginated():
+            return reviewed_data
+
+        try:
+            donated_tables = json.loads(reviewed_data)
+        except json.JSONDecodeError as e:
+            logger.error("Could not decode donated data: %s", e)
+            return reviewed_data
+
+        for donated_table in donated_tables:
+            if "deleted rows" not in donated_table:
+                continue
+            deleted = donated_table.pop("deleted rows")
+            for table_id in donated_table:
+                if table_id not in self.tables:
+                    continue
+                df = self.tables[table_id].data_frame
+                positions = self._visible_positions(table_id, "", deleted)
+                rows = df.iloc[positions]
+                cells = {str(column): _cell_strings(rows.iloc[:, i]).tolist() for i, column in enumerate(df.columns)}
+                donated_table[table_id] = [dict(zip(cells, values)) for values in zip(*cells.values())]
+                donated_table["deleted row count"] = str(len(df) - len(positions))
+
+        return json.dumps(donated_tables)
@@ -5,13 +5,21 @@ The idea of this module is to provide a uniform way to assign a validation statu
 Which can be used and acted upon
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
-from pathlib import Path
 from enum import Enum
+from typing import Callable, Iterable
+import csv
+import json
+import posixpath
+import re
 import zipfile
+import zlib
 
 import logging
 
+from port.helpers.extraction_helpers import ZipIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +43,176 @@ class DDPFiletype(Enum):
     UNKOWN = 5
 
 
+# Number of bytes read from the start of a member to check its content
+SNIFF_BYTES = 8 * 1024
+
+# Strings (with the colon if they are a key) and brackets in a JSON document
+_JSON_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"\s*(:?)|[{}\[\]]')
+
+
+# Errors of reading a member that cannot be decompressed: encrypted members (RuntimeError),
+# unsupported compression methods (NotImplementedError) and corrupt streams
+READ_ERRORS = (zipfile.BadZipFile, RuntimeError, NotImplementedError, zlib.error, EOFError, OSError)
+
+
+def read_sample(archive: ZipIndex, info: zipfile.ZipInfo, n_bytes: int = SNIFF_BYTES) -> str:
+    """
+    Decompresses and decodes only the first n_bytes of a member.
+    A character that is cut off at the end is dropped.
+
+    Raises:
+        RuntimeError, NotImplementedError, zlib.error, ...: If the member cannot be decompressed, see READ_ERRORS.
+    """
+    with archive.open(info) as f:
+        return f.read(n_bytes).decode("utf-8-sig", errors="ignore")
+
+
+def find_member(archive: ZipIndex, file: str) -> zipfile.ZipInfo | None:
+    """
+    Returns the first member whose base name is file, or None if there is none.
+    Contrary to ZipIndex.find the whole name must match, "tweets.js" does not match "deleted-tweets.js".
+    """
+    for info in archive.infolist:
+        if posixpath.basename(info.filename) == file:
+            return info
+    return None
+
+
+def sniff_json_keys(sample: str) -> set[str] | None:
+    """
+    Finds the keys of the records in the start of a JSON document: the keys of the top level object,
+    or of the objects in a top level array. A JavaScript assignment before the JSON
+    (``window.YTD.follower.part0 = [``) is skipped. The sample can be cut off anywhere.
+
+    Returns:
+        set[str] | None: The keys, None if the sample does not start like JSON.
+    """
+    starts = [i for i in (sample.find("{"), sample.find("[")) if i >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    if start > 0 and not sample[:start].strip().endswith("="):
+        return None
+
+    keys = set()
+    stack = []
+    for match in _JSON_TOKEN.finditer(sample, start):
+        token = match.group(0)
+        if token in ("{", "["):
+            stack.append(token)
+        elif token in ("}", "]"):
+            if stack:
+                stack.pop()
+            if not stack:
+                break
+        elif match.group(2) and stack in (["{"], ["[", "{"]):
+            try:
+                keys.add(json.loads(f'"{match.group(1)}"'))
+            except json.JSONDecodeError:
+                keys.add(match.group(1))
+    return keys
+
+
+# Words that only occur in exports in one language: translated key names, CSV headers,
+# activity titles and month abbreviations (see extraction_helpers.replace_months).
+# Only words that are known to be translated, exports keep many English keys in other languages.
+LANGUAGE_MARKERS = {
+    Language.EN: frozenset(["Time", "Watched", "Searched", "Channel", "Mar", "May", "Oct"]),
+    Language.NL: frozenset(["Tijd", "bekeken", "Gezocht", "Kanaaltitel", "mrt", "mei", "okt"]),
+}
+
+# Maximum number of members that are sampled to detect the language
+MAX_LANGUAGE_SAMPLES = 4
+
+# A language is only detected with at least this many marker words,
+# and at least LANGUAGE_MARGIN times as many as any other language
+MIN_LANGUAGE_MARKERS = 3
+LANGUAGE_MARGIN = 2
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def detect_language(samples: Iterable[str]) -> Language:
+    """
+    Detects the language of an export from samples of its content, by counting the words of LANGUAGE_MARKERS.
+
+    Args:
+        samples (Iterable[str]): Decoded samples of members, see read_sample.
+
+    Titles and names in an export can be in any language, so a language is only detected by a clear margin:
+    at least MIN_LANGUAGE_MARKERS marker words, and LANGUAGE_MARGIN times as many as any other language.
+
+    Returns:
+        Language: The detected language, Language.UNKNOWN if the samples do not tell by a clear margin.
+
+    Examples:
+        >>> detect_language(['{"string_map_data": {"Tijd": {"timestamp": 1700000000}}}'] * 3)
+        Language.NL
+    """
+    counts = Counter()
+    for sample in samples:
+        for word in _WORD.findall(sample):
+            for language, markers in LANGUAGE_MARKERS.items():
+                if word in markers:
+                    counts[language] += 1
+
+    ranked = counts.most_common(2)
+    if not ranked or ranked[0][1] < MIN_LANGUAGE_MARKERS:
+        return Language.UNKNOWN
+    if len(ranked) == 2 and ranked[0][1] < ranked[1][1] * LANGUAGE_MARGIN:
+        return Language.UNKNOWN
+    return ranked[0][0]
+
+
+@dataclass
+class ContentCheck:
+    """
+    What the start of a member of a DDP should look like, see ValidateInput.check_content.
+
+    Args:
+        file (str): The base name of the member to check, see find_member.
+        json_keys (list[str]): At least one of these keys must be a key of the records in the JSON document,
+            unless the sample has no records at all (an empty export).
+        csv_columns (list[str]): All these columns must be in the header of the CSV file.
+            Lines before the header (such as notes) are allowed.
+
+    Examples:
+        >>> ContentCheck("posts_viewed.json", json_keys=["impressions_history_posts_seen"])
+        >>> ContentCheck("ViewingActivity.csv", csv_columns=["Start Time", "Duration", "Title"])
+    """
+    file: str
+    json_keys: list[str] = field(default_factory=list)
+    csv_columns: list[str] = field(default_factory=list)
+
+    def matches(self, sample: str) -> bool:
+        """
+        Checks the start of the member.
+
+        Args:
+            sample (str): The first bytes of the member, decoded.
+
+        Returns:
+            bool: False if the member does not look like the DDP category expects.
+        """
+        if not sample.strip():
+            return True
+
+        if self.json_keys:
+            keys = sniff_json_keys(sample)
+            if keys is None or (keys and not keys.intersection(self.json_keys)):
+                return False
+
+        if self.csv_columns:
+            lines = sample.splitlines()[:-1] or sample.splitlines()
+            for row in csv.reader(lines):
+                if set(self.csv_columns) <= {column.strip() for column in row}:
+                    break
+            else:
+                return False
+
+        return True
+
+
 @dataclass
 class DDPCategory:
     """
@@ -45,6 +223,8 @@ class DDPCategory:
         ddp_filetype (DDPFiletype): The file type of the DDP.
         language (Language): The language of the DDP.
         known_files (List[str]): A list of known files associated with this DDP category.
+        content_checks (List[ContentCheck]): Checks of the content of key members, see ValidateInput.check_content.
+            Defaults to no checks.
 
     Examples:
         >>> category = DDPCategory("cat1", DDPFiletype.JSON, Language.EN, ["file1.json", "file2.json"])
@@ -57,6 +237,64 @@ class DDPCategory:
     ddp_filetype: DDPFiletype 
     language: Language 
     known_files: list[str] 
+    content_checks: list[ContentCheck] = field(default_factory=list)
+
+
+# Scores a DDP category, gets the category and the known files found in the input with how often they were found
+ScoreFunction = Callable[[DDPCategory, dict[str, int]], float]
+
+# Categories that score lower than this are not detected
+MIN_SCORE = 5
+
+
+def known_files_score(category: DDPCategory, found: dict[str, int]) -> float:
+    """
+    The default score: the number of input files that are known files of the category,
+    as a percentage of the number of known files. Categories without known files score 0.
+
+    Args:
+        category (DDPCategory): The category to score.
+        found (dict[str, int]): Known files of the category found in the input, with the number of times they were found.
+
+    Returns:
+        float: The score.
+    """
+    if not category.known_files:
+        return 0.0
+    return sum(found.values()) / len(category.known_files) * 100
+
+
+def weighted_files_score(weights: dict[str, float], required: Iterable[str] = ()) -> ScoreFunction:
+    """
+    Creates a score function that weighs the known files.
+
+    Every known file that is found adds its weight (1 if it has none) once, the score is
+    the percentage of the total weight of the known files of the category.
+    Categories of which a required file is missing score 0.
+
+    Args:
+        weights (dict[str, float]): Weight per file name.
+        required (Iterable[str]): File names that must be present in the input.
+
+    Returns:
+        ScoreFunction: The score function, to pass to validate_zip or ValidateInput.
+
+    Examples:
+        >>> score = weighted_files_score({"conversations.json": 10}, required=["conversations.json"])
+        >>> validate_zip(DDP_CATEGORIES, "path/to/valid.zip", score=score)
+    """
+    required = frozenset(required)
+
+    def score(category: DDPCategory, found: dict[str, int]) -> float:
+        known_files = set(category.known_files)
+        if not (required & known_files) <= found.keys():
+            return 0.0
+        total = sum(weights.get(f, 1) for f in known_files)
+        if total <= 0:
+            return 0.0
+        return sum(weights.get(f, 1) for f in found) / total * 100
+
+    return score
 
 
 @dataclass
@@ -100,10 +338,17 @@ class ValidateInput:
         all_ddp_categories (List[DDPCategory]): A list of valid DDP categories.
         current_status_code (Optional[StatusCode]): The current status code. Defaults to None.
         current_ddp_category (Optional[DDPCategory]): The current DDP category. Defaults to None.
+        score (ScoreFunction): Scores the categories during inference. Defaults to known_files_score.
+        archive (ZipIndex | None): The opened archive that was validated, extraction can continue with it
+            instead of opening the file again. Defaults to None.
+        file_names (list[str]): The member names of the validated archive. Defaults to an empty list.
+        detected_language (Language): The language detected from the content, see detect_language.
+            Defaults to Language.UNKNOWN.
 
     Attributes:
         ddp_categories_lookup (Dict[str, DDPCategory]): A lookup dictionary for DDP categories.
         status_codes_lookup (Dict[int, StatusCode]): A lookup dictionary for status codes.
+        known_files_index (Dict[str, tuple[str, ...]]): Inverted index from known file name to the ids of the categories that know it.
 
     Examples:
         >>> status_codes = [StatusCode(id=0, description="Success"), StatusCode(id=1, description="Error")]
@@ -115,16 +360,24 @@ class ValidateInput:
     all_ddp_categories: list[DDPCategory]
     current_status_code: StatusCode | None = None
     current_ddp_category: DDPCategory | None = None
+    score: ScoreFunction = known_files_score
+    archive: ZipIndex | None = None
+    file_names: list[str] = field(default_factory=list)
+    detected_language: Language = Language.UNKNOWN
 
     ddp_categories_lookup: dict[str, DDPCategory] = field(init=False)
     status_codes_lookup: dict[int, StatusCode] = field(init=False)
+    known_files_index: dict[str, tuple[str, ...]] = field(init=False)
 
     def infer_ddp_category(self, file_list_input: list[str]) -> bool:
         """
         Compares a list of files to a list of known files and infers the DDPCategory.
 
+        The input is looked up in known_files_index in a single pass, then every category is scored
+        with the score function. The category with the highest score is detected if it scores at least MIN_SCORE.
+
         Args:
-            file_list_input (List[str]): A list of input files to compare against known files.
+            file_list_input (List[str]): A list of input file names to compare against known files.
 
         Returns:
             bool: True if a valid DDP category is inferred, False otherwise. It sets the current_status_code
@@ -133,15 +386,19 @@ class ValidateInput:
         Examples:
             >>> validator.infer_ddp_category(["file1.txt", "file2.txt"])
         """
-        prop_category = {}
+        found: dict[str, Counter[str]] = {id: Counter() for id in self.ddp_categories_lookup}
+        for f in file_list_input:
+            for id in self.known_files_index.get(f, ()):
+                found[id][f] += 1
+
+        highest = None
+        highest_score = float("-inf")
         for id, category in self.ddp_categories_lookup.items():
-            n_files_found = [
-                1 if f in category.known_files else 0 for f in file_list_input
-            ]
-            prop_category[id] = sum(n_files_found) / len(category.known_files) * 100
+            category_score = self.score(category, found[id])
+            if category_score > highest_score:
+                highest, highest_score = id, category_score
 
-        if max(prop_category.values()) >= 5:
-            highest = max(prop_category, key=prop_category.get)  # type: ignore
+        if highest is not None and highest_score >= MIN_SCORE:
             self.current_ddp_category = self.ddp_categories_lookup[highest]
             self.set_current_status_code_by_id(0)
             logger.info("Detected DDP category: %s", self.current_ddp_category.id)
@@ -152,6 +409,93 @@ class ValidateInput:
             self.current_ddp_category = DDPCategory(id = "unknown", ddp_filetype=DDPFiletype.UNKOWN, language=Language.UNKNOWN, known_files=[])
             return False
 
+    def check_content(self) -> bool:
+        """
+        Checks the start of the key members of the detected category (its content_checks),
+        reading at most SNIFF_BYTES of each member from the archive.
+
+        Members that are not in the archive are not checked, participants can leave files out of an export.
+        If a member does not match or cannot be decompressed, the status code is set to 2 and False is returned.
+        Without an archive or content checks there is nothing to check and True is returned.
+
+        Returns:
+            bool: True if the content matches the detected category.
+
+        Examples:
+            >>> validator.check_content()
+        """
+        category = self.current_ddp_category
+        if self.archive is None or category is None or not category.content_checks:
+            return True
+
+        for check in category.content_checks:
+            info = find_member(self.archive, check.file)
+            if info is None:
+                continue
+            try:
+                sample = read_sample(self.archive, info)
+            except READ_ERRORS as e:
+                logger.info("Not a valid input; cannot read %s: %s", info.filename, e)
+                self.set_current_status_code_by_id(2)
+                return False
+            if not check.matches(sample):
+                logger.info("Not a valid input; content of %s does not match %s", info.filename, category.id)
+                self.set_current_status_code_by_id(2)
+                return False
+
+        return True
+
+    def detect_language(self) -> Language:
+        """
+        Detects the language of the archive from the first SNIFF_BYTES of at most MAX_LANGUAGE_SAMPLES members:
+        the members of the content checks of the detected category first, then its other known files.
+        Members that cannot be decompressed are skipped. The result is stored in detected_language.
+
+        Returns:
+            Language: The detected language, Language.UNKNOWN if there is no archive or the samples do not tell.
+
+        Examples:
+            >>> validator.detect_language()
+            Language.EN
+        """
+        category = self.current_ddp_category
+        if self.archive is None or category is None:
+            return self.detected_language
+
+        known_files = set(category.known_files)
+        members = [find_member(self.archive, check.file) for check in category.content_checks]
+        members += [info for info in self.archive.infolist if posixpath.basename(info.filename) in known_files]
+
+        samples = []
+        for info in dict.fromkeys(info for info in members if info is not None and not info.is_dir()):
+            if len(samples) == MAX_LANGUAGE_SAMPLES:
+                break
+            try:
+                samples.append(read_sample(self.archive, info))
+            except READ_ERRORS as e:
+                logger.info("Cannot read %s to detect the language: %s", info.filename, e)
+        self.detected_language = detect_language(samples)
+        logger.info("Detected language: %s", self.detected_language.name)
+        return self.detected_language
+
+    @property
+    def language(self) -> Language:
+        """
+        The language of the input: the language of the DDP category, which was matched on file names.
+        The detected language is only used when the category does not tell, detection never overrides the files.
+        """
+        if self.current_ddp_category is not None and self.current_ddp_category.language != Language.UNKNOWN:
+            return self.current_ddp_category.language
+        return self.detected_language
+
+    def close_archive(self) -> None:
+        """
+        Closes the validated archive, if there is one. Extraction then opens the file again.
+        """
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+
     def set_current_status_code_by_id(self, id: int) -> None:
         """
         Set the status code based on the provided ID.
@@ -192,8 +536,20 @@ class ValidateInput:
             status_code.id: status_code for status_code in self.all_status_codes
         }
 
+        index: dict[str, list[str]] = {}
+        for category in self.all_ddp_categories:
+            for known_file in dict.fromkeys(category.known_files):
+                index.setdefault(known_file, []).append(category.id)
+        self.known_files_index = {known_file: tuple(ids) for known_file, ids in index.items()}
 
-def validate_zip(ddp_categories: list[DDPCategory], path_to_zip: str) -> ValidateInput:
+
+def validate_zip(
+    ddp_categories: list[DDPCategory],
+    path_to_zip: str,
+    score: ScoreFunction = known_files_score,
+    check_content: bool = False,
+    detect_language: bool = False,
+) -> ValidateInput:
     """
     Validates a DDP zip file against a list of DDP categories.
 
@@ -201,15 +557,23 @@ def validate_zip(ddp_categories: list[DDPCategory], path_to_zip: str) -> Validat
     the ValidateInput class to infer the DDP category based on the files in the zip.
     If the zip file is invalid or cannot be read, it sets an error status code (an integer greather than 0).
 
+    The zip is opened as ZipIndex and kept open in the archive attribute of the result when a category is detected,
+    so extraction can reuse the central directory that was read. Close it (or use it as context manager) when done.
+
     Args:
         ddp_categories (List[DDPCategory]): A list of valid DDP categories to compare against.
         path_to_zip (str): The file path to the zip file to be validated.
+        score (ScoreFunction): Scores the categories, see ValidateInput. Defaults to known_files_score.
+        check_content (bool): Also check the start of the key members of the detected category,
+            see ValidateInput.check_content. Rejects renamed or broken exports before extraction. Defaults to False.
+        detect_language (bool): Also detect the language from the content of the detected category,
+            see ValidateInput.detect_language. Defaults to False.
 
     Returns:
         ValidateInput: An instance of ValidateInput containing the validation results.
 
     Raises:
-        zipfile.BadZipFile: This exception is caught internally and results in an error status code.
+        zipfile.BadZipFile, RuntimeError, zlib.error, ...: These exceptions (READ_ERRORS) are caught internally and result in an error status code.
 
     Examples:
         >>> categories = [DDPCategory(id="cat1", ddp_filetype=DDPFiletype.JSON, language=Language.EN, known_files=["file1.txt", "file2.txt"])]
@@ -225,19 +589,29 @@ def validate_zip(ddp_categories: list[DDPCategory], path_to_zip: str) -> Validat
     status_codes = [
         StatusCode(id=0, description="Detected a zip from the DDPCategory list"),
         StatusCode(id=1, description="Undetected zip or bad zipfile"),
+        StatusCode(id=2, description="Detected a zip from the DDPCategory list, but its content does not match"),
     ]
-    validate = ValidateInput(status_codes, ddp_categories)
+    validate = ValidateInput(status_codes, ddp_categories, score=score)
 
     try:
+        validate.archive = ZipIndex(path_to_zip)
+        validate.file_names = validate.archive.namelist()
         paths = []
-        with zipfile.ZipFile(path_to_zip, "r") as zf:
-            for f in zf.namelist():
-                p = Path(f)
-                logger.debug("Found: %s in zip", p.name)
-                paths.append(p.name)
-
-        validate.infer_ddp_category(paths)
-    except zipfile.BadZipFile:
+        for f in validate.file_names:
+            name = posixpath.basename(f.rstrip("/"))
+            logger.debug("Found: %s in zip", name)
+            paths.append(name)
+
+        if validate.infer_ddp_category(paths):
+            if check_content:
+                validate.check_content()
+            if detect_language and validate.get_status_code_id() == 0:
+                validate.detect_language()
+    except READ_ERRORS as e:
+        logger.info("Not a valid input; cannot read the zip: %s", e)
         validate.set_current_status_code_by_id(1)
 
+    if validate.get_status_code_id() != 0:
+        validate.close_archive()
+
     return validate
@@ -1,7 +1,22 @@
 from collections.abc import Generator
-from port.platforms.chatgpt import process
+from types import ModuleType
+import importlib
+
 from port.api.commands import CommandSystemExit
 
+# Platform names mapped to the module with their flow (a process function).
+# Modules are imported when their flow starts, so start up only loads the platform that is used.
+PLATFORMS = {
+    "chatgpt": "port.platforms.chatgpt",
+    "instagram": "port.platforms.instagram",
+    "linkedin": "port.platforms.linkedin",
+    "netflix": "port.platforms.netflix",
+    "tiktok": "port.platforms.tiktok",
+    "x": "port.platforms.x",
+    "youtube": "port.platforms.youtube",
+}
+DEFAULT_PLATFORM = "chatgpt"
+
 
 class ScriptWrapper(Generator):
     def __init__(self, script):
@@ -19,6 +34,26 @@ class ScriptWrapper(Generator):
         raise StopIteration
 
 
-def start(sessionId):
-    script = process(sessionId)
+def load_platform(platform: str) -> ModuleType:
+    """
+    Imports the module of a platform in PLATFORMS.
+
+    Raises:
+        KeyError: If the platform is not registered.
+    """
+    return importlib.import_module(PLATFORMS[platform])
+
+
+def start(sessionId, platform=DEFAULT_PLATFORM, collect_metrics=False):
+    """
+    Starts the flow of a platform.
+
+    Args:
+        sessionId: The id of the session, the donations are stored under it.
+        platform (str): The platform in PLATFORMS. Defaults to DEFAULT_PLATFORM.
+        collect_metrics (bool): Time the stages of the flow and donate the metrics
+            under "<sessionId>-metrics", see flow_metrics.FlowMetrics. Defaults to False.
+            Enable it from the worker, for example ``port.start(sessionId, collect_metrics=True)``.
+    """
+    script = load_platform(platform).process(sessionId, collect_metrics=collect_metrics)
     return ScriptWrapper(script)
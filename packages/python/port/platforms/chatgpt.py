@@ -6,23 +6,28 @@ This module provides an example flow of a ChatGPT data donation study
 Assumptions:
 It handles DDPs in the english language with filetype JSON.
 """
-import logging
-from typing import Tuple
+from __future__ import annotations
 
-import pandas as pd
-import numpy as np
+import logging
+from typing import Any, Iterator, Tuple
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.flow_metrics as flow_metrics
 import port.helpers.validate as validate
 from port.platforms.flow_builder import FlowBuilder
 
 from port.helpers.validate import (
+    ContentCheck,
     DDPCategory,
     DDPFiletype,
     Language,
 )
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+np = lazy_module("numpy")
 
 logger = logging.getLogger(__name__)
 
@@ -37,63 +42,109 @@ DDP_CATEGORIES = [
             "message_feedback.json",
             "model_comparisons.json",
             "user.json"
-        ]
+        ],
+        content_checks=[
+            ContentCheck("conversations.json", json_keys=["title", "create_time", "mapping"]),
+        ],
     )
 ]
 
-def extract_conversations(chatgpt_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(chatgpt_zip, "conversations.json")
-    conversations = eh.read_json_from_bytes(b)
-
-    datapoints = []
-    out = pd.DataFrame()
-
-    try:
-        for conversation in conversations:
-            title = conversation["title"]
-            conversation_id = conversation["conversation_id"]
-            first_question = None
-            first_answer = None
-            for _, turn in conversation["mapping"].items():
-
-                denested_d = eh.dict_denester(turn)
-                is_hidden = eh.find_item(denested_d, "is_visually_hidden_from_conversation")
-                content_type = eh.find_item(denested_d, "content_type")
-                role = eh.find_item(denested_d, "role")
-                if (content_type != "text") or (is_hidden == "True") or (role not in ["user", "assistant"]):
-                    continue
-                message = "".join(eh.find_items(denested_d, "part"))
-                # In some cases, an assistant's response is empty
-                if (role == "assistant") and (not message):
-                    continue
-                model = eh.find_item(denested_d, "-model_slug")
-                time = eh.epoch_to_iso(eh.find_item(denested_d, "create_time"))
-                # Is first question or answer?
-                id = eh.find_item(denested_d, "id")
-                if (role == "user") and (not first_question):
-                    first_question = id
-                elif (role == "assistant") and (not first_answer):
-                    first_answer = id
-                datapoint = {
-                    "conversation title": title,
-                    "role": role,
-                    "message": message,
-                    "model": model,
-                    "time": time,
-                    "conversation_id": conversation_id,
-                    "is_first": True if ((first_question == id) or (first_answer == id)) else False  # Label first qa pair
-                }
-                datapoints.append(datapoint)
-
-        out = pd.DataFrame(datapoints)
+def iter_conversation_nodes(conversation: dict[str, Any], all_branches: bool = False) -> Iterator[dict[str, Any]]:
+    """
+    Yields the nodes of a ChatGPT conversation in thread order.
 
-    except Exception as e:
-        logger.error("Data extraction error: %s", e)
+    By default only the canonical thread is returned: the path from the root to current_node,
+    so regenerated and abandoned branches are left out.
+    With all_branches, every node is returned, walking the children depth first from the root(s).
+    Conversations without a current_node are always walked with all_branches.
+    """
+    mapping = conversation.get("mapping") or {}
+    node_id = conversation.get("current_node")
+
+    if not all_branches and node_id in mapping:
+        thread = []
+        seen = set()
+        while node_id in mapping and node_id not in seen:
+            seen.add(node_id)
+            node = mapping[node_id]
+            thread.append(node)
+            node_id = node.get("parent")
+        yield from reversed(thread)
+        return
+
+    stack = [node_id for node_id, node in mapping.items() if node.get("parent") not in mapping]
+    stack.reverse()
+    seen = set()
+    while stack:
+        node_id = stack.pop()
+        if node_id in seen or node_id not in mapping:
+            continue
+        seen.add(node_id)
+        node = mapping[node_id]
+        yield node
+        stack.extend(reversed(node.get("children") or []))
+
+
+@flow_metrics.measured
+def extract_conversations(chatgpt_zip: str | eh.ZipIndex, all_branches: bool = False) -> pd.DataFrame:
+
+    with eh.open_file_from_zip(chatgpt_zip, "conversations.json") as b:
+        conversations = eh.iter_json_array(b)
+
+        datapoints = []
+        out = pd.DataFrame()
+
+        try:
+            for conversation in conversations:
+                title = conversation["title"]
+                conversation_id = conversation["conversation_id"]
+                first_question = None
+                first_answer = None
+                for turn in iter_conversation_nodes(conversation, all_branches):
+
+                    turn_message = turn.get("message") or {}
+                    metadata = turn_message.get("metadata") or {}
+                    content = turn_message.get("content") or {}
+                    is_hidden = metadata.get("is_visually_hidden_from_conversation", False)
+                    content_type = content.get("content_type", "")
+                    role = (turn_message.get("author") or {}).get("role", "")
+                    if (content_type != "text") or (is_hidden is True) or (role not in ["user", "assistant"]):
+                        continue
+                    message = "".join(str(part) for part in content.get("parts") or [])
+                    # In some cases, an assistant's response is empty
+                    if (role == "assistant") and (not message):
+                        continue
+                    model = str(metadata.get("model_slug", ""))
+                    time = turn_message.get("create_time", "")
+                    # Is first question or answer?
+                    id = str(turn.get("id", ""))
+                    if (role == "user") and (not first_question):
+                        first_question = id
+                    elif (role == "assistant") and (not first_answer):
+                        first_answer = id
+                    datapoint = {
+                        "conversation title": title,
+                        "role": role,
+                        "message": message,
+                        "model": model,
+                        "time": time,
+                        "conversation_id": conversation_id,
+                        "is_first": True if ((first_question == id) or (first_answer == id)) else False  # Label first qa pair
+                    }
+                    datapoints.append(datapoint)
+
+            out = pd.DataFrame(datapoints)
+            if not out.empty:
+                # Convert the raw times, the time column has already turned None into NaN
+                out["time"] = eh.epochs_to_iso([datapoint["time"] for datapoint in datapoints])
+
+        except Exception as e:
+            logger.error("Data extraction error: %s", e)
         
     return out
 
 
+@flow_metrics.measured
 def conversations_to_df(conversations: pd.DataFrame) -> pd.DataFrame:
 
     df = conversations.copy()
@@ -111,7 +162,7 @@ def conversations_to_df(conversations: pd.DataFrame) -> pd.DataFrame:
 
 
 
-def extraction(chatgpt_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+def extraction(chatgpt_zip: str | eh.ZipIndex) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
     """
     Add your table definitions below in the list
     """
@@ -137,7 +188,8 @@ def extraction(chatgpt_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTable
                     "textColumn": "message",
                     "tokenize": True,
                 }
-            ]
+            ],
+            compact=True,
         ),
     ]
 
@@ -406,12 +458,13 @@ class ChatGPTFlow(FlowBuilder):
         super().__init__(session_id, "ChatGPT")
         
     def validate_file(self, file):
-        return validate.validate_zip(DDP_CATEGORIES, file)
+        return validate.validate_zip(DDP_CATEGORIES, file, check_content=True)
         
     def extract_data(self, file_value, validation):
         return extraction(file_value)
 
 
-def process(session_id):
+def process(session_id, collect_metrics=False):
     flow = ChatGPTFlow(session_id)
+    flow.collect_metrics = collect_metrics
     return flow.start_flow()
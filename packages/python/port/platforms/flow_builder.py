@@ -7,12 +7,15 @@ from abc import abstractmethod
 from typing import Generator
 import json
 import logging
+import os
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
+import port.helpers.extraction_helpers as eh
+import port.helpers.flow_metrics as flow_metrics
 import port.helpers.port_helpers as ph
+import port.helpers.table_pagination as table_pagination
 import port.helpers.validate as validate
-import port.platforms.chatgpt as chatgpt
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,12 @@ class FlowBuilder:
         self.session_id = session_id
         self.platform_name = platform_name
         self.table_list = []
+        # Compress the donated data, see port_helpers.compress_donation
+        self.compress_donations = False
+        # Time the stages of the flow and donate the metrics, see flow_metrics.FlowMetrics
+        # Off by default, process(session_id, collect_metrics=True) or port.start(..., collect_metrics=True) turns it on
+        self.collect_metrics = False
+        self.metrics = flow_metrics.FlowMetrics(enabled=False)
         
         self._initialize_ui_text()
         
@@ -52,20 +61,31 @@ class FlowBuilder:
         """
         Main processing loop for all platforms
         """
+        self.metrics = flow_metrics.FlowMetrics(enabled=self.collect_metrics)
+
         while True:
             logger.info(f"Prompt for file for {self.platform_name}")
             file_prompt = self.generate_file_prompt()
             file_result = yield ph.render_page(self.UI_TEXT["submit_file_header"], file_prompt)
             
             if file_result.__type__ == "PayloadString":
-                validation = self.validate_file(file_result.value)
+                with self.metrics.stage("validation"):
+                    validation = self.validate_file(file_result.value)
                 
                 # Happy flow: Valid file
                 if validation.get_status_code_id() == 0:
                     logger.info(f"Payload for {self.platform_name}")
-                    self.table_list = self.extract_data(file_result.value, validation)
-                    if isinstance(self.table_list, Generator):
-                        self.table_list = yield from self.table_list
+                    if self.metrics.enabled:
+                        self.metrics.record("input", size=os.path.getsize(file_result.value))
+                    # Continue with the archive validation opened, if it kept it
+                    zip_index = getattr(validation, "archive", None) or eh.ZipIndex(file_result.value)
+                    with zip_index, self.metrics.active():
+                        # Extractions that prompt the participant are generators, their
+                        # extractors are still measured as stages while the generator runs
+                        with self.metrics.stage("extraction"):
+                            self.table_list = self.extract_data(zip_index, validation)
+                        if isinstance(self.table_list, Generator):
+                            self.table_list = yield from self.table_list
 
                     break
                     
@@ -86,14 +106,29 @@ class FlowBuilder:
         if self.table_list is not None:
             logger.info(f"Prompt consent; {self.platform_name}")
             review_data_prompt = self.generate_review_data_prompt()
-            result = yield ph.render_page(self.UI_TEXT["review_data_header"], review_data_prompt)
+            pager = table_pagination.TablePager(self.table_list)
+            result = yield self.metrics.serialize(
+                ph.render_page(self.UI_TEXT["review_data_header"], review_data_prompt),
+                "serialize_review_page"
+            )
+
+            # Paginated tables ask for pages and search results until the participant is done
+            while pager.is_query(result):
+                result = yield pager.query(result.value)
 
             if result.__type__ == "PayloadJSON":
-                reviewed_data = result.value
-                yield ph.donate(f"{self.session_id}", reviewed_data)
+                reviewed_data = pager.expand_donation(result.value)
+                yield from ph.donate_in_parts(f"{self.session_id}", reviewed_data, compress=self.compress_donations)
+
+                if self.metrics.enabled:
+                    self.metrics.record("donation", size=len(reviewed_data.encode("utf-8")))
+                    self.metrics.close()
+                    yield ph.donate(f"{self.session_id}-metrics", self.metrics.to_json())
 
                 # render questionnaire
                 # modified including three questions and answers rather than just a random one
+                # imported here, the chatgpt module itself imports this module
+                import port.platforms.chatgpt as chatgpt
                 donated_data = json.loads(reviewed_data)[0]["chatgpt_conversations"]
                 if len(donated_data) > 0:
                     questions_and_answers = chatgpt.select_three_qas(donated_data)
@@ -114,6 +149,7 @@ class FlowBuilder:
                                     value = json.dumps('{"status" : "data_submission declined"}')
                                     yield ph.donate(f"{self.session_id}", value)
                 
+        self.metrics.close()
         yield ph.exit(0, "Success")
     
     # Methods to be overridden by platform-specific implementations
@@ -127,8 +163,8 @@ class FlowBuilder:
         raise NotImplementedError("Must be implemented by subclass")
         
     @abstractmethod
-    def extract_data(self, file: str, validation: validate.ValidateInput) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
-        """Extract data from file using platform-specific logic"""
+    def extract_data(self, file: eh.ZipIndex, validation: validate.ValidateInput) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+        """Extract data from the indexed zip file using platform-specific logic"""
         raise NotImplementedError("Must be implemented by subclass")
         
     def generate_retry_prompt(self):
@@ -6,21 +6,27 @@ This module contains an example flow of a Instagram data donation study
 Assumptions:
 It handles DDPs in the english language with filetype JSON.
 """
-import logging
+from __future__ import annotations
 
-import pandas as pd
+from typing import Any, Callable
+import logging
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.flow_metrics as flow_metrics
 import port.helpers.validate as validate
 from port.platforms.flow_builder import FlowBuilder
 
 from port.helpers.validate import (
+    ContentCheck,
     DDPCategory,
     DDPFiletype,
     Language,
 )
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -63,292 +69,333 @@ DDP_CATEGORIES = [
             "profile_changes.json",
             "reels.json",
         ],
+        content_checks=[
+            ContentCheck("posts_viewed.json", json_keys=["impressions_history_posts_seen"]),
+            ContentCheck("videos_watched.json", json_keys=["impressions_history_videos_watched"]),
+            ContentCheck("ads_viewed.json", json_keys=["impressions_history_ads_seen"]),
+            ContentCheck("following.json", json_keys=["relationships_following"]),
+            ContentCheck("liked_posts.json", json_keys=["likes_media_likes"]),
+        ],
     )
 ]
 
+# Key of the time in string_map_data, the keys are in the language of the account
+TIME_KEYS = {
+    Language.EN: "Time",
+    Language.NL: "Tijd",
+}
 
 
-def accounts_not_interested_in_to_df(instagram_zip: str) -> pd.DataFrame:
+def timestamp_getter(language: Language) -> Callable[[dict[str, Any]], Any]:
+    """
+    Returns a function that gets the timestamp from the string_map_data of an item.
+    The time key of the language is tried first, then the other time key,
+    so items are still read when the language was detected wrongly.
 
-    b = eh.extract_file_from_zip(instagram_zip, "accounts_you're_not_interested_in.json")
-    d = eh.read_json_from_bytes(b)
+    Args:
+        language (Language): The detected language of the DDP, see ValidateInput.detected_language.
 
-    out = pd.DataFrame()
-    datapoints = []
+    Examples::
 
-    try:
-        items = d["impressions_history_recs_hidden_authors"] # pyright: ignore
-        for item in items:
-            data = item.get("string_map_data", {})
-            account_name = data.get("Username", {}).get("value", None),
-            if "Time" in data:
-                timestamp = data.get("Time", {}).get("timestamp", "")
-            else:
-                timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-            datapoints.append((
-                account_name,
-                eh.epoch_to_iso(timestamp)
-            ))
-        out = pd.DataFrame(datapoints, columns=["Account name", "Date"]) # pyright: ignore
-        out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+        >>> get_timestamp = timestamp_getter(Language.NL)
+        >>> get_timestamp({"Tijd": {"timestamp": 1700000000}})
+        1700000000
+    """
+    first_key = TIME_KEYS.get(language, TIME_KEYS[Language.EN])
+    other_key = TIME_KEYS[Language.NL] if first_key == TIME_KEYS[Language.EN] else TIME_KEYS[Language.EN]
 
-    return out
+    def get_timestamp(data: dict[str, Any]) -> Any:
+        value = data.get(first_key)
+        if value is None:
+            value = data.get(other_key, {})
+        return value.get("timestamp", "")
 
+    return get_timestamp
 
-def ads_viewed_to_df(instagram_zip: str) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(instagram_zip, "ads_viewed.json")
-    d = eh.read_json_from_bytes(b)
+@flow_metrics.measured
+def accounts_not_interested_in_to_df(instagram_zip: str | eh.ZipIndex, language: Language = Language.UNKNOWN) -> pd.DataFrame:
 
-    out = pd.DataFrame()
-    datapoints = []
+    with eh.open_file_from_zip(instagram_zip, "accounts_you're_not_interested_in.json") as b:
+        items = eh.iter_json_array(b, "impressions_history_recs_hidden_authors")
 
-    try:
-        items = d["impressions_history_ads_seen"] # pyright: ignore
-        for item in items:
-            data = item.get("string_map_data", {})
-            account_name = data.get("Author", {}).get("value", None)
-            if "Time" in data:
-                timestamp = data.get("Time", {}).get("timestamp", "")
-            else:
-                timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-            datapoints.append((
-                account_name,
-                eh.epoch_to_iso(timestamp)
-            ))
-        out = pd.DataFrame(datapoints, columns=["Author of ad", "Date"]) # pyright: ignore
-        out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+        get_timestamp = timestamp_getter(language)
+        out = pd.DataFrame()
+        datapoints = []
+
+        try:
+            for item in items:
+                data = item.get("string_map_data", {})
+                account_name = data.get("Username", {}).get("value", None),
+                timestamp = get_timestamp(data)
+
+                datapoints.append((
+                    account_name,
+                    timestamp
+                ))
+            out = pd.DataFrame(datapoints, columns=["Account name", "Date"], dtype=object) # pyright: ignore
+            out["Date"] = eh.epochs_to_iso(out["Date"])
+            out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
-def posts_viewed_to_df(instagram_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def ads_viewed_to_df(instagram_zip: str | eh.ZipIndex, language: Language = Language.UNKNOWN) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(instagram_zip, "posts_viewed.json")
-    d = eh.read_json_from_bytes(b)
+    with eh.open_file_from_zip(instagram_zip, "ads_viewed.json") as b:
+        items = eh.iter_json_array(b, "impressions_history_ads_seen")
 
-    out = pd.DataFrame()
-    datapoints = []
+        get_timestamp = timestamp_getter(language)
+        out = pd.DataFrame()
+        datapoints = []
 
-    try:
-        items = d["impressions_history_posts_seen"] # pyright: ignore
-        for item in items:
-            data = item.get("string_map_data", {})
-            account_name = data.get("Author", {}).get("value", None)
-            if "Time" in data:
-                timestamp = data.get("Time", {}).get("timestamp", "")
-            else:
-                timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-            datapoints.append((
-                account_name,
-                eh.epoch_to_iso(timestamp)
-            ))
-        out = pd.DataFrame(datapoints, columns=["Author", "Date"]) # pyright: ignore
-        out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+        try:
+            for item in items:
+                data = item.get("string_map_data", {})
+                account_name = data.get("Author", {}).get("value", None)
+                timestamp = get_timestamp(data)
+
+                datapoints.append((
+                    account_name,
+                    timestamp
+                ))
+            out = pd.DataFrame(datapoints, columns=["Author of ad", "Date"], dtype=object) # pyright: ignore
+            out["Date"] = eh.epochs_to_iso(out["Date"])
+            out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
+@flow_metrics.measured
+def posts_viewed_to_df(instagram_zip: str | eh.ZipIndex, language: Language = Language.UNKNOWN) -> pd.DataFrame:
 
-def posts_not_interested_in_to_df(instagram_zip: str) -> pd.DataFrame:
+    with eh.open_file_from_zip(instagram_zip, "posts_viewed.json") as b:
+        items = eh.iter_json_array(b, "impressions_history_posts_seen")
 
-    b = eh.extract_file_from_zip(instagram_zip, "posts_you're_not_interested_in.json")
-    data = eh.read_json_from_bytes(b)
+        get_timestamp = timestamp_getter(language)
+        out = pd.DataFrame()
+        datapoints = []
 
-    out = pd.DataFrame()
-    datapoints = []
+        try:
+            for item in items:
+                data = item.get("string_map_data", {})
+                account_name = data.get("Author", {}).get("value", None)
+                timestamp = get_timestamp(data)
 
-    try:
-        items = data["impressions_history_posts_not_interested"] # pyright: ignore
-        for item in items:
-            d = eh.dict_denester(item.get("string_list_data"))
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(d, "value")),
-                eh.find_item(d, "href"),
-                eh.epoch_to_iso(eh.find_item(d, "timestamp"))
-            ))
-        out = pd.DataFrame(datapoints, columns=["Post", "Link", "Date"]) # pyright: ignore
-        out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+                datapoints.append((
+                    account_name,
+                    timestamp
+                ))
+            out = pd.DataFrame(datapoints, columns=["Author", "Date"], dtype=object) # pyright: ignore
+            out["Date"] = eh.epochs_to_iso(out["Date"])
+            out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
 
-def videos_watched_to_df(instagram_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def posts_not_interested_in_to_df(instagram_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(instagram_zip, "videos_watched.json")
-    d = eh.read_json_from_bytes(b)
+    with eh.open_file_from_zip(instagram_zip, "posts_you're_not_interested_in.json") as b:
+        items = eh.iter_json_array(b, "impressions_history_posts_not_interested")
 
-    out = pd.DataFrame()
-    datapoints = []
+        out = pd.DataFrame()
+        datapoints = []
+
+        try:
+            for item in items:
+                d = eh.dict_denester(item.get("string_list_data"))
+                datapoints.append((
+                    eh.fix_latin1_string(eh.find_item(d, "value")),
+                    eh.find_item(d, "href"),
+                    eh.find_item(d, "timestamp")
+                ))
+            out = pd.DataFrame(datapoints, columns=["Post", "Link", "Date"]) # pyright: ignore
+            out["Date"] = eh.epochs_to_iso(out["Date"])
+            out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
 
-    try:
-        items = d["impressions_history_videos_watched"] # pyright: ignore
-        for item in items:
-            data = item.get("string_map_data", {})
-            account_name = data.get("Author", {}).get("value", None)
-            if "Time" in data:
-                timestamp = data.get("Time", {}).get("timestamp", "")
-            else:
-                timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-            datapoints.append((
-                account_name,
-                eh.epoch_to_iso(timestamp)
-            ))
-        out = pd.DataFrame(datapoints, columns=["Author", "Date"]) # pyright: ignore
-        out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
-def post_comments_to_df(instagram_zip: str) -> pd.DataFrame:
-    """
-    You can have 1 to n files of post_comments_<x>.json
-    """
 
-    out = pd.DataFrame()
-    datapoints = []
-    i = 1
+@flow_metrics.measured
+def videos_watched_to_df(instagram_zip: str | eh.ZipIndex, language: Language = Language.UNKNOWN) -> pd.DataFrame:
 
-    while True:
-        b = eh.extract_file_from_zip(instagram_zip, f"post_comments_{i}.json")
-        d = eh.read_json_from_bytes(b)
+    with eh.open_file_from_zip(instagram_zip, "videos_watched.json") as b:
+        items = eh.iter_json_array(b, "impressions_history_videos_watched")
 
-        if not d:
-            break
+        get_timestamp = timestamp_getter(language)
+        out = pd.DataFrame()
+        datapoints = []
 
         try:
-            for item in d:
+            for item in items:
                 data = item.get("string_map_data", {})
-                media_owner = data.get("Media Owner", {}).get("value", "")
-                comment = data.get("Comment", {}).get("value", "")
-                if "Time" in data:
-                    timestamp = data.get("Time", {}).get("timestamp", "")
-                else:
-                    timestamp = data.get("Tijd", {}).get("timestamp", "")
+                account_name = data.get("Author", {}).get("value", None)
+                timestamp = get_timestamp(data)
 
                 datapoints.append((
-                    media_owner,
-                    eh.fix_latin1_string(comment),
-                    eh.epoch_to_iso(timestamp)
+                    account_name,
+                    timestamp
                 ))
-            i += 1
+            out = pd.DataFrame(datapoints, columns=["Author", "Date"], dtype=object) # pyright: ignore
+            out["Date"] = eh.epochs_to_iso(out["Date"])
+            out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
 
         except Exception as e:
             logger.error("Exception caught: %s", e)
-            return pd.DataFrame()
 
-    out = pd.DataFrame(datapoints, columns=["Media Owner", "Comment", "Date"]) # pyright: ignore
+    return out
+
+
+@flow_metrics.measured
+def post_comments_to_df(instagram_zip: str | eh.ZipIndex, language: Language = Language.UNKNOWN) -> pd.DataFrame:
+    """
+    You can have 1 to n files of post_comments_<x>.json
+    """
+
+    get_timestamp = timestamp_getter(language)
+    out = pd.DataFrame()
+    datapoints = []
+    i = 1
+
+    while True:
+        with eh.open_file_from_zip(instagram_zip, f"post_comments_{i}.json") as b:
+            items = eh.iter_json_array(b)
+            n_items = 0
+
+            try:
+                for item in items:
+                    n_items += 1
+                    data = item.get("string_map_data", {})
+                    media_owner = data.get("Media Owner", {}).get("value", "")
+                    comment = data.get("Comment", {}).get("value", "")
+                    timestamp = get_timestamp(data)
+
+                    datapoints.append((
+                        media_owner,
+                        eh.fix_latin1_string(comment),
+                        timestamp
+                    ))
+
+                if n_items == 0:
+                    break
+                i += 1
+
+            except Exception as e:
+                logger.error("Exception caught: %s", e)
+                return pd.DataFrame()
+
+    out = pd.DataFrame(datapoints, columns=["Media Owner", "Comment", "Date"], dtype=object) # pyright: ignore
+    out["Date"] = eh.epochs_to_iso(out["Date"])
 
     return out
 
 
 
-def following_to_df(instagram_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def following_to_df(instagram_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(instagram_zip, "following.json")
-    data = eh.read_json_from_bytes(b)
+    with eh.open_file_from_zip(instagram_zip, "following.json") as b:
+        items = eh.iter_json_array(b, "relationships_following")
 
-    out = pd.DataFrame()
-    datapoints = []
+        out = pd.DataFrame()
+        datapoints = []
 
-    try:
-        items = data["relationships_following"] # pyright: ignore
-        for item in items:
-            d = eh.dict_denester(item)
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(d, "value")),
-                eh.find_item(d, "href"),
-                eh.epoch_to_iso(eh.find_item(d, "timestamp"))
-            ))
-        out = pd.DataFrame(datapoints, columns=["Account", "Link", "Date"]) # pyright: ignore
-        out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+        try:
+            for item in items:
+                d = eh.dict_denester(item)
+                datapoints.append((
+                    eh.fix_latin1_string(eh.find_item(d, "value")),
+                    eh.find_item(d, "href"),
+                    eh.find_item(d, "timestamp")
+                ))
+            out = pd.DataFrame(datapoints, columns=["Account", "Link", "Date"]) # pyright: ignore
+            out["Date"] = eh.epochs_to_iso(out["Date"])
+            out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
 
-def liked_comments_to_df(instagram_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def liked_comments_to_df(instagram_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(instagram_zip, "liked_comments.json")
-    data = eh.read_json_from_bytes(b)
+    with eh.open_file_from_zip(instagram_zip, "liked_comments.json") as b:
+        items = eh.iter_json_array(b, "likes_comment_likes")
 
-    out = pd.DataFrame()
-    datapoints = []
+        out = pd.DataFrame()
+        datapoints = []
+
+        try:
+            for item in items:
+                d = eh.dict_denester(item)
+                datapoints.append((
+                    eh.fix_latin1_string(eh.find_item(d, "title")),
+                    eh.fix_latin1_string(eh.find_item(d, "value")),
+                    eh.find_items(d, "href"),
+                    eh.find_item(d, "timestamp")
+                ))
+            out = pd.DataFrame(datapoints, columns=["Account name", "Value", "Link", "Date"]) # pyright: ignore
+            out["Date"] = eh.epochs_to_iso(out["Date"])
+            out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
 
-    try:
-        items = data["likes_comment_likes"] #pyright: ignore
-        for item in items:
-            d = eh.dict_denester(item)
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(d, "title")),
-                eh.fix_latin1_string(eh.find_item(d, "value")),
-                eh.find_items(d, "href"),
-                eh.epoch_to_iso(eh.find_item(d, "timestamp"))
-            ))
-        out = pd.DataFrame(datapoints, columns=["Account name", "Value", "Link", "Date"]) # pyright: ignore
-        out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
-def liked_posts_to_df(instagram_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def liked_posts_to_df(instagram_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(instagram_zip, "liked_posts.json")
-    data = eh.read_json_from_bytes(b)
+    with eh.open_file_from_zip(instagram_zip, "liked_posts.json") as b:
+        items = eh.iter_json_array(b, "likes_media_likes")
 
-    out = pd.DataFrame()
-    datapoints = []
+        out = pd.DataFrame()
+        datapoints = []
 
-    try:
-        items = data["likes_media_likes"] #pyright: ignore
-        for item in items:
-            d = eh.dict_denester(item)
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(d, "title")),
-                eh.fix_latin1_string(eh.find_item(d, "value")),
-                eh.find_items(d, "href"),
-                eh.epoch_to_iso(eh.find_item(d, "timestamp"))
-            ))
-        out = pd.DataFrame(datapoints, columns=["Account name", "Value", "Link", "Date"]) # pyright: ignore
-        out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+        try:
+            for item in items:
+                d = eh.dict_denester(item)
+                datapoints.append((
+                    eh.fix_latin1_string(eh.find_item(d, "title")),
+                    eh.fix_latin1_string(eh.find_item(d, "value")),
+                    eh.find_items(d, "href"),
+                    eh.find_item(d, "timestamp")
+                ))
+            out = pd.DataFrame(datapoints, columns=["Account name", "Value", "Link", "Date"]) # pyright: ignore
+            out["Date"] = eh.epochs_to_iso(out["Date"])
+            out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
-def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+def extraction(instagram_zip: str | eh.ZipIndex, language: Language = Language.UNKNOWN) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
     tables = [
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="instagram_posts_viewed",
-            data_frame=posts_viewed_to_df(instagram_zip),
+            data_frame=posts_viewed_to_df(instagram_zip, language),
             title=props.Translatable({
                 "en": "Posts viewed on Instagram",
                 "nl": "Berichten bekeken op Instagram"
@@ -392,7 +439,7 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="instagram_videos_watched",
-            data_frame=videos_watched_to_df(instagram_zip),
+            data_frame=videos_watched_to_df(instagram_zip, language),
             title=props.Translatable({
                 "en": "Videos watched on Instagram",
                 "nl": "Video's bekeken op Instagram"
@@ -421,7 +468,7 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="instagram_post_comments",
-            data_frame=post_comments_to_df(instagram_zip),
+            data_frame=post_comments_to_df(instagram_zip, language),
             title=props.Translatable({
                 "en": "Comments on Instagram posts",
                 "nl": "Reacties op Instagram-berichten",
@@ -444,7 +491,7 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="instagram_accounts_not_interested_in",
-            data_frame=accounts_not_interested_in_to_df(instagram_zip),
+            data_frame=accounts_not_interested_in_to_df(instagram_zip, language),
             title=props.Translatable({
                 "en": "Instagram accounts not interested in",
                 "nl": "Instagram-accounts waarin je geen interesse hebt"
@@ -456,7 +503,7 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="instagram_ads_viewed",
-            data_frame=ads_viewed_to_df(instagram_zip),
+            data_frame=ads_viewed_to_df(instagram_zip, language),
             title=props.Translatable({
                 "en": "Ads you viewed on Instagram",
                 "nl": "Advertenties die je op Instagram hebt bekeken"
@@ -465,6 +512,7 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 "en": "In this table, you find the ads that you viewed on Instagram sorted over time.",
                 "nl": "In deze tabel zie je de advertenties die je op Instagram hebt bekeken, gesorteerd op tijd."
             }),
+            page_size=d3i_props.PAGE_SIZE,
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="instagram_posts_not_interested_in",
@@ -546,12 +594,13 @@ class InstagramFlow(FlowBuilder):
         super().__init__(session_id, "Instagram")
         
     def validate_file(self, file):
-        return validate.validate_zip(DDP_CATEGORIES, file)
+        return validate.validate_zip(DDP_CATEGORIES, file, check_content=True, detect_language=True)
         
     def extract_data(self, file_value, validation):
-        return extraction(file_value)
+        return extraction(file_value, validation.detected_language)
 
 
-def process(session_id):
+def process(session_id, collect_metrics=False):
     flow = InstagramFlow(session_id)
+    flow.collect_metrics = collect_metrics
     return flow.start_flow()
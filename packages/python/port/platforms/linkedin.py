@@ -6,16 +6,16 @@ This module contains an example flow of a LinkedIn data donation study
 Assumptions:
 It handles DDPs in the english language with filetype CSV.
 """
+from __future__ import annotations
 
 import logging
 import io
 import re
 
-import pandas as pd
-
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.flow_metrics as flow_metrics
 import port.helpers.validate as validate
 from port.platforms.flow_builder import FlowBuilder
 
@@ -24,6 +24,9 @@ from port.helpers.validate import (
     DDPFiletype,
     Language,
 )
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -73,98 +76,104 @@ def strip_notes(b: io.BytesIO) -> io.BytesIO:
     return out
 
 
-def company_follows_to_df(linkedin_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def company_follows_to_df(linkedin_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     'Company Follows.csv'
     """
     filename = "Company Follows.csv"
 
-    b = eh.extract_file_from_zip(linkedin_zip, filename)
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(linkedin_zip, filename) as b:
+        df = eh.read_csv_from_bytes_to_df(b)
 
     return df
 
 
-def member_follows_to_df(linkedin_zip: str) -> pd.DataFrame:
+def member_follows_to_df(linkedin_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     'Member_Follows.csv'
     """
     filename = "Member_Follows.csv"
-    b = eh.extract_file_from_zip(linkedin_zip, filename)
-    b = strip_notes(b)
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(linkedin_zip, filename) as b:
+        b = strip_notes(b)
+        df = eh.read_csv_from_bytes_to_df(b)
 
     return df
 
 
-def connections_to_df(linkedin_zip: str) -> pd.DataFrame:
+def connections_to_df(linkedin_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     'Connections.csv'
     """
     filename = "Connections.csv"
-    b = eh.extract_file_from_zip(linkedin_zip, filename)
-    b = strip_notes(b)
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(linkedin_zip, filename) as b:
+        b = strip_notes(b)
+        df = eh.read_csv_from_bytes_to_df(b)
 
     return df
 
 
-def reactions_to_df(linkedin_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def reactions_to_df(linkedin_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     'Reactions.csv'
     """
     filename = "Reactions.csv"
-    b = eh.extract_file_from_zip(linkedin_zip, filename)
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(linkedin_zip, filename) as b:
+        df = eh.read_csv_from_bytes_to_df(b)
 
     return df
 
 
-def ads_clicked_to_df(linkedin_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def ads_clicked_to_df(linkedin_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     'Ads Clicked.csv'
     """
     filename = "Ads Clicked.csv"
-    b = eh.extract_file_from_zip(linkedin_zip, filename)
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(linkedin_zip, filename) as b:
+        df = eh.read_csv_from_bytes_to_df(b)
 
     return df
 
 
-def search_queries_to_df(linkedin_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def search_queries_to_df(linkedin_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     'SearchQueries.csv'
     """
     filename = "SearchQueries.csv"
-    b = eh.extract_file_from_zip(linkedin_zip, filename)
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(linkedin_zip, filename) as b:
+        df = eh.read_csv_from_bytes_to_df(b)
 
     return df
 
 
-def shares_to_df(linkedin_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def shares_to_df(linkedin_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     'Shares.csv'
     """
     filename = "Shares.csv"
-    b = eh.extract_file_from_zip(linkedin_zip, filename)
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(linkedin_zip, filename) as b:
+        df = eh.read_csv_from_bytes_to_df(b)
 
     return df
 
 
-def comments_to_df(linkedin_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def comments_to_df(linkedin_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     'Comments.csv'
     """
     filename = "Comments.csv"
-    b = eh.extract_file_from_zip(linkedin_zip, filename)
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(linkedin_zip, filename) as b:
+        df = eh.read_csv_from_bytes_to_df(b)
 
     return df
 
 
-def extraction(linkedin_zip: str) -> list:
+def extraction(linkedin_zip: str | eh.ZipIndex) -> list:
     tables = [
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="linkedin_ads_clicked",
@@ -289,6 +298,7 @@ class LinkedInFlow(FlowBuilder):
         return extraction(file_value)
 
 
-def process(session_id):
+def process(session_id, collect_metrics=False):
     flow = LinkedInFlow(session_id)
+    flow.collect_metrics = collect_metrics
     return flow.start_flow()
@@ -6,22 +6,28 @@ This module provides an example flow of a Netflix data donation study
 Assumptions:
 It handles DDPs in the english language with filetype CSV.
 """
-import logging
+from __future__ import annotations
 
-import pandas as pd
+import logging
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.extraction_plan as extraction_plan
+import port.helpers.flow_metrics as flow_metrics
 import port.helpers.validate as validate
 import port.helpers.port_helpers as ph
 from port.platforms.flow_builder import FlowBuilder
 
 from port.helpers.validate import (
+    ContentCheck,
     DDPCategory,
     DDPFiletype,
     Language,
 )
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -30,18 +36,30 @@ DDP_CATEGORIES = [
         id="csv",
         ddp_filetype=DDPFiletype.CSV,
         language=Language.EN,
-        known_files=["MyList.csv", "ViewingActivity.csv", "SearchHistory.csv", "IndicatedPreferences.csv", "PlaybackRelatedEvents.csv", "InteractiveTitles.csv", "Ratings.csv", "GamePlaySession.txt", "IpAddressesLogin.csv", "IpAddressesAccountCreation.txt", "IpAddressesStreaming.csv", "Additional Information.pdf", "MessagesSentByNetflix.csv", "SocialMediaConnections.txt", "AccountDetails.csv", "ProductCancellationSurvey.txt", "CSContact.csv", "ChatTranscripts.csv", "Cover sheet.pdf", "Devices.csv", "ParentalControlsRestrictedTitles.txt", "AvatarHistory.csv", "Profiles.csv", "Clickstream.csv", "BillingHistory.csv"]
+        known_files=["MyList.csv", "ViewingActivity.csv", "SearchHistory.csv", "IndicatedPreferences.csv", "PlaybackRelatedEvents.csv", "InteractiveTitles.csv", "Ratings.csv", "GamePlaySession.txt", "IpAddressesLogin.csv", "IpAddressesAccountCreation.txt", "IpAddressesStreaming.csv", "Additional Information.pdf", "MessagesSentByNetflix.csv", "SocialMediaConnections.txt", "AccountDetails.csv", "ProductCancellationSurvey.txt", "CSContact.csv", "ChatTranscripts.csv", "Cover sheet.pdf", "Devices.csv", "ParentalControlsRestrictedTitles.txt", "AvatarHistory.csv", "Profiles.csv", "Clickstream.csv", "BillingHistory.csv"],
+        content_checks=[
+            ContentCheck("ViewingActivity.csv", csv_columns=["Start Time", "Duration", "Title"]),
+            ContentCheck("Ratings.csv", csv_columns=["Title Name", "Thumbs Value", "Event Utc Ts"]),
+        ],
     )
 ]
 
-def extract_users(netflix_zip) -> list[str]:
+# The members the tables need, every member is parsed once, see extraction_plan
+VIEWING_ACTIVITY = extraction_plan.Member("ViewingActivity.csv", eh.read_csv_from_bytes_to_df)
+RATINGS = extraction_plan.Member("Ratings.csv", eh.read_csv_from_bytes_to_df)
+
+
+def extract_users(netflix_zip: str | eh.ZipIndex, plan_run: extraction_plan.PlanRun | None = None) -> list[str]:
     """
     Extracts all users from a netflix csv file 
     This function expects all users to be present in the first column of a pd.DataFrame
+
+    Pass the plan_run that extracts the tables, then ViewingActivity.csv is parsed only once.
     """
+    if plan_run is None:
+        plan_run = EXTRACTION_PLAN.start(netflix_zip)
 
-    b = eh.extract_file_from_zip(netflix_zip, "ViewingActivity.csv")
-    df = eh.read_csv_from_bytes_to_df(b)
+    df = plan_run.member(VIEWING_ACTIVITY)
     out = []
     try:
         out: list[str] = df[df.columns[0]].unique().tolist()
@@ -64,22 +82,12 @@ def keep_user(df: pd.DataFrame, selected_user: str) -> pd.DataFrame:
 
     return df
 
-    
-def netflix_to_df(netflix_zip: str, file_name: str, selected_user: str) -> pd.DataFrame:
-    """
-    netflix csv to df
-    returns empty df in case of error
-    """
-    ratings_bytes = eh.extract_file_from_zip(netflix_zip, file_name)
-    df = eh.read_csv_from_bytes_to_df(ratings_bytes)
-    df = keep_user(df, selected_user)
-
-    return df
 
 
-def ratings_to_df(netflix_zip: str, selected_user: str)  -> pd.DataFrame:
+@flow_metrics.measured
+def ratings_to_df(ratings: pd.DataFrame, selected_user: str)  -> pd.DataFrame:
     """
-    Extract ratings from netflix zip to df
+    Extract ratings from the parsed Ratings.csv to df
     Only keep the selected user
     """
 
@@ -90,7 +98,7 @@ def ratings_to_df(netflix_zip: str, selected_user: str)  -> pd.DataFrame:
         "Thumbs Value": "Aantal duimpjes omhoog"
     }
 
-    df = netflix_to_df(netflix_zip, "Ratings.csv", selected_user)
+    df = keep_user(ratings, selected_user)
 
     # Extraction logic here
     try:
@@ -121,9 +129,10 @@ def time_string_to_hours(time_str):
     return round(total_hours, 3)
 
 
-def viewing_activity_to_df(netflix_zip: str, selected_user: str)  -> pd.DataFrame:
+@flow_metrics.measured
+def viewing_activity_to_df(viewing_activity: pd.DataFrame, selected_user: str)  -> pd.DataFrame:
     """
-    Extract ViewingActivity from netflix zip to df
+    Extract ViewingActivity from the parsed ViewingActivity.csv to df
     Only keep the selected user
     """
 
@@ -135,7 +144,7 @@ def viewing_activity_to_df(netflix_zip: str, selected_user: str)  -> pd.DataFram
         "Duration": "Aantal uur gekeken"
     }
 
-    df = netflix_to_df(netflix_zip, "ViewingActivity.csv", selected_user)
+    df = keep_user(viewing_activity, selected_user)
     remove_values = ["TEASER_TRAILER", "HOOK", "TRAILER", "CINEMAGRAPH"]
 
     try:
@@ -153,11 +162,24 @@ def viewing_activity_to_df(netflix_zip: str, selected_user: str)  -> pd.DataFram
 
 
 
-def extraction(netflix_zip: str, selected_user: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+EXTRACTION_PLAN = extraction_plan.ExtractionPlan()
+EXTRACTION_PLAN.add("netflix_ratings", [RATINGS], ratings_to_df)
+EXTRACTION_PLAN.add("netflix_viewing_activity", [VIEWING_ACTIVITY], viewing_activity_to_df)
+
+
+def extraction(
+    netflix_zip: str | eh.ZipIndex,
+    selected_user: str,
+    plan_run: extraction_plan.PlanRun | None = None,
+) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+    if plan_run is None:
+        plan_run = EXTRACTION_PLAN.start(netflix_zip)
+    data_frames = plan_run.run(selected_user=selected_user)
+
     tables = [
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="netflix_ratings",
-            data_frame=ratings_to_df(netflix_zip, selected_user),
+            data_frame=data_frames["netflix_ratings"],
             title=props.Translatable({
                 "en": "Your ratings on Netflix",
                 "nl": "Uw beoordelingen op Netflix"
@@ -180,7 +202,7 @@ def extraction(netflix_zip: str, selected_user: str) -> list[d3i_props.PropsUIPr
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="netflix_viewing_activity",
-            data_frame=viewing_activity_to_df(netflix_zip, selected_user),
+            data_frame=data_frames["netflix_viewing_activity"],
             title= props.Translatable({
                 "en": "What you watched",
                 "nl": "Wanneer kijkt u Netflix"
@@ -233,15 +255,16 @@ class NetflixFlow(FlowBuilder):
         super().__init__(session_id, "Netflix")
         
     def validate_file(self, file):
-        return validate.validate_zip(DDP_CATEGORIES, file)
+        return validate.validate_zip(DDP_CATEGORIES, file, check_content=True)
         
     def extract_data(self, file, validation):
         selected_user = ""
-        users = extract_users(file)
+        plan_run = EXTRACTION_PLAN.start(file)
+        users = extract_users(file, plan_run)
 
         if len(users) == 1:
             selected_user = users[0]
-            return extraction(file, selected_user)
+            return extraction(file, selected_user, plan_run)
         elif len(users) > 1:
             title = props.Translatable({
                 "en": "Select your Netflix profile name",
@@ -251,9 +274,10 @@ class NetflixFlow(FlowBuilder):
             radio_prompt = ph.generate_radio_prompt(title, empty_text, users)
             selection = yield ph.render_page(empty_text, radio_prompt)
             selected_user = selection.value
-            return extraction(file, selected_user)
+            return extraction(file, selected_user, plan_run)
 
 
-def process(session_id):
+def process(session_id, collect_metrics=False):
     flow = NetflixFlow(session_id)
+    flow.collect_metrics = collect_metrics
     return flow.start_flow()
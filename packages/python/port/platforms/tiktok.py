@@ -6,6 +6,7 @@ This module contains an example flow of a TikTok data donation study
 Assumptions:
 It handles DDPs in the english language with filetype txt.
 """
+from __future__ import annotations
 
 from typing import Dict
 import logging
@@ -13,11 +14,10 @@ import io
 import re
 import re
 
-import pandas as pd
-
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.flow_metrics as flow_metrics
 import port.helpers.validate as validate
 from port.platforms.flow_builder import FlowBuilder
 
@@ -26,6 +26,9 @@ from port.helpers.validate import (
     DDPFiletype,
     Language,
 )
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -82,14 +85,14 @@ DDP_CATEGORIES = [
 
 
 
-def browsing_history_to_df(tiktok_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def browsing_history_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Browsing History.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Browsing History.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Date: (.*?)\nLink: (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -101,14 +104,14 @@ def browsing_history_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def favorite_hashtag_to_df(tiktok_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def favorite_hashtag_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Favorite HashTags.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Favorite HashTags.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Date: (.*?)\nHashTag Link(?::|::) (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -120,14 +123,14 @@ def favorite_hashtag_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def favorite_videos_to_df(tiktok_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def favorite_videos_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Favorite Videos.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Favorite Videos.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Date: (.*?)\nLink: (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -139,14 +142,13 @@ def favorite_videos_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def follower_to_df(tiktok_zip: str) -> pd.DataFrame:
+def follower_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Follower.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Follower.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Date: (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -158,14 +160,13 @@ def follower_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def following_to_df(tiktok_zip: str) -> pd.DataFrame:
+def following_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Following.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Following.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Date: (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -177,14 +178,14 @@ def following_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def hashtag_to_df(tiktok_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def hashtag_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Hashtag.txt") # pyright: ignore
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Hashtag.txt") as b: # pyright: ignore
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Hashtag Name: (.*?)\nHashtag Link: (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -197,14 +198,14 @@ def hashtag_to_df(tiktok_zip: str) -> pd.DataFrame:
 
 
 
-def like_list_to_df(tiktok_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def like_list_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Like List.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Like List.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Date: (.*?)\nLink: (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -216,14 +217,14 @@ def like_list_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def searches_to_df(tiktok_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def searches_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Searches.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Searches.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Date: (.*?)\nSearch Term: (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -236,14 +237,14 @@ def searches_to_df(tiktok_zip: str) -> pd.DataFrame:
 
 
 
-def share_history_to_df(tiktok_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def share_history_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Share History.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Share History.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Date: (.*?)\nShared Content: (.*?)\nLink: (.*?)\nMethod: (.*?)$", re.MULTILINE)
         matches = re.findall(pattern, text)
@@ -255,14 +256,14 @@ def share_history_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def settings_to_df(tiktok_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def settings_to_df(tiktok_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Settings.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
+        with eh.open_file_from_zip(tiktok_zip, "Settings.txt") as b:
+            text = io.TextIOWrapper(b, encoding='utf-8').read()
 
         pattern = re.compile(r"^Interests: (.*?)$", re.MULTILINE)
         match = re.search(pattern, text)
@@ -276,7 +277,7 @@ def settings_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+def extraction(tiktok_zip: str | eh.ZipIndex) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
     tables = [
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="tiktok_video_browsing_history",
@@ -289,7 +290,8 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 "en": "The table below indicates exactly which TikTok videos you have watched and when that was.",
                 "nl": "De tabel hieronder geeft aan welke TikTok video's je precies hebt bekeken en wanneer dat was.",
             }),
-            visualizations=[]
+            visualizations=[],
+            page_size=d3i_props.PAGE_SIZE,
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="tiktok_favorite_videos",
@@ -338,6 +340,7 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 "en": "In the table below, you will find the videos you have liked and when that was.",
                 "nl": "In de tabel hieronder vind je de video's die je hebt geliket en wanneer dat was.",
             }),
+            page_size=d3i_props.PAGE_SIZE,
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="tiktok_searches",
@@ -399,6 +402,7 @@ class TikTokFlow(FlowBuilder):
         return extraction(file_value)
 
 
-def process(session_id):
+def process(session_id, collect_metrics=False):
     flow = TikTokFlow(session_id)
+    flow.collect_metrics = collect_metrics
     return flow.start_flow()
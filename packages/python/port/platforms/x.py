@@ -6,6 +6,7 @@ This module contains an example flow of a X data donation study
 Assumptions:
 It handles DDPs in the english language with filetype js.
 """
+from __future__ import annotations
 
 import logging
 import json
@@ -13,19 +14,22 @@ import io
 import re
 from typing import Any
 
-import pandas as pd
-
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.flow_metrics as flow_metrics
 import port.helpers.validate as validate
 from port.platforms.flow_builder import FlowBuilder
 
 from port.helpers.validate import (
+    ContentCheck,
     DDPCategory,
     DDPFiletype,
     Language,
 )
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +41,12 @@ DDP_CATEGORIES = [
         known_files=[
             "account-creation-ip.js", "app.js", "community-tweet.js", "expanded-profile.js", "ni-devices.js", "professional-data.js", "tweet-headers.js", "account-label.js", "article-metadata.js", "connected-application.js", "follower.js", "note-tweet.js", "profile.js", "tweetdeck.js", "account-suspension.js", "article.js", "contact.js", "following.js", "periscope-account-information.js", "profile_media", "tweets.js", "account-timezone.js", "audio-video-calls-in-dm-recipient-sessions.js", "deleted-note-tweet.js", "grok-chat-item.js", "periscope-ban-information.js", "protected-history.js", "tweets_media", "account.js", "audio-video-calls-in-dm.js", "deleted-tweet-headers.js", "ip-audit.js", "periscope-broadcast-metadata.js", "README.txt", "twitter-shop.js", "ad-engagements.js", "block.js", "deleted-tweets.js", "key-registry.js", "periscope-comments-made-by-user.js", "reply-prompt.js", "user-link-clicks.js", "ad-impressions.js", "branch-links.js", "device-token.js", "like.js", "periscope-expired-broadcasts.js", "saved-search.js", "verified-organization.js", "ad-mobile-conversions-attributed.js", "catalog-item.js", "direct-message-group-headers.js", "lists-created.js", "periscope-followers.js", "screen-name-change.js", "verified.js", "ad-mobile-conversions-unattributed.js", "commerce-catalog.js", "direct-message-headers.js", "lists-member.js", "periscope-profile-description.js", "shop-module.js", "ad-online-conversions-attributed.js", "community-note-batsignal.js", "direct-message-mute.js", "lists-subscribed.js", "personalization.js", "shopify-account.js", "ad-online-conversions-unattributed.js", "community-note-rating.js", "direct-messages-group.js", "manifest.js", "phone-number.js", "smartblock.js", "ads-revenue-sharing.js", "community-note-tombstone.js", "direct-messages.js", "moment.js", "product-drop.js", "spaces-metadata.js", "ageinfo.js", "community-note.js", "email-address-change.js", "mute.js", "product-set.js", "sso.js",
         ],
+        content_checks=[
+            ContentCheck("follower.js", json_keys=["follower"]),
+            ContentCheck("following.js", json_keys=["following"]),
+            ContentCheck("like.js", json_keys=["like"]),
+            ContentCheck("tweets.js", json_keys=["tweet"]),
+        ],
     ),
 ]
 
@@ -72,10 +82,11 @@ def bytesio_to_listdict(bytes_to_read: io.BytesIO) -> list[dict[Any, Any]]:
         return out
 
 
-def ad_engagement_to_df(x_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def ad_engagement_to_df(x_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(x_zip, "ad-engagements.js")
-    items = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(x_zip, "ad-engagements.js") as b:
+        items = bytesio_to_listdict(b)
 
     out = pd.DataFrame()
     datapoints = []
@@ -95,10 +106,11 @@ def ad_engagement_to_df(x_zip: str) -> pd.DataFrame:
     return out
 
 
-def personalization_to_df(x_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def personalization_to_df(x_zip: str | eh.ZipIndex) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(x_zip, "personalization.js")
-    items = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(x_zip, "personalization.js") as b:
+        items = bytesio_to_listdict(b)
 
     out = pd.DataFrame()
     datapoints = []
@@ -119,7 +131,8 @@ def personalization_to_df(x_zip: str) -> pd.DataFrame:
     return out
 
 
-def follower_to_df(x_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def follower_to_df(x_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     following.js
     """
@@ -127,8 +140,8 @@ def follower_to_df(x_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(x_zip, "follower.js")
-    ld = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(x_zip, "follower.js") as b:
+        ld = bytesio_to_listdict(b)
 
     try:
         for item in ld:
@@ -142,7 +155,8 @@ def follower_to_df(x_zip: str) -> pd.DataFrame:
     return out
 
 
-def following_to_df(twitter_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def following_to_df(twitter_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     following.js
     """
@@ -150,8 +164,8 @@ def following_to_df(twitter_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "following.js")
-    ld = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(twitter_zip, "following.js") as b:
+        ld = bytesio_to_listdict(b)
 
     try:
         for item in ld:
@@ -166,7 +180,8 @@ def following_to_df(twitter_zip: str) -> pd.DataFrame:
 
 
 
-def like_to_df(twitter_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def like_to_df(twitter_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     like.js
     """
@@ -174,8 +189,8 @@ def like_to_df(twitter_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "like.js")
-    ld = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(twitter_zip, "like.js") as b:
+        ld = bytesio_to_listdict(b)
 
     try:
         for item in ld:
@@ -191,7 +206,8 @@ def like_to_df(twitter_zip: str) -> pd.DataFrame:
     return out
 
 
-def tweets_to_df(twitter_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def tweets_to_df(twitter_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     tweets.js
     """
@@ -199,8 +215,8 @@ def tweets_to_df(twitter_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "/tweets.js")
-    ld = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(twitter_zip, "/tweets.js") as b:
+        ld = bytesio_to_listdict(b)
 
     try:
         for item in ld:
@@ -216,13 +232,14 @@ def tweets_to_df(twitter_zip: str) -> pd.DataFrame:
     return out
 
 
-def block_to_df(x_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def block_to_df(x_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     block.js
     """
 
-    b = eh.extract_file_from_zip(x_zip, "/block.js")
-    ld = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(x_zip, "/block.js") as b:
+        ld = bytesio_to_listdict(b)
 
     datapoints = []
     out = pd.DataFrame()
@@ -240,7 +257,8 @@ def block_to_df(x_zip: str) -> pd.DataFrame:
     return out
 
 
-def mute_to_df(twitter_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def mute_to_df(twitter_zip: str | eh.ZipIndex) -> pd.DataFrame:
     """
     mute.js
     """
@@ -248,8 +266,8 @@ def mute_to_df(twitter_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "mute.js")
-    ld = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(twitter_zip, "mute.js") as b:
+        ld = bytesio_to_listdict(b)
 
     try:
         for item in ld:
@@ -263,12 +281,13 @@ def mute_to_df(twitter_zip: str) -> pd.DataFrame:
     return out
 
 
-def tweet_headers_to_df(twitter_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def tweet_headers_to_df(twitter_zip: str | eh.ZipIndex) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "/tweet-headers.js")
-    ld = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(twitter_zip, "/tweet-headers.js") as b:
+        ld = bytesio_to_listdict(b)
 
     try:
         for item in ld:
@@ -286,12 +305,13 @@ def tweet_headers_to_df(twitter_zip: str) -> pd.DataFrame:
     return out
 
 
-def user_link_clicks_to_df(twitter_zip: str) -> pd.DataFrame:
+@flow_metrics.measured
+def user_link_clicks_to_df(twitter_zip: str | eh.ZipIndex) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "/user-link-clicks.js")
-    ld = bytesio_to_listdict(b)
+    with eh.open_file_from_zip(twitter_zip, "/user-link-clicks.js") as b:
+        ld = bytesio_to_listdict(b)
 
     try:
         for item in ld:
@@ -310,7 +330,7 @@ def user_link_clicks_to_df(twitter_zip: str) -> pd.DataFrame:
 
 
 
-def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+def extraction(x_zip: str | eh.ZipIndex) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
     tables = [
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="x_ad_engagement",
@@ -322,7 +342,8 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
             description=props.Translatable({
                 "en": "Shows data about your interactions with advertisements on the platform",
                 "nl": "Toont gegevens over uw interacties met advertenties op het platform"
-            })
+            }),
+            page_size=d3i_props.PAGE_SIZE
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="x_follower",
@@ -440,7 +461,8 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
             description=props.Translatable({
                 "en": "Metadata information about your tweets",
                 "nl": "Metadata-informatie over uw tweets"
-            })
+            }),
+            page_size=d3i_props.PAGE_SIZE
         ),
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="x_user_link_clicks",
@@ -466,12 +488,13 @@ class XFlow(FlowBuilder):
         super().__init__(session_id, "X")
         
     def validate_file(self, file):
-        return validate.validate_zip(DDP_CATEGORIES, file)
+        return validate.validate_zip(DDP_CATEGORIES, file, check_content=True)
         
     def extract_data(self, file_value, validation):
         return extraction(file_value)
 
 
-def process(session_id):
+def process(session_id, collect_metrics=False):
     flow = XFlow(session_id)
+    flow.collect_metrics = collect_metrics
     return flow.start_flow()
@@ -6,22 +6,28 @@ This module provides an example flow of a YouTube data donation study
 Assumptions:
 It handles DDPs in the dutch and english language with filetype JSON.
 """
-import logging
+from __future__ import annotations
 
-import pandas as pd
+import logging
+import posixpath
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.flow_metrics as flow_metrics
 import port.helpers.validate as validate
 from port.platforms.flow_builder import FlowBuilder
 
 from port.helpers.validate import (
+    ContentCheck,
     DDPCategory,
     DDPFiletype,
     Language,
     ValidateInput,
 )
+from port.helpers.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +41,10 @@ DDP_CATEGORIES = [
             "kijkgeschiedenis.json",
             "zoekgeschiedenis.json",
         ],
+        content_checks=[
+            ContentCheck("kijkgeschiedenis.json", json_keys=["titleUrl", "time"]),
+            ContentCheck("zoekgeschiedenis.json", json_keys=["titleUrl", "time"]),
+        ],
     ),
     DDPCategory(
         id="json_nl",
@@ -45,92 +55,108 @@ DDP_CATEGORIES = [
             "watch-history.json",
             "subscriptions.cs",
         ],
+        content_checks=[
+            ContentCheck("watch-history.json", json_keys=["titleUrl", "time"]),
+            ContentCheck("search-history.json", json_keys=["titleUrl", "time"]),
+        ],
     ),
 ]
 
+# Names of the files of the tables, the files are named in the language of the account
+FILE_NAMES = {
+    Language.NL: {
+        "watch_history": "kijkgeschiedenis.json",
+        "search_history": "zoekgeschiedenis.json",
+        "subscriptions": "abonnementen.csv",
+    },
+    Language.EN: {
+        "watch_history": "watch-history.json",
+        "search_history": "search-history.json",
+        "subscriptions": "subscriptions.csv",
+    },
+}
+
+
+def file_names(validation: ValidateInput) -> dict[str, str]:
+    """
+    The file names for the language of the DDP (see ValidateInput.language), if they are in the archive.
+    Otherwise the file names of another language that are in the archive, the files decide.
+    Empty if the language is not supported.
+    """
+    present = {posixpath.basename(name) for name in validation.file_names}
+    languages = [validation.language] + [language for language in FILE_NAMES if language != validation.language]
+    for language in languages:
+        names = FILE_NAMES.get(language, {})
+        if any(name in present for name in names.values()):
+            return names
+    return FILE_NAMES.get(validation.language, {})
 
-def watch_history_to_df(zip: str, validation) -> pd.DataFrame:
-    
-    if validation.current_ddp_category.language == Language.NL:
-        b = eh.extract_file_from_zip(zip, "kijkgeschiedenis.json")
-        d = eh.read_json_from_bytes(b)
-
-    elif validation.current_ddp_category.language == Language.EN:
-        b = eh.extract_file_from_zip(zip, "watch-history.json")
-        d = eh.read_json_from_bytes(b)
-
-    else:
-        d = {}
 
+@flow_metrics.measured
+def watch_history_to_df(zip: str | eh.ZipIndex, validation) -> pd.DataFrame:
+    
+    file_name = file_names(validation).get("watch_history")
     out = pd.DataFrame()
     datapoints = []
 
-    try:
-        for item in d:
-            datapoints.append((
-                item.get("title", ""),
-                item.get("titleUrl", ""),
-                item.get("time", ""),
-            ))
+    if file_name is None:
+        return out
+
+    with eh.open_file_from_zip(zip, file_name) as b:
+        try:
+            for item in eh.iter_json_array(b):
+                datapoints.append((
+                    item.get("title", ""),
+                    item.get("titleUrl", ""),
+                    item.get("time", ""),
+                ))
 
-        out = pd.DataFrame(datapoints, columns=["Titel", "Link" ,"Datum en tijd"]) # pyright: ignore
+            out = pd.DataFrame(datapoints, columns=["Titel", "Link" ,"Datum en tijd"]) # pyright: ignore
 
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
-def search_history_to_df(zip: str, validation) -> pd.DataFrame:
+@flow_metrics.measured
+def search_history_to_df(zip: str | eh.ZipIndex, validation) -> pd.DataFrame:
     
-    if validation.current_ddp_category.language == Language.NL:
-        b = eh.extract_file_from_zip(zip, "zoekgeschiedenis.json")
-        d = eh.read_json_from_bytes(b)
-
-    elif validation.current_ddp_category.language == Language.EN:
-        b = eh.extract_file_from_zip(zip, "search-history.json")
-        d = eh.read_json_from_bytes(b)
-
-    else:
-        d = {}
-
+    file_name = file_names(validation).get("search_history")
     out = pd.DataFrame()
     datapoints = []
 
-    try:
-        for item in d:
-            datapoints.append((
-                item.get("title", ""),
-                item.get("time", ""),
-            ))
+    if file_name is None:
+        return out
 
-        out = pd.DataFrame(datapoints, columns=["Zoekterm", "Datum en tijd"]) # pyright: ignore
+    with eh.open_file_from_zip(zip, file_name) as b:
+        try:
+            for item in eh.iter_json_array(b):
+                datapoints.append((
+                    item.get("title", ""),
+                    item.get("time", ""),
+                ))
 
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+            out = pd.DataFrame(datapoints, columns=["Zoekterm", "Datum en tijd"]) # pyright: ignore
+
+        except Exception as e:
+            logger.error("Exception caught: %s", e)
 
     return out
 
 
-def subscriptions_to_df(youtube_zip: str, validation) -> pd.DataFrame:
+@flow_metrics.measured
+def subscriptions_to_df(youtube_zip: str | eh.ZipIndex, validation) -> pd.DataFrame:
     """
     Parses 'subscriptions.csv' or 'abonnementen.csv' from Youtube DDP
     """
-
-    if validation.current_ddp_category.language == Language.NL:
-        file_name = "abonnementen.csv"
-
-    elif validation.current_ddp_category.language == Language.EN:
-        file_name = "subscriptions.csv"
-    else:
-        file_name = ""
-
-    ratings_bytes = eh.extract_file_from_zip(youtube_zip, file_name)
-    df = eh.read_csv_from_bytes_to_df(ratings_bytes)
+    file_name = file_names(validation).get("subscriptions", "")
+    with eh.open_file_from_zip(youtube_zip, file_name) as ratings_bytes:
+        df = eh.read_csv_from_bytes_to_df(ratings_bytes)
     return df
 
 
-def extraction(zip: str, validation: ValidateInput) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+def extraction(zip: str | eh.ZipIndex, validation: ValidateInput) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
     tables = [
         d3i_props.PropsUIPromptConsentFormTableViz(
             id="youtube_kijkgeschiedenis",
@@ -200,12 +226,13 @@ class YouTubeFlow(FlowBuilder):
         super().__init__(session_id, "YouTube")
         
     def validate_file(self, file):
-        return validate.validate_zip(DDP_CATEGORIES, file)
+        return validate.validate_zip(DDP_CATEGORIES, file, check_content=True)
         
     def extract_data(self, file, validation):
         return extraction(file, validation)
 
 
-def process(session_id):
+def process(session_id, collect_metrics=False):
     flow = YouTubeFlow(session_id)
+    flow.collect_metrics = collect_metrics
     return flow.start_flow()
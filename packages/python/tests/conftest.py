@@ -0,0 +1,44 @@
+import io
+import zipfile
+
+import pytest
+
+
+@pytest.fixture
+def make_zip(tmp_path):
+    """
+    Writes a zip file with the given members and returns its path.
+
+    Members are written in the order given, a member whose content is None is written as a directory entry.
+    """
+    def make(members: dict[str, bytes | str | None], name: str = "export.zip") -> str:
+        path = tmp_path / name
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for member, content in members.items():
+                if content is None:
+                    zf.writestr(zipfile.ZipInfo(member), b"")
+                else:
+                    zf.writestr(member, content)
+        return str(path)
+
+    return make
+
+
+class TrickleStream(io.BytesIO):
+    """
+    A binary stream that returns at most chunk_size bytes per read, like a zip member that is decompressed lazily.
+    """
+    def __init__(self, data: bytes, chunk_size: int):
+        super().__init__(data)
+        self.chunk_size = chunk_size
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0 or size > self.chunk_size:
+            size = self.chunk_size
+        return super().read(size)
+
+
+@pytest.fixture
+def trickle():
+    """Returns a factory for streams that return data at most chunk_size bytes at a time"""
+    return TrickleStream
@@ -0,0 +1,351 @@
+from datetime import datetime, timezone
+import json
+import math
+import zipfile
+
+import pandas as pd
+import pytest
+
+import port.helpers.extraction_helpers as eh
+
+
+# ZipIndex
+
+@pytest.fixture
+def export_zip(make_zip):
+    return make_zip({
+        "export/": None,
+        "export/activity/deleted-tweets.js": "deleted",
+        "export/activity/tweets.js": "tweets",
+        "export/other/tweets.js": "other tweets",
+        "export/like.js": "likes",
+    })
+
+
+def test_zip_index_find_returns_first_member_in_archive_order(export_zip):
+    with eh.ZipIndex(export_zip) as zip_index:
+        assert zip_index.find("tweets.js").filename == "export/activity/deleted-tweets.js"
+        assert zip_index.find("/tweets.js").filename == "export/activity/tweets.js"
+        assert zip_index.find("other/tweets.js").filename == "export/other/tweets.js"
+
+
+def test_zip_index_find_matches_like_extract_file_from_zip(export_zip):
+    with eh.ZipIndex(export_zip) as zip_index:
+        for name in ["tweets.js", "/tweets.js", "like.js", "ke.js", "activity/tweets.js"]:
+            assert eh.extract_file_from_zip(zip_index, name).read() == eh.extract_file_from_zip(export_zip, name).read()
+
+
+def test_zip_index_find_missing_member(export_zip):
+    with eh.ZipIndex(export_zip) as zip_index:
+        assert zip_index.find("follower.js") is None
+        assert zip_index.find("missing/tweets.js") is None
+
+
+def test_zip_index_namelist_keeps_directories(export_zip):
+    with eh.ZipIndex(export_zip) as zip_index:
+        assert zip_index.namelist() == [
+            "export/",
+            "export/activity/deleted-tweets.js",
+            "export/activity/tweets.js",
+            "export/other/tweets.js",
+            "export/like.js",
+        ]
+
+
+def test_zip_index_read_and_close(export_zip):
+    zip_index = eh.ZipIndex(export_zip)
+    with zip_index:
+        assert zip_index.read(zip_index.find("like.js")) == b"likes"
+    with pytest.raises(ValueError):
+        zip_index.read(zip_index.find("like.js"))
+
+
+def test_zip_index_rejects_invalid_zip(tmp_path):
+    path = tmp_path / "export.zip"
+    path.write_bytes(b"not a zip file")
+    with pytest.raises(zipfile.BadZipFile):
+        eh.ZipIndex(str(path))
+
+
+# Streaming member access
+
+DOCUMENTS = [
+    '[]',
+    '{}',
+    '  [ ]  ',
+    '[{"title": "a \\"quoted\\" title", "path": "C:\\\\Users\\\\me", "emoji": "\\ud83d\\ude00"}]',
+    '{"name": "Jos\u00e9 \u00e9\u00e9n \u6f22\u5b57 \U0001f600", "numbers": [1, -2.5, 3e10, 12345678901234567890], "flags": [true, false, null]}',
+    '{"nested": {"a": [[], [{}], {"b": [1, {"c": "d"}]}]}, "last": 0}',
+    '[1, -2.5, 3e10, -0.0015, 1E+2, 0]',
+    '"a string"',
+    '12345',
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_json_reader_stream_equals_json_loads_for_any_chunk_split(trickle, document, chunk_size):
+    data = document.encode("utf-8")
+    out = eh._json_reader_stream(trickle(data, chunk_size), "utf-8")
+    assert out == json.loads(document)
+
+
+def test_read_json_from_bytes_with_byte_order_mark(trickle):
+    data = b"\xef\xbb\xbf" + '{"caf\u00e9": [1, 2]}'.encode("utf-8")
+    assert eh.read_json_from_bytes(trickle(data, 2)) == {"caf\u00e9": [1, 2]}
+
+
+@pytest.mark.parametrize("document", [
+    '',
+    '[1, 2',
+    '[1 2]',
+    '{"a": 1,}',
+    '{"a" 1}',
+    '{"a": "unterminated}',
+    '[1, 2] [3]',
+    '"not a container"',
+])
+def test_read_json_from_bytes_invalid_returns_empty_dict(trickle, document):
+    assert eh.read_json_from_bytes(trickle(document.encode("utf-8"), 3)) == {}
+
+
+def test_open_file_from_zip_streams_member(make_zip):
+    path = make_zip({"export/data.json": '{"a": [1, 2, 3]}'})
+    with eh.open_file_from_zip(path, "data.json") as stream:
+        assert eh.read_json_from_bytes(stream) == {"a": [1, 2, 3]}
+    assert stream.closed
+
+
+def test_open_file_from_zip_with_zip_index(make_zip):
+    path = make_zip({"export/data.json": '[1]'})
+    with eh.ZipIndex(path) as zip_index:
+        with eh.open_file_from_zip(zip_index, "data.json") as stream:
+            assert eh.read_json_from_bytes(stream) == [1]
+        assert stream.closed
+        with eh.open_file_from_zip(zip_index, "data.json") as stream:
+            assert stream.read() == b"[1]"
+
+
+@pytest.mark.parametrize("archive", ["missing", "invalid"])
+def test_open_file_from_zip_returns_empty_stream(make_zip, tmp_path, archive):
+    if archive == "missing":
+        path = make_zip({"export/other.json": "[]"})
+    else:
+        path = str(tmp_path / "invalid.zip")
+        (tmp_path / "invalid.zip").write_bytes(b"not a zip file")
+
+    with eh.open_file_from_zip(path, "data.json") as stream:
+        assert stream.read() == b""
+
+
+# Incremental JSON arrays
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1024])
+def test_iter_json_array_yields_elements_for_any_chunk_split(trickle, chunk_size):
+    items = [
+        {"title": "with \\\"escapes\\\" and \\\\", "time": "2024-01-01T00:00:00Z"},
+        {"title": "José \U0001f600", "parts": ["a,b", "]", "}"]},
+        [],
+        {},
+        "],[",
+        -1.5e-3,
+        None,
+    ]
+    data = json.dumps(items).encode("utf-8")
+    assert list(eh.iter_json_array(trickle(data, chunk_size))) == items
+
+
+@pytest.mark.parametrize("document", ["[]", "  [\n]  ", '{"items": []}', '{"items": [  ]}'])
+def test_iter_json_array_empty_arrays(trickle, document):
+    key = "items" if document.lstrip().startswith("{") else None
+    assert list(eh.iter_json_array(trickle(document.encode("utf-8"), 1), key)) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_iter_json_array_seeks_key_past_other_values(trickle, chunk_size):
+    document = {
+        "skipped": {"items": ["not these"], "text": "\"items\": [0]"},
+        "also skipped": ["items", {"items": 1}],
+        "items": [1, {"a": "b"}],
+        "after": "ignored",
+    }
+    data = json.dumps(document).encode("utf-8")
+    assert list(eh.iter_json_array(trickle(data, chunk_size), "items")) == [1, {"a": "b"}]
+
+
+@pytest.mark.parametrize("document", ['{}', '{"other": [1]}', '{"other": [1], "more": {"items": [2]}}'])
+def test_iter_json_array_missing_key_yields_nothing(trickle, document):
+    assert list(eh.iter_json_array(trickle(document.encode("utf-8"), 2), "items")) == []
+
+
+def test_seek_json_key_leaves_reader_at_value(trickle):
+    reader = eh._JsonStreamBuffer(trickle(b'{"a": [1, 2], "b" : "value", "c": 3}', 1), "utf-8")
+    assert eh._seek_json_key(reader, "b")
+    assert reader.decode_value() == "value"
+
+
+def test_seek_json_key_in_empty_object(trickle):
+    reader = eh._JsonStreamBuffer(trickle(b'{ }', 1), "utf-8")
+    assert not eh._seek_json_key(reader, "b")
+
+
+@pytest.mark.parametrize("document, expected", [
+    ('[{"a": 1}, {"a": 2}', [{"a": 1}, {"a": 2}]),
+    ('[{"a": 1}, {"a": 2} {"a": 3}]', [{"a": 1}, {"a": 2}]),
+    ('[{"a": 1}, {"a": ', [{"a": 1}]),
+    ('{"a": 1}', []),
+    ('', []),
+])
+def test_iter_json_array_stops_at_invalid_json(trickle, document, expected):
+    assert list(eh.iter_json_array(trickle(document.encode("utf-8"), 4))) == expected
+
+
+# Denesting
+
+def recursive_dict_denester(inp, new=None, name=""):
+    """The recursive dict_denester that iter_denested replaced"""
+    if new is None:
+        new = {}
+    children = inp.items() if isinstance(inp, dict) else enumerate(inp)
+    for k, v in children:
+        if isinstance(v, (dict, list)):
+            recursive_dict_denester(v, new, f"{name}-{k}")
+        else:
+            new[f"{name}-{k}"[1:]] = v
+    return new
+
+
+NESTED = {
+    "a": {"b": {"c": 1}, "empty": {}, "none": None},
+    "d": [2, [3, {"e": "f"}], []],
+    1: "integer key",
+    "mapping": {"node-1": {"message": {"parts": ["x", "y"]}}},
+}
+
+
+def test_dict_denester_equals_recursive_version():
+    assert list(eh.dict_denester(NESTED).items()) == list(recursive_dict_denester(NESTED).items())
+    assert eh.dict_denester([]) == {}
+    assert eh.dict_denester({}) == {}
+
+
+def test_dict_denester_deep_input_does_not_recurse():
+    deep = "leaf"
+    for _ in range(5000):
+        deep = {"k": deep}
+    out = eh.dict_denester(deep)
+    assert list(out.values()) == ["leaf"]
+    assert next(iter(out)).count("-") == 4999
+
+
+def test_iter_denested_is_lazy():
+    items = eh.iter_denested({"a": 1, "b": {"c": 2}})
+    assert next(items) == ("a", 1)
+    assert next(items) == ("b-c", 2)
+    assert next(items, None) is None
+
+
+def test_iter_denested_max_depth():
+    assert eh.dict_denester(NESTED, max_depth=0)["a"] == NESTED["a"]
+    out = eh.dict_denester(NESTED, max_depth=1)
+    assert out["a-b"] == {"c": 1}
+    assert out["d-1"] == [3, {"e": "f"}]
+    assert out["d-0"] == 2
+
+
+def test_iter_denested_key_filter_skips_subtrees():
+    seen = []
+
+    def key_filter(key):
+        seen.append(key)
+        return not key.startswith("mapping") and key != "d-1"
+
+    out = eh.dict_denester(NESTED, key_filter=key_filter)
+    assert "a-b-c" in out
+    assert not any(k.startswith("mapping") for k in out)
+    assert not any(k.startswith("d-1") for k in out)
+    assert "mapping-node-1" not in seen
+    assert "d-1-0" not in seen
+
+
+def test_iter_denested_scalar_input():
+    assert list(eh.iter_denested(5)) == [("", 5)]
+
+
+# Sorting timestamps
+
+def apply_sort_key(timestamp):
+    """The per row sort key that sort_isotimestamp_empty_timestamp_last replaced"""
+    try:
+        if isinstance(timestamp, str) and len(timestamp) > 0:
+            return -datetime.fromisoformat(timestamp).timestamp()
+    except ValueError:
+        pass
+    return math.inf
+
+
+TIMESTAMPS = [
+    eh.epoch_to_iso(1700000000),
+    eh.epoch_to_iso(0),
+    "",
+    "2024-02-29T12:00:00+01:00",
+    "2023-12-31T23:59:59.123456+00:00",
+    "2024-02-29T11:00:00.000Z",
+    "not a timestamp",
+    None,
+    float("nan"),
+    "2024-13-01T00:00:00+00:00",
+    "1999-01-01T00:00:00-05:30",
+    eh.epoch_to_iso(1700000001),
+]
+
+
+def test_sort_key_equals_per_row_key():
+    series = pd.Series(TIMESTAMPS, dtype=object)
+    out = eh.sort_isotimestamp_empty_timestamp_last(series)
+    assert out.tolist() == pytest.approx([apply_sort_key(t) for t in TIMESTAMPS])
+
+
+@pytest.mark.parametrize("value", [["2024-01-01T00:00:00+00:00"], ("a", "b"), {"a": 1}, b"2024", 1700000000])
+def test_sort_key_of_non_string_is_infinite(value):
+    series = pd.Series([eh.epoch_to_iso(0), value], dtype=object)
+    assert eh.sort_isotimestamp_empty_timestamp_last(series).tolist() == [0, apply_sort_key(value)] == [0, math.inf]
+
+
+@pytest.mark.parametrize("timestamp", [
+    "2021-W38",
+    "2021-09-20",
+    "20210920T120000+0000",
+    "2024-01-01T00:00:00+00:00 ",
+    " 2024-01-01T00:00:00+00:00",
+    "2024-01-01 00:00:00+00:00",
+    "2024-01-01T00:00:00 UTC",
+])
+def test_sort_key_accepts_what_fromisoformat_accepts(timestamp):
+    out = eh.sort_isotimestamp_empty_timestamp_last(pd.Series([timestamp]))[0]
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except ValueError:
+        assert out == math.inf
+    else:
+        assert out == -dt.replace(tzinfo=dt.tzinfo or timezone.utc).timestamp()
+
+
+def test_sort_key_orders_newest_first_and_empty_last():
+    df = pd.DataFrame({"Date": TIMESTAMPS, "row": range(len(TIMESTAMPS))})
+    out = df.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last, kind="stable")
+    assert out["row"].tolist()[:7] == [3, 5, 4, 11, 0, 10, 1]
+    assert sorted(out["row"].tolist()[7:]) == [2, 6, 7, 8, 9]
+
+
+def test_sort_key_keeps_index_and_handles_empty_series():
+    series = pd.Series(["2024-01-01T00:00:00+00:00", ""], index=[10, 20], name="Date")
+    out = eh.sort_isotimestamp_empty_timestamp_last(series)
+    assert out.index.tolist() == [10, 20]
+    assert out.name == "Date"
+    assert eh.sort_isotimestamp_empty_timestamp_last(pd.Series([], dtype=object)).empty
+
+
+def test_sort_key_assumes_utc_without_offset():
+    out = eh.sort_isotimestamp_empty_timestamp_last(pd.Series(["2024-01-01T00:00:00", "2024-01-01T00:00:00+00:00"]))
+    assert out[0] == out[1]
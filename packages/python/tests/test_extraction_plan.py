@@ -0,0 +1,95 @@
+import pytest
+
+from port.helpers.extraction_plan import ExtractionPlan, Member
+import port.helpers.extraction_helpers as eh
+
+
+@pytest.fixture
+def export_zip(make_zip):
+    return make_zip({
+        "export/activity.csv": "Profile,Title\nAnna,A\nBob,B\nAnna,C\n",
+        "export/ratings.csv": "Profile,Rating\nAnna,5\n",
+    })
+
+
+class Parser:
+    """Parses members into lists of lines, and remembers what it parsed and the streams it got"""
+    def __init__(self):
+        self.parsed = []
+        self.streams = []
+
+    def __call__(self, stream):
+        self.streams.append(stream)
+        lines = stream.read().decode("utf-8").splitlines()
+        self.parsed.append(lines[:1])
+        return lines
+
+
+def test_shared_member_is_parsed_once(export_zip):
+    parse = Parser()
+    activity = Member("activity.csv", parse)
+    ratings = Member("ratings.csv", parse)
+
+    plan = ExtractionPlan()
+    plan.add("titles", [activity], lambda lines, profile: [l for l in lines[1:] if l.startswith(profile)])
+    plan.add("both", [activity, ratings], lambda a, r, profile: (len(a), len(r)))
+    plan.add("again", [activity, activity], lambda a, b, profile: a is b)
+
+    results = plan.start(export_zip).run(profile="Anna")
+    assert results == {"titles": ["Anna,A", "Anna,C"], "both": (4, 2), "again": True}
+    assert len(parse.parsed) == 2
+    assert all(stream.closed for stream in parse.streams)
+
+
+def test_member_used_before_run_is_not_parsed_again(export_zip):
+    parse = Parser()
+    activity = Member("activity.csv", parse)
+    plan = ExtractionPlan()
+    plan.add("count", [activity], len)
+
+    plan_run = plan.start(export_zip)
+    assert plan_run.member(activity)[0] == "Profile,Title"
+    assert plan_run.run() == {"count": 4}
+    assert len(parse.parsed) == 1
+
+
+def test_parsed_member_is_released_after_last_table(export_zip):
+    activity = Member("activity.csv", Parser())
+    ratings = Member("ratings.csv", Parser())
+    runs = []
+
+    def kept(*parsed):
+        return sorted(member.file for member in runs[0]._parsed)
+
+    plan = ExtractionPlan()
+    plan.add("first", [activity], kept)
+    plan.add("second", [activity, ratings], kept)
+    plan.add("third", [ratings], kept)
+
+    plan_run = plan.start(export_zip)
+    runs.append(plan_run)
+    assert plan_run.run() == {
+        "first": ["activity.csv"],
+        "second": ["activity.csv", "ratings.csv"],
+        "third": ["ratings.csv"],
+    }
+    assert plan_run._parsed == {}
+
+
+def test_missing_member_is_parsed_as_empty_stream(export_zip):
+    parse = Parser()
+    plan = ExtractionPlan()
+    plan.add("missing", [Member("missing.csv", parse)], lambda lines: lines)
+    assert plan.start(export_zip).run() == {"missing": []}
+
+
+def test_plan_runs_on_zip_index(export_zip):
+    activity = Member("activity.csv", eh.read_csv_from_bytes_to_df)
+    plan = ExtractionPlan()
+    plan.add("profiles", [activity], lambda df: sorted(df["Profile"].unique()))
+    with eh.ZipIndex(export_zip) as zip_index:
+        assert plan.start(zip_index).run() == {"profiles": ["Anna", "Bob"]}
+
+
+def test_empty_plan():
+    assert ExtractionPlan().start("unused.zip").run() == {}
@@ -0,0 +1,49 @@
+import json
+
+import port.helpers.extraction_helpers as eh
+import port.platforms.chatgpt as chatgpt
+import port.platforms.instagram as instagram
+
+
+def message(id, parent, role, text, create_time):
+    return {
+        "id": id,
+        "parent": parent,
+        "message": {
+            "author": {"role": role},
+            "content": {"content_type": "text", "parts": [text]},
+            "metadata": {},
+            "create_time": create_time,
+        },
+    }
+
+
+def test_epochs_to_iso_keeps_none_of_object_values():
+    assert list(eh.epochs_to_iso([1.7e9, None])) == ["2023-11-14T22:13:20+00:00", eh.epoch_to_iso(None)]
+
+
+def test_chatgpt_null_create_time(make_zip):
+    conversations = [{
+        "title": "Title",
+        "conversation_id": "c",
+        "current_node": "2",
+        "mapping": {
+            "1": message("1", None, "user", "question", 1.7e9),
+            "2": message("2", "1", "assistant", "answer", None),
+        },
+    }]
+    path = make_zip({"export/conversations.json": json.dumps(conversations)})
+
+    out = chatgpt.extract_conversations(path)
+    assert list(out["time"]) == ["2023-11-14T22:13:20+00:00", "None"]
+
+
+def test_instagram_null_timestamp(make_zip):
+    ads = {"impressions_history_ads_seen": [
+        {"string_map_data": {"Author": {"value": "a"}, "Time": {"timestamp": 1700000000}}},
+        {"string_map_data": {"Author": {"value": "b"}, "Time": {"timestamp": None}}},
+    ]}
+    path = make_zip({"export/ads_viewed.json": json.dumps(ads)})
+
+    out = instagram.ads_viewed_to_df(path)
+    assert list(out["Date"]) == ["2023-11-14T22:13:20+00:00", "None"]
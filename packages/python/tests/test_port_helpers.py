@@ -0,0 +1,100 @@
+import json
+import random
+
+import pytest
+
+import port.helpers.port_helpers as ph
+
+
+def donated(commands):
+    """The donated key and data of every command"""
+    return [(command.key, command.json_string) for command in commands]
+
+
+def reassemble(commands):
+    *parts, manifest = donated(commands)
+    return ph.reassemble_donation(manifest[1], [part for _, part in parts])
+
+
+SMALL = json.dumps([{"chatgpt_conversations": [{"message": "hello"}]}])
+TRICKY = json.dumps(
+    [{"message": f"quote \" backslash \\ newline \n tab \t é 漢字 😀 \u0000 {i}"} for i in range(200)],
+    ensure_ascii=False,
+)
+
+
+def test_small_donation_is_a_single_donation():
+    commands = list(ph.donate_in_parts("1", SMALL))
+    assert donated(commands) == [("1", SMALL)]
+    assert commands[0].encoding is None
+
+
+def test_donation_of_exactly_max_part_size_is_not_split():
+    data = json.dumps([{"message": "é" * 500}], ensure_ascii=False)
+    size = len(data.encode("utf-8"))
+    assert len(list(ph.donate_in_parts("1", data, max_part_size=size))) == 1
+    assert len(list(ph.donate_in_parts("1", data, max_part_size=size - 1))) > 1
+
+
+def test_empty_donation():
+    assert donated(ph.donate_in_parts("1", "")) == [("1", "")]
+
+
+@pytest.mark.parametrize("max_part_size", [200, 257, 1000])
+def test_parts_fit_and_reassemble(max_part_size):
+    commands = list(ph.donate_in_parts("1", TRICKY, max_part_size=max_part_size))
+    *parts, manifest = commands
+    part_count = len(parts)
+
+    assert part_count > 1
+    assert all(len(part.json_string.encode("utf-8")) <= max_part_size for part in parts)
+    assert [part.key for part in parts] == [ph.donation_part_key("1", i, part_count) for i in range(part_count)]
+    assert manifest.key == ph.donation_manifest_key("1")
+    assert json.loads(manifest.json_string)["part_count"] == part_count
+    assert reassemble(commands) == TRICKY
+
+
+def test_reassemble_parts_in_any_order():
+    *parts, manifest = donated(ph.donate_in_parts("1", TRICKY, max_part_size=300))
+    shuffled = [part for _, part in parts]
+    random.Random(1).shuffle(shuffled)
+    assert ph.reassemble_donation(manifest[1], shuffled) == TRICKY
+
+
+def test_compressed_donation_in_parts():
+    data = json.dumps([{"row": i, "text": f"message {i}"} for i in range(5000)])
+    commands = list(ph.donate_in_parts("1", data, max_part_size=4096, compress=True))
+    assert len(commands) > 2
+    assert all(command.encoding == ph.DONATION_ENCODING for command in commands[:-1])
+    assert reassemble(commands) == data
+
+
+def test_compressed_small_donation_is_decoded():
+    commands = list(ph.donate_in_parts("1", SMALL, compress=True))
+    assert len(commands) == 1
+    assert ph.decode_donation(commands[0].json_string) == SMALL
+
+
+def test_reassemble_rejects_missing_foreign_and_tampered_parts():
+    *parts, (_, manifest) = donated(ph.donate_in_parts("1", TRICKY, max_part_size=300))
+    parts = [part for _, part in parts]
+
+    with pytest.raises(ValueError, match="missing parts"):
+        ph.reassemble_donation(manifest, parts[:-1])
+
+    *other_parts, _ = donated(ph.donate_in_parts("2", TRICKY, max_part_size=300))
+    with pytest.raises(ValueError, match="does not belong"):
+        ph.reassemble_donation(manifest, parts + [other_parts[0][1]])
+
+    tampered = json.loads(parts[0])
+    tampered["data"] = tampered["data"][:-1] + "x"
+    with pytest.raises(ValueError, match="hash"):
+        ph.reassemble_donation(manifest, [json.dumps(tampered)] + parts[1:])
+
+    with pytest.raises(ValueError, match="manifest"):
+        ph.reassemble_donation(parts[0], parts)
+
+
+def test_max_part_size_smaller_than_envelope():
+    with pytest.raises(ValueError, match="too small"):
+        list(ph.donate_in_parts("1", TRICKY, max_part_size=50))
@@ -0,0 +1,137 @@
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import port.api.d3i_props as d3i_props
+import port.api.props as props
+from port.helpers.table_pagination import TablePager
+
+
+def make_table(id, df, page_size=None, **kwargs):
+    return d3i_props.PropsUIPromptConsentFormTableViz(
+        id=id,
+        title=props.Translatable({"en": id, "nl": id}),
+        data_frame=df,
+        page_size=page_size,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def history():
+    df = pd.DataFrame({
+        "Title": [f"Video {i}" for i in range(23)],
+        "Channel": ["Cats" if i % 3 == 0 else "Dogs" for i in range(23)],
+    })
+    return make_table("history", df, page_size=10)
+
+
+def query(pager, **query):
+    return pager.query(json.dumps(query)).toDict()
+
+
+def page_titles(page):
+    return list(json.loads(page["data_frame"])["Title"].values())
+
+
+def test_paginated_table_sends_first_page_only(history):
+    out = history.toDict()
+    assert out["page_size"] == 10
+    assert out["total_rows"] == 23
+    assert list(json.loads(out["data_frame"])["Title"].values()) == [f"Video {i}" for i in range(10)]
+
+
+def test_unpaginated_tables_are_ignored(history):
+    small = make_table("small", pd.DataFrame({"a": [1, 2]}))
+    pager = TablePager([history, small])
+    assert list(pager.tables) == ["history"]
+    assert "page_size" not in small.toDict()
+    assert not TablePager([small]).is_paginated()
+    assert not TablePager(None).is_paginated()
+
+
+def test_query_last_partial_page(history):
+    page = query(TablePager([history]), table_id="history", page=2)
+    assert page["page"] == 2
+    assert page["row_ids"] == ["20", "21", "22"]
+    assert page_titles(page) == ["Video 20", "Video 21", "Video 22"]
+    assert page["total_rows"] == page["filtered_rows"] == 23
+
+
+@pytest.mark.parametrize("requested, expected", [(-1, 0), (3, 2), (100, 2)])
+def test_query_page_out_of_range_is_clamped(history, requested, expected):
+    assert query(TablePager([history]), table_id="history", page=requested)["page"] == expected
+
+
+def test_query_full_last_page():
+    table = make_table("t", pd.DataFrame({"Title": [str(i) for i in range(20)]}), page_size=10)
+    page = query(TablePager([table]), table_id="t", page=5)
+    assert page["page"] == 1
+    assert page["row_ids"] == [str(i) for i in range(10, 20)]
+
+
+def test_query_search_is_case_insensitive_and_within_cells(history):
+    pager = TablePager([history])
+    page = query(pager, table_id="history", page=0, search=" CATS ")
+    assert page["search"] == "CATS"
+    assert page["filtered_rows"] == 8
+    assert page["total_rows"] == 23
+    assert page["row_ids"] == [str(i) for i in range(0, 23, 3)]
+
+    assert query(pager, table_id="history", search="7dogs")["filtered_rows"] == 0
+    assert query(pager, table_id="history", search="video 2")["row_ids"] == ["2", "20", "21", "22"]
+
+
+def test_query_leaves_out_deleted_rows(history):
+    page = query(TablePager([history]), table_id="history", page=0, deleted=["0", "1", "5", "99", "x"])
+    assert page["total_rows"] == 20
+    assert page["filtered_rows"] == 20
+    assert page["row_ids"] == ["2", "3", "4", "6", "7", "8", "9", "10", "11", "12"]
+
+
+def test_query_empty_table():
+    table = make_table("empty", pd.DataFrame({"Title": []}), page_size=10)
+    page = query(TablePager([table]), table_id="empty", page=3)
+    assert page["page"] == 0
+    assert page["row_ids"] == []
+    assert page["total_rows"] == page["filtered_rows"] == 0
+
+
+@pytest.mark.parametrize("value", ["not json", json.dumps({"table_id": "unknown"}), json.dumps({"page": 1})])
+def test_invalid_query_returns_empty_page(history, value):
+    page = TablePager([history]).query(value).toDict()
+    assert page["row_ids"] == []
+    assert page["data_frame"] == "{}"
+
+
+def test_is_query():
+    assert TablePager.is_query(SimpleNamespace(__type__="PayloadTableQuery", value="{}"))
+    assert not TablePager.is_query(SimpleNamespace(__type__="PayloadJSON", value="[]"))
+
+
+def test_expand_donation_fills_in_remaining_rows():
+    df = pd.DataFrame({"Title": ["a", "b", "c"], "Liked": [True, False, None], "Count": [1, 2, 3]})
+    table = make_table("likes", df, page_size=2)
+    donated = json.dumps([
+        {"likes": [], "deleted rows": ["1"], "deleted row count": "1"},
+        {"other": [{"a": "1"}], "deleted row count": "0"},
+    ])
+
+    out = json.loads(TablePager([table]).expand_donation(donated))
+    assert out == [
+        {
+            "likes": [
+                {"Title": "a", "Liked": "true", "Count": "1"},
+                {"Title": "c", "Liked": "null", "Count": "3"},
+            ],
+            "deleted row count": "1",
+        },
+        {"other": [{"a": "1"}], "deleted row count": "0"},
+    ]
+
+
+def test_expand_donation_without_paginated_tables_is_unchanged():
+    donated = '[{"other": [], "deleted row count": "0"}]'
+    assert TablePager([]).expand_donation(donated) is donated